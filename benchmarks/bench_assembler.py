@@ -0,0 +1,45 @@
+from languages.Normal import Normal
+from translators.lexer import lex_source
+from translators.parser import parse
+from translators.normalizer import normalize
+from translators.assembler import assemble
+from benchmarks.corpus import programs
+
+
+def count_naive(normal_list):
+    """
+    Counts the instructions of the README's approach: every memory in its own stack slot,
+    every value loaded into %rax/%rcx before use and stored back after.
+    """
+    count = 0
+    for instr in normal_list:
+        match instr:
+            case Normal.FunDef(_, _, inner_instrs):
+                count += count_naive(inner_instrs) + 6  # Prologue and epilogue
+            case Normal.Call(_, params):
+                count += len(params) + 1
+            case Normal.Assign(_, Normal.Call(_, params)):
+                count += len(params) + 2
+            case Normal.Assign(_, Normal.BinaryOp(op, _, _)):
+                count += 5 if op in ("/", "%") else 4
+            case Normal.Assign(_, Normal.UnaryOp(_, _)):
+                count += 3
+            case Normal.Assign(_, _):
+                count += 2
+    return count
+
+
+def count_instructions(assembly_list):
+    return sum(len(label.instructions) for label in assembly_list)
+
+
+def bench_assembler():
+    print(f"{'program':>12} {'naive':>6} {'assembler':>10}")
+    for name, program in programs.items():
+        normal_list = normalize(parse(list(lex_source(program))))
+        naive = count_naive(normal_list) + 6
+        assembled = count_instructions(assemble(normal_list))
+        print(f"{name:>12} {naive:>6} {assembled:>10}")
+
+
+bench_assembler()
@@ -0,0 +1,47 @@
+import os
+import tempfile
+from time import perf_counter
+from translators.compiler import compile_batch, find_sources, output_path
+from benchmarks.corpus import programs
+
+
+num_files = 200
+
+# Each file repeats the corpus, so that compiling it outweighs starting the work in a worker
+repeats = 4
+
+
+def worker_counts():
+    counts = [1]
+    while counts[-1] * 2 <= (os.cpu_count() or 1):
+        counts.append(counts[-1] * 2)
+    if counts[-1] != (os.cpu_count() or 1):
+        counts.append(os.cpu_count())
+    return counts
+
+
+def bench_batch():
+    source = "\n".join(programs.values()) * repeats
+
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(num_files):
+            with open(os.path.join(directory, f"module_{i}.py"), "w") as file:
+                file.write(source)
+
+        sources = find_sources([directory])
+        outputs = [output_path(path) for path in sources]
+
+        print(f"{num_files} files of {len(source)} bytes, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'seconds':>8} {'files/s':>8} {'speedup':>8}")
+        baseline = None
+        for workers in worker_counts():
+            start = perf_counter()
+            compile_batch(sources, outputs, workers)
+            seconds = perf_counter() - start
+
+            baseline = baseline or seconds
+            print(f"{workers:>8} {seconds:>8.2f} {num_files / seconds:>8.1f} {baseline / seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    bench_batch()
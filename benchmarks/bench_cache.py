@@ -0,0 +1,39 @@
+import os
+import tempfile
+from time import perf_counter
+from translators.cache import CompileCache
+from translators.compiler import compile_batch, find_sources, output_path
+from benchmarks.corpus import programs
+
+
+num_files = 200
+repeats = 4
+
+
+def bench_cache():
+    source = "\n".join(programs.values()) * repeats
+
+    with tempfile.TemporaryDirectory() as directory:
+        source_dir = os.path.join(directory, "src")
+        os.makedirs(source_dir)
+        for i in range(num_files):
+            with open(os.path.join(source_dir, f"module_{i}.py"), "w") as file:
+                file.write(f"# module {i}\n" + source)
+
+        sources = find_sources([source_dir])
+        outputs = [output_path(path) for path in sources]
+
+        print(f"{num_files} files of {len(source)} bytes")
+        print(f"{'build':>8} {'seconds':>8} {'hits':>5} {'misses':>7}")
+        for build, flags in [("none", None), ("cold", False), ("warm", False), ("cold -O", True), ("warm -O", True)]:
+            cache = None if flags is None else CompileCache(os.path.join(directory, "cache"))
+            start = perf_counter()
+            compile_batch(sources, outputs, optimize=bool(flags), cache=cache)
+            seconds = perf_counter() - start
+
+            hits, misses = (cache.stats.hits, cache.stats.misses) if cache else (0, 0)
+            print(f"{build:>8} {seconds:>8.2f} {hits:>5} {misses:>7}")
+
+
+if __name__ == "__main__":
+    bench_cache()
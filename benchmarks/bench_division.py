@@ -0,0 +1,51 @@
+from languages.Normal import Normal
+from languages.Assembly import Assembly
+from translators.assembler import assemble_instruction, Frame
+
+
+# Approximate latencies in cycles of 64-bit register forms on a recent x86-64 core (Agner Fog's instruction tables).
+# idiv varies with the operands, from about 40 to about 90 cycles on Skylake, so the lower bound is used.
+latencies = {
+    Assembly.IDiv: 40,
+    Assembly.IMul: 3,
+    Assembly.Mul: 3,
+    Assembly.Cqo: 1,
+}
+
+divisors = [3, 7, 10, 641, -6, 2 ** 31 + 5]
+
+
+def estimate(instructions):
+    # Instructions of a division depend on each other, so their latencies add up
+    return sum(latencies.get(type(instr), 1) for instr in instructions)
+
+
+def lower(op, divisor):
+    # x = y op divisor, with y in a register and x in a stack slot
+    instructions = []
+    instr = Normal.Assign(Normal.VarMemory(0), Normal.BinaryOp(op, Normal.TempMemory(0), Normal.Integer(str(divisor))))
+    assemble_instruction(instr, Frame(), [], instructions)
+    return instructions
+
+
+def lower_idiv(op, divisor):
+    # Before magic numbers, the constant was loaded into the scratch register and divided by with idiv
+    instructions = [Assembly.Mov(Assembly.Register("r11"), Assembly.Integer(str(divisor)))]
+    instr = Normal.Assign(Normal.VarMemory(0), Normal.BinaryOp(op, Normal.TempMemory(0), Normal.TempMemory(1)))
+    assemble_instruction(instr, Frame(), [], instructions)
+    return instructions
+
+
+def bench_division():
+    print(f"{'op':>3} {'divisor':>11} {'idiv instrs':>12} {'idiv cycles':>12} {'magic instrs':>13} {'magic cycles':>13}")
+    for op in ["/", "%"]:
+        for divisor in divisors:
+            idiv = lower_idiv(op, divisor)
+            magic = lower(op, divisor)
+            print(
+                f"{op:>3} {divisor:>11}"
+                f" {len(idiv):>12} {estimate(idiv):>12}"
+                f" {len(magic):>13} {estimate(magic):>13}")
+
+
+bench_division()
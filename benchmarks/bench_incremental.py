@@ -0,0 +1,44 @@
+from time import perf_counter
+from translators.compiler import compile
+from translators.incremental import IncrementalCompiler
+
+
+sizes = [10, 100, 1000]
+
+
+def program(num_functions, edited=None):
+    # Functions of a few statements each, called from the top level
+    functions = []
+    for i in range(num_functions):
+        constant = 2 if i == edited else 1
+        functions.append(
+            f"def f{i}(a, b):\n"
+            f"\tc = a * b + {constant}\n"
+            f"\td = (c - a) / (b + 1)\n"
+            f"\tprint(c, d, \"f{i}\")\n"
+        )
+    calls = "".join(f"f{i}({i}, 3)\n" for i in range(num_functions))
+    return "x = 1\n" + "".join(functions) + calls
+
+
+def measure(function):
+    start = perf_counter()
+    function()
+    return perf_counter() - start
+
+
+def bench_incremental():
+    print(f"{'functions':>10} {'full ms':>8} {'first ms':>9} {'edit ms':>8} {'speedup':>8}")
+    for size in sizes:
+        original = program(size)
+        edited = program(size, edited=size // 2)
+
+        compiler = IncrementalCompiler()
+        full = measure(lambda: compile(edited))
+        first = measure(lambda: compiler.compile(original))
+        edit = measure(lambda: compiler.compile(edited))
+
+        print(f"{size:>10} {full * 1000:>8.1f} {first * 1000:>9.1f} {edit * 1000:>8.1f} {full / edit:>8.1f}")
+
+
+bench_incremental()
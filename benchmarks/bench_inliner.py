@@ -0,0 +1,39 @@
+from languages.Assembly import Assembly
+from translators.lexer import lex_source
+from translators.parser import parse
+from translators.normalizer import normalize
+from translators.assembler import assemble
+from translators.optimizer import fold_constants, optimize, normal_passes, inline_functions
+from benchmarks.corpus import programs
+
+
+def count_calls(assembly_list):
+    return sum(1 for label in assembly_list for instr in label.instructions if isinstance(instr, Assembly.Call))
+
+
+def count_instructions(assembly_list):
+    return sum(len(label.instructions) for label in assembly_list)
+
+
+def bench_inliner():
+    print(f"{'program':>14} {'inlined':>8} {'calls before':>13} {'calls after':>12} {'instrs before':>14} {'instrs after':>13}")
+    for name, program in programs.items():
+        normal_list = normalize(fold_constants(parse(list(lex_source(program)))))
+
+        # The other passes, without inlining
+        passes = [normal_pass for normal_pass in normal_passes if normal_pass is not inline_functions]
+        without = normal_list
+        for normal_pass in passes:
+            without = normal_pass(without)
+
+        stats = {}
+        inline_functions(normal_list, stats)
+        before = assemble(without, True)
+        after = assemble(optimize(normal_list), True)
+        print(
+            f"{name:>14} {sum(stats.values()):>8}"
+            f" {count_calls(before):>13} {count_calls(after):>12}"
+            f" {count_instructions(before):>14} {count_instructions(after):>13}")
+
+
+bench_inliner()
@@ -0,0 +1,32 @@
+from time import perf_counter
+from translators.tokenizer import tokenize_iter
+from translators.lexer import lex_iter, lex_source
+
+
+# A small Snake program that is repeated to reach each input size
+snippet = "def name(x, y):\n\tz = x + y * 2 # comment\n\tprint(z, \"text\", True)\n\nname(1, 2)\n"
+
+sizes = [100_000, 1_000_000, 4_000_000]
+
+
+def two_stage(text):
+    return lex_iter(tokenize_iter(text))
+
+
+def measure(function, text):
+    start = perf_counter()
+    num_tokens = sum(1 for _ in function(text))
+    return num_tokens, perf_counter() - start
+
+
+def bench_lexer_fused():
+    print(f"{'bytes':>10} {'path':>10} {'tokens':>9} {'seconds':>8} {'tokens/s':>11}")
+    for size in sizes:
+        text = snippet * (size // len(snippet))
+
+        for name, function in [("two-stage", two_stage), ("fused", lex_source)]:
+            num_tokens, seconds = measure(function, text)
+            print(f"{size:>10} {name:>10} {num_tokens:>9} {seconds:>8.3f} {num_tokens / seconds:>11.0f}")
+
+
+bench_lexer_fused()
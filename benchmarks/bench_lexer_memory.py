@@ -0,0 +1,57 @@
+import os
+import tempfile
+import tracemalloc
+from time import perf_counter
+from translators.tokenizer import tokenize, tokenize_iter
+from translators.lexer import lex, lex_iter
+
+
+# A small Snake program that is repeated to reach each input size
+snippet = "def name(x, y):\n\tz = x + y * 2 # comment\n\tprint(z, \"text\")\n\nname(1, 2)\n"
+
+sizes = [5_000, 10_000, 20_000, 1_000_000, 4_000_000]
+
+# tokenize and lex are quadratic, so the list path is only measured on the smaller inputs
+list_max_size = 20_000
+
+
+def measure(function):
+    tracemalloc.start()
+    start = perf_counter()
+    num_tokens = function()
+    seconds = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return num_tokens, seconds, peak
+
+
+def list_path(path):
+    with open(path) as file:
+        return len(lex(tokenize(file.read())))
+
+
+def iter_path(path):
+    with open(path) as file:
+        return sum(1 for _ in lex_iter(tokenize_iter(file)))
+
+
+def bench_lexer_memory():
+    print(f"{'bytes':>10} {'path':>5} {'tokens':>9} {'seconds':>8} {'peak KiB':>9}")
+    for size in sizes:
+        with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as file:
+            file.write(snippet * (size // len(snippet)))
+            path = file.name
+
+        try:
+            paths = [("iter", iter_path)]
+            if size <= list_max_size:
+                paths.insert(0, ("list", list_path))
+
+            for name, function in paths:
+                num_tokens, seconds, peak = measure(lambda: function(path))
+                print(f"{size:>10} {name:>5} {num_tokens:>9} {seconds:>8.3f} {peak / 1024:>9.1f}")
+        finally:
+            os.remove(path)
+
+
+bench_lexer_memory()
@@ -0,0 +1,30 @@
+from time import perf_counter
+from languages.Snake import Snake
+from translators.normalizer import normalize
+
+
+sizes = [10_000, 25_000, 50_000, 100_000]
+
+
+def straight_line_program(size):
+    # x0 = 0, x1 = x0 + 1, x2 = x1 + 1, ...
+    program = [Snake.Assign(Snake.Variable("x0"), Snake.Integer("0"))]
+    for i in range(1, size):
+        value = Snake.BinaryOp("+", Snake.Variable(f"x{i - 1}"), Snake.Integer("1"))
+        program.append(Snake.Assign(Snake.Variable(f"x{i}"), value))
+    return program
+
+
+def bench_normalizer():
+    print(f"{'statements':>10} {'seconds':>8} {'statements/s':>13}")
+    for size in sizes:
+        program = straight_line_program(size)
+
+        start = perf_counter()
+        normalize(program)
+        seconds = perf_counter() - start
+
+        print(f"{size:>10} {seconds:>8.3f} {size / seconds:>13.0f}")
+
+
+bench_normalizer()
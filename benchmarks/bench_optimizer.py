@@ -0,0 +1,52 @@
+from languages.Assembly import Assembly
+from translators.lexer import lex_source
+from translators.parser import parse
+from translators.normalizer import normalize
+from translators.assembler import assemble
+from translators.optimizer import fold_constants, optimize, propagate_constants, number_values, propagate_copies, eliminate_dead_code
+from benchmarks.corpus import programs
+
+
+arithmetic_instructions = (Assembly.Add, Assembly.Sub, Assembly.Mul, Assembly.IDiv, Assembly.Neg)
+
+
+def count_arithmetic(assembly_list):
+    # The frame setup of each label adjusts %rsp, which is not program arithmetic
+    return sum(
+        1 for label in assembly_list for instr in label.instructions
+        if isinstance(instr, arithmetic_instructions) and getattr(instr, "destination", None) != Assembly.Register("rsp"))
+
+
+def count_instructions(assembly_list):
+    return sum(len(label.instructions) for label in assembly_list)
+
+
+def bench_optimizer():
+    print(f"{'program':>14} {'arith before':>13} {'arith after':>12} {'instrs before':>14} {'instrs after':>13}")
+    for name, program in programs.items():
+        snake_list = parse(list(lex_source(program)))
+        before = assemble(normalize(snake_list))
+        after = assemble(optimize(normalize(fold_constants(snake_list))))
+        print(
+            f"{name:>14}"
+            f" {count_arithmetic(before):>13} {count_arithmetic(after):>12}"
+            f" {count_instructions(before):>14} {count_instructions(after):>13}")
+
+
+def bench_eliminated():
+    print(f"{'program':>14} {'function':>14} {'cse':>4} {'copies':>7} {'dead':>5}")
+    for name, program in programs.items():
+        value_stats = {}
+        copy_stats = {}
+        dead_stats = {}
+        normal_list = number_values(propagate_constants(normalize(parse(list(lex_source(program))))), value_stats)
+        eliminate_dead_code(propagate_copies(normal_list, copy_stats), dead_stats)
+        for function_name, eliminated in copy_stats.items():
+            print(
+                f"{name:>14} {function_name:>14} {value_stats[function_name]:>4}"
+                f" {eliminated:>7} {dead_stats[function_name]:>5}")
+
+
+bench_optimizer()
+print()
+bench_eliminated()
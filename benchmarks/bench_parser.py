@@ -0,0 +1,25 @@
+from time import perf_counter
+from translators.lexer import lex_source
+from translators.parser import parse
+
+
+# A small Snake program that is repeated to reach each statement count
+snippet = "def name(x, y):\n\tz = (x + y) * 2 - -x % 3\n\tprint(z, \"text\", True)\n\nw = name(1, 2) + 4\n"
+statements_per_snippet = 4
+
+sizes = [10_000, 100_000, 400_000]
+
+
+def bench_parser():
+    print(f"{'statements':>10} {'tokens':>9} {'seconds':>8} {'statements/s':>13}")
+    for size in sizes:
+        tokens = list(lex_source(snippet * (size // statements_per_snippet)))
+
+        start = perf_counter()
+        parse(tokens)
+        seconds = perf_counter() - start
+
+        print(f"{size:>10} {len(tokens):>9} {seconds:>8.3f} {size / seconds:>13.0f}")
+
+
+bench_parser()
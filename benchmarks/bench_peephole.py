@@ -0,0 +1,33 @@
+from translators.lexer import lex_source
+from translators.parser import parse
+from translators.normalizer import normalize
+from translators.assembler import assemble
+from translators.optimizer import fold_constants, optimize
+from translators.peephole import optimize_peephole, rules
+from benchmarks.corpus import programs
+
+
+def count_instructions(assembly_list):
+    return sum(len(label.instructions) for label in assembly_list)
+
+
+def bench_peephole():
+    plain_totals = {}
+    optimized_totals = {}
+    print(f"{'program':>14} {'plain':>6} {'+ peephole':>11} {'optimized':>10} {'+ peephole':>11}")
+    for name, program in programs.items():
+        snake_list = parse(list(lex_source(program)))
+        plain = assemble(normalize(snake_list))
+        optimized = assemble(optimize(normalize(fold_constants(snake_list))), True)
+        print(
+            f"{name:>14}"
+            f" {count_instructions(plain):>6} {count_instructions(optimize_peephole(plain, plain_totals)):>11}"
+            f" {count_instructions(optimized):>10} {count_instructions(optimize_peephole(optimized, optimized_totals)):>11}")
+
+    print()
+    print(f"{'rule':>24} {'plain hits':>11} {'optimized hits':>15}")
+    for rule in rules:
+        print(f"{rule.name:>24} {plain_totals.get(rule.name, 0):>11} {optimized_totals.get(rule.name, 0):>15}")
+
+
+bench_peephole()
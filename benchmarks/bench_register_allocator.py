@@ -0,0 +1,50 @@
+from languages.Normal import Normal
+from languages.Assembly import Assembly
+from translators.lexer import lex_source
+from translators.parser import parse
+from translators.normalizer import normalize
+from translators.assembler import assemble, temp_registers
+from translators.register_allocator import allocate_registers
+from benchmarks.corpus import programs
+
+
+def function_bodies(normal_list):
+    yield normal_list
+    for instr in normal_list:
+        if isinstance(instr, Normal.FunDef):
+            yield from function_bodies(instr.inner_instrs)
+
+
+def count_spills(normal_list, allocate):
+    spills = 0
+    for body in function_bodies(normal_list):
+        if allocate:
+            spills += sum(1 for location in allocate_registers(body)[1].values() if isinstance(location, Assembly.ScaledIndexed))
+        else:
+            memories = set()
+            for instr in body:
+                match instr:
+                    case Normal.Assign(destination, _):
+                        memories.add(destination)
+            spills += sum(
+                1 for memory in memories
+                if isinstance(memory, Normal.VarMemory)
+                or isinstance(memory, Normal.TempMemory) and memory.number >= len(temp_registers))
+    return spills
+
+
+def count_instructions(assembly_list):
+    return sum(len(label.instructions) for label in assembly_list)
+
+
+def bench_register_allocator():
+    print(f"{'program':>12} {'spills before':>14} {'spills after':>13} {'instrs before':>14} {'instrs after':>13}")
+    for name, program in programs.items():
+        normal_list = normalize(parse(list(lex_source(program))))
+        print(
+            f"{name:>12}"
+            f" {count_spills(normal_list, False):>14} {count_spills(normal_list, True):>13}"
+            f" {count_instructions(assemble(normal_list)):>14} {count_instructions(assemble(normal_list, True)):>13}")
+
+
+bench_register_allocator()
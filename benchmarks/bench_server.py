@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from time import perf_counter
+from translators.server import CompileServer, request, wait_for_server
+from benchmarks.corpus import programs
+
+
+runs = 20
+
+
+def measure(function):
+    start = perf_counter()
+    for _ in range(runs):
+        function()
+    return (perf_counter() - start) / runs
+
+
+def bench_server():
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = os.path.join(directory, "server.sock")
+        server = CompileServer(socket_path)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        wait_for_server(socket_path)
+
+        print(f"{'program':>14} {'process ms':>11} {'server ms':>10} {'speedup':>8}")
+        try:
+            for name, program in programs.items():
+                path = os.path.join(directory, f"{name}.py")
+                with open(path, "w") as file:
+                    file.write(program)
+
+                # A new interpreter per compilation, as a build tool would run the command line compiler
+                command = [sys.executable, "-m", "translators.compiler", path, "-o", os.devnull]
+                process = measure(lambda: subprocess.run(command, check=True))
+                served = measure(lambda: request(socket_path, {"path": path}))
+                print(f"{name:>14} {process * 1000:>11.1f} {served * 1000:>10.2f} {process / served:>8.0f}")
+        finally:
+            request(socket_path, {"command": "shutdown"})
+            thread.join()
+
+
+if __name__ == "__main__":
+    bench_server()
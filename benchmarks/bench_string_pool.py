@@ -0,0 +1,33 @@
+from languages.Assembly import Assembly
+from translators.lexer import lex_source
+from translators.parser import parse
+from translators.normalizer import normalize
+from translators.assembler import assemble
+from benchmarks.corpus import programs
+
+
+def string_uses(assembly_list):
+    return [operand.string for label in assembly_list for instr in label.instructions
+            for operand in (getattr(instr, "destination", None), getattr(instr, "source", None))
+            if isinstance(operand, Assembly.String)]
+
+
+def declared_strings(assembly_list):
+    return {label.label.removeprefix("_str_"): label.instructions[0].string for label in assembly_list
+            if label.instructions and isinstance(label.instructions[0], Assembly.StringDeclare)}
+
+
+def bench_string_pool():
+    print(f"{'program':>14} {'uses':>5} {'entries':>8} {'bytes before':>13} {'bytes after':>12} {'bytes saved':>12}")
+    for name, program in programs.items():
+        assembly_list = assemble(normalize(parse(list(lex_source(program)))))
+        uses = string_uses(assembly_list)
+        declared = declared_strings(assembly_list)
+
+        # Without pooling, every use declared its own copy of the literal (with its terminating zero byte)
+        before = sum(len(declared[label].encode()) + 1 for label in uses)
+        after = sum(len(string.encode()) + 1 for string in declared.values())
+        print(f"{name:>14} {len(uses):>5} {len(declared):>8} {before:>13} {after:>12} {before - after:>12}")
+
+
+bench_string_pool()
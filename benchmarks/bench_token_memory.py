@@ -0,0 +1,27 @@
+import tracemalloc
+from translators.lexer import lex_source
+
+
+# A small Snake program that is repeated to reach the token count
+snippet = "def name(x, y):\n\tz = x + y * 2\n\tprint(z, \"text\", True)\n\nname(1, 2)\n"
+
+num_tokens = 100_000
+
+
+def bench_token_memory():
+    tokens_per_snippet = sum(1 for _ in lex_source(snippet))
+    text = snippet * (num_tokens // tokens_per_snippet + 1)
+
+    tracemalloc.start()
+    tokens = list(lex_source(text))[:num_tokens]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"tokens:          {len(tokens)}")
+    print(f"retained KiB:    {current / 1024:.1f}")
+    print(f"peak KiB:        {peak / 1024:.1f}")
+    print(f"bytes per token: {current / len(tokens):.1f}")
+    print(f"distinct tokens: {len(set(tokens))}")
+
+
+bench_token_memory()
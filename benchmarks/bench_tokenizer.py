@@ -0,0 +1,32 @@
+from time import perf_counter
+from translators.tokenizer import tokenize, scan
+
+
+# A small Snake program that is repeated to reach each input size
+snippet = "def name(x, y):\n\tz = x + y * 2 # comment\n\tprint(z, \"text\")\n\nname(1, 2)\n"
+
+sizes = [12_500, 25_000, 50_000, 100_000, 200_000, 1_000_000, 2_000_000, 4_000_000]
+
+# tokenize is quadratic, so it is only timed on the smaller inputs
+tokenize_max_size = 50_000
+
+
+def time_function(function, text):
+    start = perf_counter()
+    function(text)
+    return perf_counter() - start
+
+
+def bench_tokenizer():
+    print(f"{'bytes':>10} {'scan (s)':>10} {'scan MB/s':>10} {'tokenize (s)':>13}")
+    for size in sizes:
+        text = (snippet * (size // len(snippet) + 1))[:size]
+
+        scan_time = time_function(scan, text)
+        tokenize_time = time_function(tokenize, text) if size <= tokenize_max_size else None
+
+        tokenize_column = f"{tokenize_time:>13.3f}" if tokenize_time is not None else f"{'-':>13}"
+        print(f"{size:>10} {scan_time:>10.3f} {size / scan_time / 1e6:>10.1f} {tokenize_column}")
+
+
+bench_tokenizer()
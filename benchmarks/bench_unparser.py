@@ -0,0 +1,43 @@
+import os
+import tracemalloc
+from time import perf_counter
+from languages.Assembly import Assembly
+from translators.unparser_att import unparse, unparse_to
+
+
+sizes = [10_000, 100_000, 1_000_000]
+
+
+def program(size):
+    # Labels of 1000 instructions mixing operand kinds
+    rax = Assembly.Register("rax")
+    slot = Assembly.ScaledIndexed("rbp", None, 8, -8)
+    body = [Assembly.Mov(rax, Assembly.Integer("1")), Assembly.Add(slot, rax), Assembly.Mul(slot), Assembly.Call("print")]
+    return [Assembly.Label(f"f{i}", body * 250) for i in range(size // 1000)]
+
+
+def measure(function):
+    tracemalloc.start()
+    start = perf_counter()
+    function()
+    seconds = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def bench_unparser():
+    print(f"{'instructions':>12} {'file seconds':>13} {'file peak MB':>13} {'string seconds':>15} {'string peak MB':>15}")
+    for size in sizes:
+        assembly_list = program(size)
+
+        with open(os.devnull, "w") as stream:
+            file_seconds, file_peak = measure(lambda: unparse_to(assembly_list, stream))
+        string_seconds, string_peak = measure(lambda: unparse(assembly_list))
+
+        print(
+            f"{size:>12} {file_seconds:>13.3f} {file_peak / 2 ** 20:>13.2f}"
+            f" {string_seconds:>15.3f} {string_peak / 2 ** 20:>15.2f}")
+
+
+bench_unparser()
@@ -0,0 +1,92 @@
+# Snake programs shared by the code generation benchmarks.
+
+arithmetic = """
+x = 1 + 2
+y = (x + 3) * (x - 4) - x / 2
+z = -(y % 7) + x * y
+print(x, y, z)
+"""
+
+functions = """
+def area(width, height):
+\tresult = width * height
+\tprint(result)
+
+def perimeter(width, height):
+\tdouble_width = width + width
+\tdouble_height = height * 2
+\tprint(double_width + double_height)
+
+w = 3
+h = 4
+area(w, h)
+perimeter(w, h + 1)
+area(w * 2, h / 2)
+"""
+
+expressions = """
+a = 10
+b = 20
+c = 30
+d = (a + b) * (b + c) - (a * c) / (b - a) + (a % 3) * (c % 7)
+e = ((a - b) * (c - d) + (a + b + c + d)) * -((d - c) % (b + 1))
+f = a * b + a * b - c / d + c / d
+print(d, e, f)
+"""
+
+strings = """
+print("hello")
+print("world")
+print("hello")
+def greet(name):
+\tprint("hello", name)
+\tprint("hello", "world")
+greet("snake")
+"""
+
+pressure = """
+a = 1
+b = 2
+c = 3
+d = 4
+e = 5
+f = 6
+g = 7
+h = 8
+i = 9
+j = 10
+print(a + b)
+k = a * b + c * d + e * f + g * h + i * j
+print(k)
+print(a + b + c + d + e + f + g + h + i + j)
+"""
+
+subexpressions = """
+def f(x, y):
+\tprint(x * y + x * y)
+\tprint((x + y) * (y + x) - x * y)
+\tz = x - y
+\tx = x + 1
+\tprint(x * y + (x - y) + z)
+\tprint(-x + -x)
+\tprint(x / y + x / y)
+f(3, 4)
+"""
+
+scaling = """
+def scale(x, y):
+\tprint(x * 8 + y * 3)
+\tprint(x / 4 - y % 16)
+\tprint(x * 10 + y / 7)
+scale(13, -21)
+"""
+
+programs = {
+    "arithmetic": arithmetic,
+    "functions": functions,
+    "expressions": expressions,
+    "strings": strings,
+    "pressure": pressure,
+    "subexpressions": subexpressions,
+    "scaling": scaling,
+}
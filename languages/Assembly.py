@@ -1,105 +1,160 @@
-
-
-binary_operators = {
-    "+": Assembly.Add(),
-}
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Tuple
 
 
 class Assembly:
     # Addressing Modes
+    @dataclass(frozen=True, slots=True)
     class Register:
-        def __init__(self, register: str):
-            self.register = register
+        register: str
 
+    @dataclass(frozen=True, slots=True)
     class RegisterValue:
-        def __init__(self, register: str):
-            self.register = register
+        register: str
 
     # Scaled-indexed is used for stack base ptr accessed by an offset of a scaled memory size.
-    # eg. (base + (index * scale))
+    # eg. (offset + base + (index * scale)), where the index register is optional
+    @dataclass(frozen=True, slots=True)
     class ScaledIndexed:
-        def __init__(self, base: str, index: str, scale: int = 8):
-            self.base = base  # register
-            self.index = index  # register
-            self.scale = scale  # int
+        base: str  # register
+        index: None | str  # register
+        scale: int = 8
+        offset: int = 0
 
     # Immediates
+    @dataclass(frozen=True, slots=True)
     class Integer:
-        def __init__(self, integer):
-            self.integer = integer
+        integer: str
 
+    @dataclass(frozen=True, slots=True)
     class String:
-        def __init__(self, string):
-            self.string = string
+        string: str
 
+    @dataclass(frozen=True, slots=True)
     class StringDeclare:
-        def __init__(self, string):
-            self.string = string
+        string: str
 
     # BinaryOp
+    @dataclass(frozen=True, slots=True)
     class Add:
-        def __init__(self, destination, source):
-            self.destination = destination
-            self.source = source
+        destination: Assembly
+        source: Assembly
 
+    @dataclass(frozen=True, slots=True)
     class Sub:
-        def __init__(self, destination, source):
-            self.destination = destination
-            self.source = source
+        destination: Assembly
+        source: Assembly
 
     # Result stored in %rax
+    @dataclass(frozen=True, slots=True)
     class Mul:
-        def __init__(self, source):
-            self.source = source
+        source: Assembly
+
+    # Signed, the full product stored in %rdx (high) and %rax (low)
+    @dataclass(frozen=True, slots=True)
+    class IMul:
+        source: Assembly
 
     # Quotient stored in %rax, Remainder stored in %rdx
+    @dataclass(frozen=True, slots=True)
     class Div:
-        def __init__(self, source):
-            self.source = source
+        source: Assembly
+
+    # Signed, quotient stored in %rax, Remainder stored in %rdx
+    @dataclass(frozen=True, slots=True)
+    class IDiv:
+        source: Assembly
+
+    # Sign-extend %rax into %rdx, before a signed division
+    @dataclass(frozen=True, slots=True)
+    class Cqo:
+        pass
+
+    @dataclass(frozen=True, slots=True)
+    class And:
+        destination: Assembly
+        source: Assembly
+
+    # Shifts by an immediate count (Shr fills with zeros, Sar with the sign bit)
+    @dataclass(frozen=True, slots=True)
+    class Shl:
+        destination: Assembly
+        source: Assembly
+
+    @dataclass(frozen=True, slots=True)
+    class Shr:
+        destination: Assembly
+        source: Assembly
+
+    @dataclass(frozen=True, slots=True)
+    class Sar:
+        destination: Assembly
+        source: Assembly
+
+    # Load effective address, computes the address of a ScaledIndexed source without reading memory
+    @dataclass(frozen=True, slots=True)
+    class Lea:
+        destination: Assembly
+        source: Assembly
 
     # UnaryOp
+    @dataclass(frozen=True, slots=True)
     class Neg:
-        def __init__(self, destination):
-            self.destination = destination
+        destination: Assembly
 
     # Functionality
+    @dataclass(frozen=True, slots=True)
     class Mov:
-        def __init__(self, destination, source):
-            self.destination = destination
-            self.source = source
+        destination: Assembly
+        source: Assembly
 
+    @dataclass(frozen=True, slots=True)
     class Call:
-        def __init__(self, label):
-            self.label = label
+        label: str
 
+    @dataclass(frozen=True, slots=True)
     class Push:
-        def __init__(self, source):
-            self.source = source
+        source: Assembly
 
+    @dataclass(frozen=True, slots=True)
     class Pop:
-        def __init__(self, destination):
-            self.destination = destination
+        destination: Assembly
 
+    @dataclass(frozen=True, slots=True)
     class Ret:
-        def __init__(self):
-            pass
+        pass
 
+    @dataclass(frozen=True, slots=True)
     class Label:
-        def __init__(self, label, instructions):
-            self.label = label
-            self.instructions = instructions
+        label: str
+        instructions: Tuple[Assembly, ...]
+
+        def __post_init__(self):
+            object.__setattr__(self, "instructions", tuple(self.instructions))
 
     # Set condition codes according to s1 - s2
+    @dataclass(frozen=True, slots=True)
     class Cmp:
-        def __init__(self, s1, s2):
-            self.s1 = s1
-            self.s2 = s2
+        s1: Assembly
+        s2: Assembly
 
     # Jump
+    @dataclass(frozen=True, slots=True)
     class Jmp:
-        def __init__(self, label):
-            self.label = label
+        label: str
 
+    @dataclass(frozen=True, slots=True)
     class Jne:
-        def __init__(self, label):
-            self.label = label
+        label: str
+
+
+binary_operators = {
+    "+": Assembly.Add,
+    "-": Assembly.Sub,
+}
+
+# System V x86-64 calling convention
+param_registers = ["rdi", "rsi", "rdx", "rcx", "r8", "r9"]
+return_register = "rax"
+callee_saved_registers = ["rbx", "r12", "r13", "r14", "r15"]
@@ -1,6 +1,6 @@
-
-
-from typing import List
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Tuple
 
 
 class Snake:
@@ -16,142 +16,79 @@ class Snake:
         "-",
     ]
 
+    @dataclass(frozen=True, slots=True)
     class String:
-        def __init__(self, string):
-            self.string = string  # type: str
+        string: str
 
         def __str__(self):
             return f"Snake.String({self.string})"
 
-        def __eq__(self, other):
-            return (
-                isinstance(other, Snake.String)
-                and self.string == other.string)
-
-        __match_args__ = ("string",)
-
+    @dataclass(frozen=True, slots=True)
     class Boolean:
-        def __init__(self, boolean):
-            self.boolean = boolean  # type: str
+        boolean: str
 
         def __str__(self):
             return f"Snake.Boolean({self.boolean})"
 
-        def __eq__(self, other):
-            return (
-                isinstance(other, Snake.Boolean)
-                and self.boolean == other.boolean)
-
-        __match_args__ = ("boolean",)
-
+    @dataclass(frozen=True, slots=True)
     class Integer:
-        def __init__(self, integer):
-            self.integer = integer  # type: str
+        integer: str
 
         def __str__(self):
             return f"Snake.Integer({self.integer})"
 
-        def __eq__(self, other):
-            return (
-                isinstance(other, Snake.Integer)
-                and self.integer == other.integer)
-
-        __match_args__ = ("integer",)
-
+    @dataclass(frozen=True, slots=True)
     class Variable:
-        def __init__(self, variable):
-            self.variable = variable  # type: str
+        variable: str
 
         def __str__(self):
             return f"Snake.Variable({self.variable})"
 
-        def __eq__(self, other):
-            return (
-                isinstance(other, Snake.Variable)
-                and self.variable == other.variable)
-
-        __match_args__ = ("variable",)
-
+    @dataclass(frozen=True, slots=True)
     class Call:
-        def __init__(self, name, params):
-            self.name = name  # type: str
-            self.params = params  # type: List[Snake]
+        name: str
+        params: Tuple[Snake, ...]
+
+        def __post_init__(self):
+            object.__setattr__(self, "params", tuple(self.params))
 
         def __str__(self):
             return f"Snake.Call({self.name}, {self.params})"
 
-        def __eq__(self, other):
-            return (
-                isinstance(other, Snake.Call)
-                and self.name == other.name
-                and self.params == other.params)
-
-        __match_args__ = ("name", "params")
-
+    @dataclass(frozen=True, slots=True)
     class BinaryOp:
-        def __init__(self, op, value1, value2):
-            self.op = op  # type: str
-            self.value1 = value1  # type: Snake
-            self.value2 = value2  # type: Snake
+        op: str
+        value1: Snake
+        value2: Snake
 
         def __str__(self):
             return f"Snake.BinaryOp({self.op}, {self.value1}, {self.value2})"
 
-        def __eq__(self, other):
-            return (
-                isinstance(other, Snake.BinaryOp)
-                and self.op == other.op
-                and self.value1 == other.value1
-                and self.value2 == other.value2)
-
-        __match_args__ = ("op", "value1", "value2")
-
+    @dataclass(frozen=True, slots=True)
     class UnaryOp:
-        def __init__(self, op, value):
-            self.op = op  # type: str
-            self.value = value  # type: Snake
+        op: str
+        value: Snake
 
         def __str__(self):
             return f"Snake.UnaryOp({self.op}, {self.value})"
 
-        def __eq__(self, other):
-            return (
-                isinstance(other, Snake.UnaryOp)
-                and self.op == other.op
-                and self.value == other.value)
-
-        __match_args__ = ("op", "value")
-
+    @dataclass(frozen=True, slots=True)
     class FunDef:
-        def __init__(self, name, params, inner_instrs):
-            self.name = name  # type: str
-            self.params = params  # type: List[Snake]
-            self.inner_instrs = inner_instrs  # type: List[Snake]
+        name: str
+        params: Tuple[Snake, ...]
+        inner_instrs: Tuple[Snake, ...]
+
+        def __post_init__(self):
+            object.__setattr__(self, "params", tuple(self.params))
+            object.__setattr__(self, "inner_instrs", tuple(self.inner_instrs))
 
         def __str__(self):
             return f"Snake.FunDef({self.name}, {self.params}, {self.inner_instrs})"
 
-        def __eq__(self, other):
-            return (
-                isinstance(other, Snake.FunDef)
-                and self.name == other.name
-                and self.params == other.params
-                and self.inner_instrs == other.inner_instrs)
-
-        __match_args__ = ("name", "params", "inner_instrs")
-
+    @dataclass(frozen=True, slots=True)
     class Assign:
-        def __init__(self, variable, value):
-            self.variable = variable  # type: Snake.Variable
-            self.value = value  # type: Snake
+        variable: Snake.Variable
+        value: Snake
 
         def __str__(self):
             return f"Snake.Assign({self.variable}, {self.value})"
-
-        def __eq__(self, other):
-            return (
-                isinstance(other, Snake.Assign)
-                and self.variable == other.variable
-                and self.value == other.value)
-
-        __match_args__ = ("variable", "value")
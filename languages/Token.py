@@ -1,129 +1,105 @@
+from dataclasses import dataclass
+
+
+def interned(cls):
+    """
+    Makes a payload-free class return one shared instance from every construction.
+    """
+    instance = object.__new__(cls)
+    cls.__new__ = lambda cls: instance
+    return cls
 
 
 class Token:
     # Primitives
+    @dataclass(frozen=True, slots=True)
     class String:
-        def __init__(self, string):
-            self.string = string  # type: str
+        string: str
 
         def __str__(self):
             return f"Token.String({self.string})"
 
-        def __eq__(self, other):
-            return (
-                isinstance(other, Token.String)
-                and self.string == other.string)
-
+    @dataclass(frozen=True, slots=True)
     class Boolean:
-        def __init__(self, boolean):
-            self.boolean = boolean  # type: str
+        boolean: str
 
         def __str__(self):
             return f"Token.Boolean({self.boolean})"
 
-        def __eq__(self, other):
-            return (
-                isinstance(other, Token.Boolean)
-                and self.boolean == other.boolean)
-
+    @dataclass(frozen=True, slots=True)
     class Integer:
-        def __init__(self, integer):
-            self.integer = integer  # type: str
+        integer: str
 
         def __str__(self):
             return f"Token.Integer({self.integer})"
 
-        def __eq__(self, other):
-            return (
-                isinstance(other, Token.Integer)
-                and self.integer == other.integer)
-
     # Variable
+    @dataclass(frozen=True, slots=True)
     class Variable:
-        def __init__(self, variable):
-            self.variable = variable  # type: str
+        variable: str
 
         def __str__(self):
             return f"Token.Variable({self.variable})"
 
-        def __eq__(self, other):
-            return (
-                isinstance(other, Token.Variable)
-                and self.variable == other.variable)
-
     # Reserved Symbols/Words
+    @interned
+    @dataclass(frozen=True, slots=True)
     class Newline:
         def __str__(self):
             return f"Token.Newline()"
 
-        def __eq__(self, other):
-            return isinstance(other, Token.Newline)
-
+    @interned
+    @dataclass(frozen=True, slots=True)
     class Indent:
         def __str__(self):
             return f"Token.Indent()"
 
-        def __eq__(self, other):
-            return isinstance(other, Token.Indent)
-
+    @interned
+    @dataclass(frozen=True, slots=True)
     class Dedent:
         def __str__(self):
             return f"Token.Dedent()"
 
-        def __eq__(self, other):
-            return isinstance(other, Token.Dedent)
-
+    @interned
+    @dataclass(frozen=True, slots=True)
     class Def:
         def __str__(self):
             return f"Token.Def()"
 
-        def __eq__(self, other):
-            return isinstance(other, Token.Def)
-
+    @interned
+    @dataclass(frozen=True, slots=True)
     class Comma:
         def __str__(self):
             return f"Token.Comma()"
 
-        def __eq__(self, other):
-            return isinstance(other, Token.Comma)
-
+    @interned
+    @dataclass(frozen=True, slots=True)
     class Colon:
         def __str__(self):
             return f"Token.Colon()"
 
-        def __eq__(self, other):
-            return isinstance(other, Token.Colon)
-
+    @interned
+    @dataclass(frozen=True, slots=True)
     class OpenParens:
         def __str__(self):
             return f"Token.OpenParens()"
 
-        def __eq__(self, other):
-            return isinstance(other, Token.OpenParens)
-
+    @interned
+    @dataclass(frozen=True, slots=True)
     class CloseParens:
         def __str__(self):
             return f"Token.CloseParens()"
 
-        def __eq__(self, other):
-            return isinstance(other, Token.CloseParens)
-
+    @interned
+    @dataclass(frozen=True, slots=True)
     class Equals:
         def __str__(self):
             return f"Token.Equals()"
 
-        def __eq__(self, other):
-            return isinstance(other, Token.Equals)
-
     # Operator
+    @dataclass(frozen=True, slots=True)
     class Operator:
-        def __init__(self, op):
-            self.op = op  # type: str
+        op: str
 
         def __str__(self):
             return f"Token.Operator({self.op})"
-
-        def __eq__(self, other):
-            return (
-                isinstance(other, Token.Operator)
-                and self.op == other.op)
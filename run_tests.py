@@ -6,10 +6,18 @@ import os
 test_commands = [
     # "python -m tests.test_tokenizer",
     # "python -m tests.test_lexer",
-    # "python -m tests.test_parser",
+    "python -m tests.test_parser",
     "python -m tests.test_normalizer",
-    # "python -m tests.test_assembler",
-    # "python -m tests.test_unparser(att)",
+    "python -m tests.test_assembler",
+    "python -m tests.test_division",
+    "python -m tests.test_register_allocator",
+    "python -m tests.test_optimizer",
+    "python -m tests.test_peephole",
+    "python -m tests.test_unparser_att",
+    "python -m tests.test_compiler",
+    "python -m tests.test_cache",
+    "python -m tests.test_incremental",
+    "python -m tests.test_server",
 ]
 
 for command in test_commands:
@@ -0,0 +1,230 @@
+from translators.assembler import assemble, assemble_instruction, Frame, StringPool
+from translators.normalizer import normalize
+from languages.Snake import Snake
+from languages.Normal import Normal
+from languages.Assembly import Assembly
+
+
+rax = Assembly.Register("rax")
+rbx = Assembly.Register("rbx")
+rdx = Assembly.Register("rdx")
+rdi = Assembly.Register("rdi")
+r11 = Assembly.Register("r11")
+r12 = Assembly.Register("r12")
+slot1 = Assembly.ScaledIndexed("rbp", None, 8, -8)
+slot2 = Assembly.ScaledIndexed("rbp", None, 8, -16)
+
+
+tests = [
+    # Literal into a variable [x = 0]
+    (
+        [Normal.Assign(Normal.VarMemory(0), Normal.Integer("0"))],
+        [Assembly.Mov(slot1, Assembly.Integer("0"))],
+    ),
+
+    # Variable into a variable [y = x], through the scratch register (slots are numbered by first use)
+    (
+        [Normal.Assign(Normal.VarMemory(1), Normal.VarMemory(0))],
+        [Assembly.Mov(r11, slot2), Assembly.Mov(slot1, r11)],
+    ),
+
+    # BinaryOp into a variable [x = 1 + 2]
+    (
+        [
+            Normal.Assign(Normal.TempMemory(0), Normal.Integer("1")),
+            Normal.Assign(Normal.TempMemory(1), Normal.Integer("2")),
+            Normal.Assign(Normal.VarMemory(0), Normal.BinaryOp("+", Normal.TempMemory(0), Normal.TempMemory(1))),
+        ],
+        [
+            Assembly.Mov(rbx, Assembly.Integer("1")),
+            Assembly.Mov(r12, Assembly.Integer("2")),
+            Assembly.Mov(slot1, rbx),
+            Assembly.Add(slot1, r12),
+        ],
+    ),
+
+    # BinaryOp into one of its values [T0 = T0 - T1]
+    (
+        [Normal.Assign(Normal.TempMemory(0), Normal.BinaryOp("-", Normal.TempMemory(0), Normal.TempMemory(1)))],
+        [Assembly.Sub(rbx, r12)],
+    ),
+
+    # Remainder [x = T0 % T1]
+    (
+        [Normal.Assign(Normal.VarMemory(0), Normal.BinaryOp("%", Normal.TempMemory(0), Normal.TempMemory(1)))],
+        [Assembly.Mov(rax, rbx), Assembly.Cqo(), Assembly.IDiv(r12), Assembly.Mov(slot1, rdx)],
+    ),
+
+    # Multiplication preserves a pending %rdx parameter [name(x, y, 2 * 3)]
+    (
+        [
+            Normal.Assign(Normal.ParamMemory(2), Normal.Integer("2")),
+            Normal.Assign(Normal.ParamMemory(3), Normal.BinaryOp("*", Normal.TempMemory(0), Normal.Integer("3"))),
+        ],
+        [
+            Assembly.Mov(rdx, Assembly.Integer("2")),
+            Assembly.Push(rdx),
+            Assembly.Mov(r11, Assembly.Integer("3")),
+            Assembly.Mov(rax, rbx),
+            Assembly.Mul(r11),
+            Assembly.Pop(rdx),
+            Assembly.Mov(Assembly.Register("rcx"), rax),
+        ],
+    ),
+
+    # UnaryOp and Call [x = -T0 \n name(x)]
+    (
+        [
+            Normal.Assign(Normal.VarMemory(0), Normal.UnaryOp("-", Normal.TempMemory(0))),
+            Normal.Assign(Normal.ParamMemory(0), Normal.VarMemory(0)),
+            Normal.Call("name", [Normal.ParamMemory(0)]),
+        ],
+        [
+            Assembly.Mov(slot1, rbx),
+            Assembly.Neg(slot1),
+            Assembly.Mov(rdi, slot1),
+            Assembly.Call("name"),
+        ],
+    ),
+]
+
+
+def test_assembler():
+    for data, expected in tests:
+        frame = Frame()
+        result = []
+        for instr in data:
+            assemble_instruction(instr, frame, [], result)
+
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+
+
+def test_assemble_program():
+    # def name(x): \n \t x = 0 \n name(1)
+    result = assemble([
+        Normal.FunDef("name", [Normal.ParamMemory(0)], [
+            Normal.Assign(Normal.VarMemory(0), Normal.ParamMemory(0)),
+        ]),
+        Normal.Assign(Normal.ParamMemory(0), Normal.Integer("1")),
+        Normal.Call("name", [Normal.ParamMemory(0)]),
+    ])
+
+    expected = [
+        Assembly.Label("main", [
+            Assembly.Push(Assembly.Register("rbp")),
+            Assembly.Mov(Assembly.Register("rbp"), Assembly.Register("rsp")),
+            Assembly.Mov(rdi, Assembly.Integer("1")),
+            Assembly.Call("name"),
+            Assembly.Mov(rax, Assembly.Integer("0")),
+            Assembly.Mov(Assembly.Register("rsp"), Assembly.Register("rbp")),
+            Assembly.Pop(Assembly.Register("rbp")),
+            Assembly.Ret(),
+        ]),
+        Assembly.Label("name", [
+            Assembly.Push(Assembly.Register("rbp")),
+            Assembly.Mov(Assembly.Register("rbp"), Assembly.Register("rsp")),
+            Assembly.Sub(Assembly.Register("rsp"), Assembly.Integer("16")),
+            Assembly.Mov(slot1, rdi),
+            Assembly.Mov(Assembly.Register("rsp"), Assembly.Register("rbp")),
+            Assembly.Pop(Assembly.Register("rbp")),
+            Assembly.Ret(),
+        ]),
+    ]
+
+    if result != expected:
+        print(f"result {result} did not equal expected {expected}")
+
+
+def test_tail_call():
+    # def name(x): \n \t print(x) \n \t name(x)
+    result = assemble([
+        Normal.FunDef("name", [Normal.ParamMemory(0)], [
+            Normal.Assign(Normal.VarMemory(0), Normal.ParamMemory(0)),
+            Normal.Assign(Normal.ParamMemory(0), Normal.VarMemory(0)),
+            Normal.Call("print", [Normal.ParamMemory(0)]),
+            Normal.Assign(Normal.ParamMemory(0), Normal.VarMemory(0)),
+            Normal.Call("name", [Normal.ParamMemory(0)]),
+        ]),
+    ])[1]
+
+    # The last call tears down the frame and jumps, so the recursion runs in constant stack space
+    expected = Assembly.Label("name", [
+        Assembly.Push(Assembly.Register("rbp")),
+        Assembly.Mov(Assembly.Register("rbp"), Assembly.Register("rsp")),
+        Assembly.Sub(Assembly.Register("rsp"), Assembly.Integer("16")),
+        Assembly.Mov(slot1, rdi),
+        Assembly.Mov(rdi, slot1),
+        Assembly.Call("print"),
+        Assembly.Mov(rdi, slot1),
+        Assembly.Mov(Assembly.Register("rsp"), Assembly.Register("rbp")),
+        Assembly.Pop(Assembly.Register("rbp")),
+        Assembly.Jmp("name"),
+    ])
+
+    if result != expected:
+        print(f"result {result} did not equal expected {expected}")
+
+
+def test_nested_call():
+    # two(1, print(2))
+    result = assemble(normalize([
+        Snake.Call("two", [Snake.Integer("1"), Snake.Call("print", [Snake.Integer("2")])]),
+    ]))[0]
+
+    # The first parameter is held in a temporary until the call in the second one is done
+    expected = Assembly.Label("main", [
+        Assembly.Push(Assembly.Register("rbp")),
+        Assembly.Mov(Assembly.Register("rbp"), Assembly.Register("rsp")),
+        Assembly.Sub(Assembly.Register("rsp"), Assembly.Integer("16")),
+        Assembly.Mov(slot1, rbx),
+        Assembly.Mov(rbx, Assembly.Integer("1")),
+        Assembly.Mov(rdi, Assembly.Integer("2")),
+        Assembly.Call("print"),
+        Assembly.Mov(Assembly.Register("rsi"), rax),
+        Assembly.Mov(rdi, rbx),
+        Assembly.Call("two"),
+        Assembly.Mov(rax, Assembly.Integer("0")),
+        Assembly.Mov(rbx, slot1),
+        Assembly.Mov(Assembly.Register("rsp"), Assembly.Register("rbp")),
+        Assembly.Pop(Assembly.Register("rbp")),
+        Assembly.Ret(),
+    ])
+
+    if result != expected:
+        print(f"result {result} did not equal expected {expected}")
+
+
+def test_string_pool():
+    # print("hi") \n print("hi") \n print("bye")
+    result = assemble([
+        Normal.Assign(Normal.ParamMemory(0), Normal.String("hi")),
+        Normal.Call("print", [Normal.ParamMemory(0)]),
+        Normal.Assign(Normal.ParamMemory(0), Normal.String("hi")),
+        Normal.Call("print", [Normal.ParamMemory(0)]),
+        Normal.Assign(Normal.ParamMemory(0), Normal.String("bye")),
+        Normal.Call("print", [Normal.ParamMemory(0)]),
+    ])
+
+    # Both uses of "hi" load the same label, and each literal is declared once
+    loads = [instr.source for instr in result[0].instructions if isinstance(instr, Assembly.Lea) and instr.destination == rdi]
+    expected = [
+        Assembly.Label(f"_str_{loads[0].string}", [Assembly.StringDeclare("hi")]),
+        Assembly.Label(f"_str_{loads[2].string}", [Assembly.StringDeclare("bye")]),
+    ]
+
+    if loads[0] != loads[1] or result[1:] != expected:
+        print(f"result {result} did not pool the string literals")
+
+    pool = StringPool()
+    for string in ["hi", "hi", "hi", "bye"]:
+        pool.label(string)
+    if pool.bytes_saved() != 6:
+        print(f"result {pool.bytes_saved()} did not equal expected 6")
+
+
+test_assembler()
+test_assemble_program()
+test_tail_call()
+test_nested_call()
+test_string_pool()
@@ -0,0 +1,114 @@
+import os
+import tempfile
+from translators import compiler
+from translators.cache import CompileCache
+from translators.compiler import compile, compile_cached
+from translators.lexer import lex_source
+from translators.parser import parse
+from translators.normalizer import normalize
+
+
+source = "x = 1 + 2\nprint(x)\n"
+
+
+def test_key():
+    cache = CompileCache("unused")
+
+    # The key changes with the source and with every flag that changes the assembly
+    keys = {
+        cache.key(source),
+        cache.key(source + "print(x)\n"),
+        cache.key(source, optimize=True),
+        cache.key(source, allocate=True),
+    }
+    if len(keys) != 4 or cache.key(source) != CompileCache("other").key(source):
+        print(f"result {keys} did not have 4 distinct, directory independent keys")
+
+
+def test_get_put():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = CompileCache(directory)
+        key = cache.key(source)
+        normal_list = normalize(parse(list(lex_source(source))))
+
+        missed = cache.get(key)
+        cache.put(key, "assembly\n", normal_list)
+        result = (missed, cache.get(key), cache.get_normal(key))
+        expected = (None, "assembly\n", normal_list)
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+
+        stats = (cache.stats.hits, cache.stats.misses, cache.stats.writes)
+        if stats != (1, 1, 1):
+            print(f"result {stats} did not equal expected (1, 1, 1)")
+
+        # No temporary files are left behind by the atomic writes
+        names = [name for _, _, names in os.walk(directory) for name in names]
+        if any(name.endswith(".tmp") for name in names):
+            print(f"result {names} left temporary files")
+
+
+def test_evict():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = CompileCache(directory, max_bytes=250)
+        keys = [cache.key(str(i)) for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, "x" * 100)
+            os.utime(cache.path(key, ".s"), (i, i))
+
+        # Reading the oldest entry makes the second one the least recently used
+        cache.get(keys[0])
+        cache.evict()
+
+        result = [cache.get(key) is not None for key in keys]
+        expected = [True, False, True]
+        if result != expected or cache.stats.evictions != 1:
+            print(f"result {result} did not equal expected {expected}")
+
+
+def test_evict_entry_files():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = CompileCache(directory, max_bytes=600)
+        normal_list = normalize(parse(list(lex_source(source))))
+        keys = [cache.key(str(i)) for i in range(2)]
+        for i, key in enumerate(keys):
+            cache.put(key, "x" * 100, normal_list)
+            os.utime(cache.path(key, ".s"), (i, i))
+            os.utime(cache.path(key, ".normal.pickle"), (i + 10, i + 10))
+
+        # A stale temporary file from a crashed writer
+        stale = os.path.join(directory, "stale.tmp")
+        with open(stale, "w") as file:
+            file.write("x" * 1000)
+        os.utime(stale, (0, 0))
+        cache.evict()
+
+        # The oldest entry loses its assembly and its Normal form together
+        result = [(cache.get(key) is not None, cache.get_normal(key) is not None) for key in keys]
+        expected = [(False, False), (True, True)]
+        if result != expected or os.path.exists(stale) or cache.stats.evictions != 1:
+            print(f"result {result} did not equal expected {expected}, or the stale file was kept")
+
+
+def test_warm_rebuild():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = CompileCache(directory)
+        cold, cold_cached = compile_cached(source, cache)
+
+        # A hit does not tokenize at all
+        scan = compiler.scan
+        compiler.scan = lambda text: print("result tokenized a cached source")
+        try:
+            warm, warm_cached = compile_cached(source, cache)
+        finally:
+            compiler.scan = scan
+
+        if (cold_cached, warm_cached) != (False, True) or cold != warm or warm != compile(source):
+            print(f"result {warm} did not equal expected {cold}")
+
+
+test_key()
+test_get_put()
+test_evict()
+test_evict_entry_files()
+test_warm_rebuild()
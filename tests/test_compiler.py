@@ -0,0 +1,157 @@
+import io
+import os
+import tempfile
+from contextlib import redirect_stderr
+from translators.compiler import compile, main, compile_batch, find_sources, output_path
+from translators.lexer import lex_source
+from translators.parser import parse
+from translators.normalizer import normalize
+from translators.assembler import assemble
+from translators.unparser_att import unparse
+
+
+source = "def name(x):\n\tprint(x + 1)\n\nname(2)\nprint(\"done\")\n"
+
+
+def test_compile():
+    result = compile(source)
+    expected = unparse(assemble(normalize(parse(list(lex_source(source))))))
+
+    if result != expected:
+        print(f"result {result} did not equal expected {expected}")
+
+
+def test_compile_inlined():
+    # The argument of an inlined call is propagated into its body and folded
+    result = compile("def sq(x):\n\tprint(x * x)\n\nsq(3)\n", optimize=True)
+
+    if "\tmovq $9, %rdi\n\tcall print\n" not in result or "mul" in result or "call sq" in result:
+        print(f"result {result} was not folded to print(9)")
+
+    # No argument is left in a parameter register
+    result = compile("def area(w, h):\n\tprint(w * h)\n\narea(3, 4)\n", optimize=True)
+
+    if "\tmovq $12, %rdi\n\tcall print\n" not in result or result.count("%rdi") != 1 or "%rsi" in result:
+        print(f"result {result} was not folded to print(12)")
+
+
+def test_time_stages():
+    timings = []
+    compile(source, optimize=True, timings=timings)
+
+    result = [(timing.name, timing.unit) for timing in timings]
+    expected = [
+        ("tokenize", "words"),
+        ("lex", "tokens"),
+        ("parse", "Snake nodes"),
+        ("fold", "Snake nodes"),
+        ("normalize", "Normal instrs"),
+        ("optimize", "Normal instrs"),
+        ("assemble", "Assembly instrs"),
+        ("peephole", "Assembly instrs"),
+        ("unparse", "lines"),
+    ]
+    if result != expected:
+        print(f"result {result} did not equal expected {expected}")
+
+    # The word and token counts are exact, the other stages only need to produce something
+    counts = {timing.name: timing.items for timing in timings}
+    if counts["tokenize"] != 28 or counts["lex"] != 26 or min(counts.values()) <= 0:
+        print(f"result {counts} has unexpected item counts")
+
+
+def test_main_error():
+    # A syntax error is reported with a failing exit status, instead of a traceback
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bad.py")
+        with open(path, "w") as file:
+            file.write("x = (\n")
+
+        errors = io.StringIO()
+        with redirect_stderr(errors):
+            result = main([path, "-o", os.path.join(directory, "bad.s")])
+
+        if result != 1 or not errors.getvalue().startswith(f"{path}: "):
+            print(f"result {result} {errors.getvalue()} did not equal expected 1 with the error")
+
+
+def test_main_file_errors():
+    # A source that cannot be decoded, or does not exist, is reported with a failing exit status
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "latin1.py")
+        with open(path, "wb") as file:
+            file.write(b"\xff x = 1\n")
+
+        for source_path in [path, os.path.join(directory, "missing.py")]:
+            errors = io.StringIO()
+            with redirect_stderr(errors):
+                result = main([source_path, "-o", os.path.join(directory, "out.s")])
+
+            if result != 1 or not errors.getvalue().startswith(f"{source_path}: "):
+                print(f"result {result} {errors.getvalue()} did not equal expected 1 with the error")
+
+
+def test_main_deep_expression():
+    # An expression nested past the recursion limit is reported like a syntax error
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "deep.py")
+        with open(path, "w") as file:
+            file.write("x = " + " + ".join(["1"] * 5000) + "\n")
+
+        errors = io.StringIO()
+        with redirect_stderr(errors):
+            result = main([path, "-o", os.path.join(directory, "deep.s")])
+
+        if result != 1 or not errors.getvalue().startswith(f"{path}: "):
+            print(f"result {result} {errors.getvalue()} did not equal expected 1 with the error")
+
+
+def test_compile_batch():
+    with tempfile.TemporaryDirectory() as directory:
+        for name, text in [("a.py", source), ("bad.py", "x = (\n"), ("c.py", "print(1)\n"), ("notes.txt", "")]:
+            with open(os.path.join(directory, name), "w") as file:
+                file.write(text)
+
+        sources = find_sources([directory])
+        outputs = [output_path(path) for path in sources]
+        completed = []
+        results = compile_batch(sources, outputs, workers=2, on_result=completed.append)
+
+        # The bad file is reported, and does not stop the others from compiling
+        result = [(os.path.basename(result.source), result.output is not None, result.error is None) for result in results]
+        expected = [("a.py", True, True), ("bad.py", False, False), ("c.py", True, True)]
+        if result != expected or len(completed) != 3:
+            print(f"result {result} did not equal expected {expected}")
+
+        with open(outputs[0]) as file:
+            if file.read() != compile(source):
+                print(f"result {outputs[0]} did not contain the assembly of {sources[0]}")
+
+
+def test_compile_batch_file_errors():
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "a.py"), "w") as file:
+            file.write(source)
+        with open(os.path.join(directory, "deep.py"), "w") as file:
+            file.write("x = " + " + ".join(["1"] * 5000) + "\n")
+        with open(os.path.join(directory, "latin1.py"), "wb") as file:
+            file.write(b"\xff\xfe x = 1\n")
+
+        sources = find_sources([directory])
+        results = compile_batch(sources, [output_path(path) for path in sources], workers=2)
+
+        # A file that cannot be decoded, or is nested too deeply, is reported without ending the batch
+        result = [(os.path.basename(result.source), result.error is None) for result in results]
+        expected = [("a.py", True), ("deep.py", False), ("latin1.py", False)]
+        if result != expected or not results[2].error.startswith("UnicodeDecodeError: "):
+            print(f"result {result} did not equal expected {expected}")
+
+
+test_compile()
+test_compile_inlined()
+test_time_stages()
+test_main_error()
+test_main_file_errors()
+test_main_deep_expression()
+test_compile_batch()
+test_compile_batch_file_errors()
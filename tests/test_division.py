@@ -0,0 +1,91 @@
+from translators.assembler import assemble_constant_division, divides_by_magic_number, magic_number
+from languages.Assembly import Assembly
+
+
+int_min = -2 ** 63
+int_max = 2 ** 63 - 1
+
+divisors = [3, -3, 5, 6, -6, 7, -7, 10, 641, -641, 1_000_000_007, 2 ** 31 + 5, 2 ** 62 + 1, -(2 ** 62 + 3), int_max, -int_max]
+dividends = [0, 1, -1, 2, -2, 3, -3, 6, -6, 7, -7, 640, -640, 641, -641, 123456789, -123456789,
+             2 ** 62, -2 ** 62, int_max - 1, int_max, int_min + 1, int_min]
+
+
+def wrap(value):
+    value %= 2 ** 64
+    return value - 2 ** 64 if value >= 2 ** 63 else value
+
+
+def truncated_division(value1, value2):
+    quotient = abs(value1) // abs(value2)
+    quotient = quotient if (value1 < 0) == (value2 < 0) else -quotient
+    return quotient, value1 - quotient * value2
+
+
+def value(registers, operand):
+    match operand:
+        case Assembly.Register(name):
+            return registers[name]
+        case Assembly.Integer(integer):
+            return wrap(int(integer))
+
+
+def execute(instructions, registers):
+    # Runs the instructions emitted for a constant division, on signed 64-bit registers
+    for instr in instructions:
+        match instr:
+            case Assembly.Mov(Assembly.Register(name), source):
+                registers[name] = value(registers, source)
+            case Assembly.Add(Assembly.Register(name), source):
+                registers[name] = wrap(registers[name] + value(registers, source))
+            case Assembly.Sub(Assembly.Register(name), source):
+                registers[name] = wrap(registers[name] - value(registers, source))
+            case Assembly.Sar(Assembly.Register(name), source):
+                registers[name] = registers[name] >> value(registers, source)
+            case Assembly.Shr(Assembly.Register(name), source):
+                registers[name] = wrap((registers[name] % 2 ** 64) >> value(registers, source))
+            case Assembly.IMul(source):
+                product = registers["rax"] * value(registers, source)
+                registers["rax"] = wrap(product)
+                registers["rdx"] = product >> 64
+            case _:
+                raise ValueError(f"unexpected instruction {instr}")
+
+
+def test_divides_by_magic_number():
+    # 0 and -1 keep idiv so that they still trap, powers of two are left to the peephole optimizer
+    for divisor, expected in [(0, False), (1, False), (-1, False), (2, False), (-8, False), (int_min, False),
+                              (3, True), (-3, True), (6, True), (int_max, True)]:
+        if divides_by_magic_number(divisor) != expected:
+            print(f"divides_by_magic_number({divisor}) did not equal expected {expected}")
+
+
+def test_magic_number():
+    # Known values (Hacker's Delight, table 10-2)
+    for divisor, expected in [(3, (0x5555555555555556, 0)), (7, (0x4924924924924925, 1)), (-7, (-0x4924924924924925, 1))]:
+        result = magic_number(divisor)
+
+        if result != expected:
+            print(f"magic_number({divisor}) {result} did not equal expected {expected}")
+
+
+def test_constant_division():
+    for divisor in divisors:
+        for dividend in dividends:
+            for op in ["/", "%"]:
+                instructions = []
+                result = assemble_constant_division(op, Assembly.Register("rbx"), divisor, instructions)
+                registers = {"rax": 0, "rdx": 0, "r11": 0, "rbx": dividend}
+                execute(instructions, registers)
+
+                quotient, remainder = truncated_division(dividend, divisor)
+                expected = quotient if op == "/" else remainder
+
+                if registers[result.register] != expected:
+                    print(f"{dividend} {op} {divisor} gave {registers[result.register]}, expected {expected}")
+                if registers["rbx"] != dividend:
+                    print(f"{dividend} {op} {divisor} clobbered the dividend")
+
+
+test_divides_by_magic_number()
+test_magic_number()
+test_constant_division()
@@ -0,0 +1,61 @@
+from translators.compiler import compile
+from translators.incremental import IncrementalCompiler, Chunk, split_chunks
+
+
+source = (
+    "# comment\n"
+    "x = 1\n"
+    "def name(y):\n"
+    "\tprint(y + 1)\n"
+    "\n"
+    "# comment\n"
+    "\tprint(\"a\")\n"
+    "def other():\n"
+    "\tprint(\"a\")\n"
+    "name(2)\n"
+)
+
+
+def test_split_chunks():
+    result = split_chunks(source)
+    expected = [
+        Chunk("# comment\nx = 1\n", False),
+        Chunk("def name(y):\n\tprint(y + 1)\n\n# comment\n\tprint(\"a\")\n", True),
+        Chunk("def other():\n\tprint(\"a\")\n", True),
+        Chunk("name(2)\n", False),
+    ]
+
+    if result != expected:
+        print(f"result {result} did not equal expected {expected}")
+
+
+def test_incremental():
+    tests = [
+        # First compilation
+        (source, (0, 2)),
+
+        # Nothing changed
+        (source, (2, 0)),
+
+        # One function changed
+        (source.replace("\tprint(\"a\")\nname", "\tprint(\"b\")\nname"), (1, 1)),
+
+        # A variable before the functions changes the variables they see
+        ("z = 0\n" + source, (0, 2)),
+
+        # A statement after the functions does not
+        ("z = 0\n" + source + "print(x)\n", (2, 0)),
+    ]
+
+    for allocate in [False, True]:
+        compiler = IncrementalCompiler(allocate)
+        for data, expected in tests:
+            result = compiler.compile(data)
+            stats = (compiler.stats.reused, compiler.stats.recompiled)
+
+            if result != compile(data, allocate=allocate) or stats != expected:
+                print(f"result {stats} did not equal expected {expected}, or differs from compile")
+
+
+test_split_chunks()
+test_incremental()
@@ -1,6 +1,7 @@
 
 
-from translators.lexer import lex
+from translators.tokenizer import tokenize
+from translators.lexer import lex, lex_iter, lex_source
 from languages.Token import Token
 
 
@@ -26,6 +27,12 @@ expected_outputs = [
     [Token.Variable("variable")],
 ]
 
+source_inputs = [
+    "def name(x, y):\n\tz = x + 'hi' # comment\n    w = -1\n\nname(1, \"2\")",
+    "x = True\ny = False * 12 % 3x\n",
+    "\"unclosed",
+]
+
 
 def test_lexer():
     for text, expected in zip(text_inputs, expected_outputs):
@@ -36,4 +43,31 @@ def test_lexer():
                 print(f"result {type(r)} did not equal expected type {type(e)}")
 
 
+def test_lex_iter():
+    for text, expected in zip(text_inputs, expected_outputs):
+        result = list(lex_iter(iter(text)))
+
+        if len(result) != len(expected):
+            print(f"result length {len(result)} did not equal expected length {len(expected)}")
+
+        for r, e in zip(result, expected):
+            if r != e:
+                print(f"result {type(r)} did not equal expected type {type(e)}")
+
+
+def test_lex_source():
+    for text in source_inputs:
+        result = list(lex_source(text))
+        expected = lex(tokenize(text))
+
+        if len(result) != len(expected):
+            print(f"result length {len(result)} did not equal expected length {len(expected)}")
+
+        for r, e in zip(result, expected):
+            if r != e:
+                print(f"result {r} did not equal expected {e}")
+
+
 test_lexer()
+test_lex_iter()
+test_lex_source()
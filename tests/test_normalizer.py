@@ -1,8 +1,10 @@
 
 
+from translators import normalizer
 from translators.normalizer import normalize
 from languages.Snake import Snake
 from languages.Normal import Normal
+from utils.Error import Error
 
 
 tests = [
@@ -93,6 +95,65 @@ tests = [
         ],
     ),
 
+    # Scopes [x = 0 \n def name(y): \n \t x = y \n \t z = 1 \n w = 2]
+    (
+        [
+            Snake.Assign(Snake.Variable("x"), Snake.Integer("0")),
+            Snake.FunDef("name", [Snake.Variable("y")], [
+                Snake.Assign(Snake.Variable("x"), Snake.Variable("y")),
+                Snake.Assign(Snake.Variable("z"), Snake.Integer("1")),
+            ]),
+            Snake.Assign(Snake.Variable("w"), Snake.Integer("2")),
+        ],
+        [
+            Normal.Assign(Normal.VarMemory(0), Normal.Integer("0")),
+            Normal.FunDef(
+                "name",
+                [Normal.ParamMemory(0)],
+                [
+                    Normal.Assign(Normal.VarMemory(1), Normal.ParamMemory(0)),
+                    Normal.Assign(Normal.VarMemory(0), Normal.VarMemory(1)),
+                    Normal.Assign(Normal.VarMemory(2), Normal.Integer("1")),
+                ]
+            ),
+            Normal.Assign(Normal.VarMemory(1), Normal.Integer("2")),
+        ],
+    ),
+
+    # Nested BinaryOp [x = (1 + 2) * (3 + 4)]
+    (
+        [Snake.Assign(Snake.Variable("x"), Snake.BinaryOp(
+            "*",
+            Snake.BinaryOp("+", Snake.Integer("1"), Snake.Integer("2")),
+            Snake.BinaryOp("+", Snake.Integer("3"), Snake.Integer("4")),
+        ))],
+        [
+            Normal.Assign(Normal.TempMemory(0), Normal.Integer("1")),
+            Normal.Assign(Normal.TempMemory(1), Normal.Integer("2")),
+            Normal.Assign(Normal.TempMemory(0), Normal.BinaryOp("+", Normal.TempMemory(0), Normal.TempMemory(1))),
+            Normal.Assign(Normal.TempMemory(1), Normal.Integer("3")),
+            Normal.Assign(Normal.TempMemory(2), Normal.Integer("4")),
+            Normal.Assign(Normal.TempMemory(1), Normal.BinaryOp("+", Normal.TempMemory(1), Normal.TempMemory(2))),
+            Normal.Assign(Normal.VarMemory(0), Normal.BinaryOp("*", Normal.TempMemory(0), Normal.TempMemory(1))),
+        ],
+    ),
+
+    # Right-heavy BinaryOp [x = 1 - 2 * 3]
+    (
+        [Snake.Assign(Snake.Variable("x"), Snake.BinaryOp(
+            "-",
+            Snake.Integer("1"),
+            Snake.BinaryOp("*", Snake.Integer("2"), Snake.Integer("3")),
+        ))],
+        [
+            Normal.Assign(Normal.TempMemory(0), Normal.Integer("2")),
+            Normal.Assign(Normal.TempMemory(1), Normal.Integer("3")),
+            Normal.Assign(Normal.TempMemory(0), Normal.BinaryOp("*", Normal.TempMemory(0), Normal.TempMemory(1))),
+            Normal.Assign(Normal.TempMemory(1), Normal.Integer("1")),
+            Normal.Assign(Normal.VarMemory(0), Normal.BinaryOp("-", Normal.TempMemory(1), Normal.TempMemory(0))),
+        ],
+    ),
+
     # UnaryOp [x = -1]
     (
         [Snake.Assign(Snake.Variable("x"), Snake.UnaryOp("-", Snake.Integer("1")))],
@@ -101,6 +162,22 @@ tests = [
             Normal.Assign(Normal.VarMemory(0), Normal.UnaryOp("-", Normal.TempMemory(0))),
         ],
     ),
+
+    # Expression with a call, as a statement [1 + name()]
+    (
+        [Snake.BinaryOp("+", Snake.Integer("1"), Snake.Call("name", []))],
+        [
+            Normal.Assign(Normal.TempMemory(0), Normal.Integer("1")),
+            Normal.Assign(Normal.TempMemory(1), Normal.Call("name", [])),
+            Normal.Assign(Normal.TempMemory(0), Normal.BinaryOp("+", Normal.TempMemory(0), Normal.TempMemory(1))),
+        ],
+    ),
+
+    # Expression without calls, as a statement [1 + 2]
+    (
+        [Snake.BinaryOp("+", Snake.Integer("1"), Snake.Integer("2"))],
+        [],
+    ),
 ]
 
 
@@ -108,9 +185,50 @@ def test_normalizer():
     for data, expected in tests:
         result = normalize(data)
 
+        if len(result) != len(expected):
+            print(f"result length {len(result)} did not equal expected length {len(expected)}")
+
         for r, e in zip(result, expected):
             if r != e:
                 print(f"result {type(r)} did not equal expected type {type(e)}")
 
 
+def test_outer_variable():
+    # x = 5 \n def name(y): \n \t print(x + y)
+    data = [
+        Snake.Assign(Snake.Variable("x"), Snake.Integer("5")),
+        Snake.FunDef("name", [Snake.Variable("y")], [
+            Snake.Call("print", [Snake.BinaryOp("+", Snake.Variable("x"), Snake.Variable("y"))]),
+        ]),
+    ]
+
+    # The function's frame does not hold x, so reading it is an error instead of reading an uninitialized slot
+    try:
+        result = normalize(data)
+        print(f"result {[str(r) for r in result]} did not raise InvalidSyntax")
+    except Error.InvalidSyntax:
+        pass
+
+
+def test_count_temps_once():
+    # x = f(f(... f(1) ...)), each node's temporaries are counted once, not again at every call around it
+    depth = 200
+    expression = Snake.Integer("1")
+    for _ in range(depth):
+        expression = Snake.Call("f", [expression])
+
+    calls = []
+    count_temps = normalizer.count_temps
+    normalizer.count_temps = lambda *args: calls.append(args) or count_temps(*args)
+    try:
+        normalize([Snake.Assign(Snake.Variable("x"), expression)])
+    finally:
+        normalizer.count_temps = count_temps
+
+    if len(calls) > 2 * (depth + 1):
+        print(f"result {len(calls)} calls of count_temps was not linear in the depth {depth}")
+
+
 test_normalizer()
+test_outer_variable()
+test_count_temps_once()
@@ -0,0 +1,398 @@
+from translators.optimizer import inline_functions, fold_constants, propagate_constants, number_values, propagate_copies, eliminate_dead_code, evaluate_binary_op
+from languages.Snake import Snake
+from languages.Normal import Normal
+
+
+fold_tests = [
+    # BinaryOp [x = 1 + 2 * 3]
+    (
+        [Snake.Assign(Snake.Variable("x"), Snake.BinaryOp(
+            "+",
+            Snake.Integer("1"),
+            Snake.BinaryOp("*", Snake.Integer("2"), Snake.Integer("3")),
+        ))],
+        [Snake.Assign(Snake.Variable("x"), Snake.Integer("7"))],
+    ),
+
+    # Booleans and UnaryOp [print(-(True + 1))]
+    (
+        [Snake.Call("print", [Snake.UnaryOp("-", Snake.BinaryOp("+", Snake.Boolean("True"), Snake.Integer("1")))])],
+        [Snake.Call("print", [Snake.Integer("-2")])],
+    ),
+
+    # Variables and division by zero are left alone [x = y + (1 / 0)]
+    (
+        [Snake.Assign(Snake.Variable("x"), Snake.BinaryOp(
+            "+",
+            Snake.Variable("y"),
+            Snake.BinaryOp("/", Snake.Integer("1"), Snake.Integer("0")),
+        ))],
+        [Snake.Assign(Snake.Variable("x"), Snake.BinaryOp(
+            "+",
+            Snake.Variable("y"),
+            Snake.BinaryOp("/", Snake.Integer("1"), Snake.Integer("0")),
+        ))],
+    ),
+
+    # Function bodies [def f(): \n \t print(2 - 3)]
+    (
+        [Snake.FunDef("f", [], [Snake.Call("print", [Snake.BinaryOp("-", Snake.Integer("2"), Snake.Integer("3"))])])],
+        [Snake.FunDef("f", [], [Snake.Call("print", [Snake.Integer("-1")])])],
+    ),
+]
+
+
+propagate_tests = [
+    # Through a variable [x = 1 + 2 \n y = x * x]
+    (
+        [
+            Normal.Assign(Normal.TempMemory(0), Normal.Integer("1")),
+            Normal.Assign(Normal.TempMemory(1), Normal.Integer("2")),
+            Normal.Assign(Normal.VarMemory(0), Normal.BinaryOp("+", Normal.TempMemory(0), Normal.TempMemory(1))),
+            Normal.Assign(Normal.TempMemory(0), Normal.VarMemory(0)),
+            Normal.Assign(Normal.TempMemory(1), Normal.VarMemory(0)),
+            Normal.Assign(Normal.VarMemory(1), Normal.BinaryOp("*", Normal.TempMemory(0), Normal.TempMemory(1))),
+        ],
+        [
+            Normal.Assign(Normal.TempMemory(0), Normal.Integer("1")),
+            Normal.Assign(Normal.TempMemory(1), Normal.Integer("2")),
+            Normal.Assign(Normal.VarMemory(0), Normal.Integer("3")),
+            Normal.Assign(Normal.TempMemory(0), Normal.Integer("3")),
+            Normal.Assign(Normal.TempMemory(1), Normal.Integer("3")),
+            Normal.Assign(Normal.VarMemory(1), Normal.Integer("9")),
+        ],
+    ),
+
+    # A value from a call is unknown, the other value becomes an immediate [x = f() \n y = x - 1]
+    (
+        [
+            Normal.Assign(Normal.VarMemory(0), Normal.Call("f", [])),
+            Normal.Assign(Normal.TempMemory(0), Normal.VarMemory(0)),
+            Normal.Assign(Normal.TempMemory(1), Normal.Integer("1")),
+            Normal.Assign(Normal.VarMemory(1), Normal.BinaryOp("-", Normal.TempMemory(0), Normal.TempMemory(1))),
+        ],
+        [
+            Normal.Assign(Normal.VarMemory(0), Normal.Call("f", [])),
+            Normal.Assign(Normal.TempMemory(0), Normal.VarMemory(0)),
+            Normal.Assign(Normal.TempMemory(1), Normal.Integer("1")),
+            Normal.Assign(Normal.VarMemory(1), Normal.BinaryOp("-", Normal.TempMemory(0), Normal.Integer("1"))),
+        ],
+    ),
+
+    # Through a parameter, as in an inlined body [sq(3), with def sq(x): \n \t print(x * x)]
+    (
+        [
+            Normal.Assign(Normal.ParamMemory(0), Normal.Integer("3")),
+            Normal.Assign(Normal.VarMemory(0), Normal.ParamMemory(0)),
+            Normal.Assign(Normal.TempMemory(0), Normal.VarMemory(0)),
+            Normal.Assign(Normal.TempMemory(1), Normal.VarMemory(0)),
+            Normal.Assign(Normal.ParamMemory(0), Normal.BinaryOp("*", Normal.TempMemory(0), Normal.TempMemory(1))),
+        ],
+        [
+            Normal.Assign(Normal.ParamMemory(0), Normal.Integer("3")),
+            Normal.Assign(Normal.VarMemory(0), Normal.Integer("3")),
+            Normal.Assign(Normal.TempMemory(0), Normal.Integer("3")),
+            Normal.Assign(Normal.TempMemory(1), Normal.Integer("3")),
+            Normal.Assign(Normal.ParamMemory(0), Normal.Integer("9")),
+        ],
+    ),
+
+    # Parameters are forgotten at a call, and at a multiplication that clobbers %rdx
+    (
+        [
+            Normal.Assign(Normal.ParamMemory(0), Normal.Integer("2")),
+            Normal.Call("f", [Normal.ParamMemory(0)]),
+            Normal.Assign(Normal.VarMemory(0), Normal.ParamMemory(0)),
+            Normal.Assign(Normal.ParamMemory(2), Normal.Integer("5")),
+            Normal.Assign(Normal.TempMemory(0), Normal.BinaryOp("*", Normal.VarMemory(0), Normal.VarMemory(0))),
+            Normal.Assign(Normal.VarMemory(1), Normal.ParamMemory(2)),
+        ],
+        [
+            Normal.Assign(Normal.ParamMemory(0), Normal.Integer("2")),
+            Normal.Call("f", [Normal.ParamMemory(0)]),
+            Normal.Assign(Normal.VarMemory(0), Normal.ParamMemory(0)),
+            Normal.Assign(Normal.ParamMemory(2), Normal.Integer("5")),
+            Normal.Assign(Normal.TempMemory(0), Normal.BinaryOp("*", Normal.VarMemory(0), Normal.VarMemory(0))),
+            Normal.Assign(Normal.VarMemory(1), Normal.ParamMemory(2)),
+        ],
+    ),
+]
+
+
+copy_tests = [
+    # Parameter passed on [def f(x): \n \t g(x)]
+    (
+        [
+            Normal.Assign(Normal.VarMemory(0), Normal.ParamMemory(0)),
+            Normal.Assign(Normal.ParamMemory(0), Normal.VarMemory(0)),
+            Normal.Call("g", [Normal.ParamMemory(0)]),
+        ],
+        [
+            Normal.Call("g", [Normal.ParamMemory(0)]),
+        ],
+        2,
+    ),
+
+    # Variable reads and a temporary coalesced into a parameter [y = x \n print(x * y)]
+    (
+        [
+            Normal.Assign(Normal.VarMemory(1), Normal.VarMemory(0)),
+            Normal.Assign(Normal.TempMemory(0), Normal.VarMemory(0)),
+            Normal.Assign(Normal.TempMemory(1), Normal.VarMemory(1)),
+            Normal.Assign(Normal.TempMemory(0), Normal.BinaryOp("*", Normal.TempMemory(0), Normal.TempMemory(1))),
+            Normal.Assign(Normal.ParamMemory(0), Normal.TempMemory(0)),
+            Normal.Call("print", [Normal.ParamMemory(0)]),
+        ],
+        [
+            Normal.Assign(Normal.ParamMemory(0), Normal.BinaryOp("*", Normal.VarMemory(0), Normal.VarMemory(0))),
+            Normal.Call("print", [Normal.ParamMemory(0)]),
+        ],
+        4,
+    ),
+
+    # A parameter is not read after a call clobbers it [def f(x): \n \t g() \n g(x)]
+    (
+        [
+            Normal.Assign(Normal.VarMemory(0), Normal.ParamMemory(0)),
+            Normal.Call("g", []),
+            Normal.Assign(Normal.ParamMemory(0), Normal.VarMemory(0)),
+            Normal.Call("g", [Normal.ParamMemory(0)]),
+        ],
+        [
+            Normal.Assign(Normal.VarMemory(0), Normal.ParamMemory(0)),
+            Normal.Call("g", []),
+            Normal.Assign(Normal.ParamMemory(0), Normal.VarMemory(0)),
+            Normal.Call("g", [Normal.ParamMemory(0)]),
+        ],
+        0,
+    ),
+]
+
+
+dead_code_tests = [
+    # Overwritten and unread variables, the call is kept [x = 1 \n x = f() \n y = x]
+    (
+        [
+            Normal.Assign(Normal.VarMemory(0), Normal.Integer("1")),
+            Normal.Assign(Normal.VarMemory(0), Normal.Call("f", [])),
+            Normal.Assign(Normal.VarMemory(1), Normal.VarMemory(0)),
+        ],
+        [
+            Normal.Call("f", []),
+        ],
+        2,
+    ),
+
+    # Chains of dead temporaries, but not a division that may trap [x = 2 \n (x + 1) * (x / y)]
+    (
+        [
+            Normal.Assign(Normal.VarMemory(0), Normal.Integer("2")),
+            Normal.Assign(Normal.TempMemory(0), Normal.BinaryOp("+", Normal.VarMemory(0), Normal.Integer("1"))),
+            Normal.Assign(Normal.TempMemory(1), Normal.BinaryOp("/", Normal.VarMemory(0), Normal.VarMemory(1))),
+            Normal.Assign(Normal.TempMemory(0), Normal.BinaryOp("*", Normal.TempMemory(0), Normal.TempMemory(1))),
+        ],
+        [
+            Normal.Assign(Normal.VarMemory(0), Normal.Integer("2")),
+            Normal.Assign(Normal.TempMemory(1), Normal.BinaryOp("/", Normal.VarMemory(0), Normal.VarMemory(1))),
+        ],
+        2,
+    ),
+
+    # Parameters for a call are read by it [def f(x): \n \t print(x)]
+    (
+        [
+            Normal.FunDef("f", [Normal.ParamMemory(0)], [
+                Normal.Assign(Normal.VarMemory(0), Normal.ParamMemory(0)),
+                Normal.Assign(Normal.ParamMemory(0), Normal.VarMemory(0)),
+                Normal.Call("print", [Normal.ParamMemory(0)]),
+            ]),
+        ],
+        [
+            Normal.FunDef("f", [Normal.ParamMemory(0)], [
+                Normal.Assign(Normal.VarMemory(0), Normal.ParamMemory(0)),
+                Normal.Assign(Normal.ParamMemory(0), Normal.VarMemory(0)),
+                Normal.Call("print", [Normal.ParamMemory(0)]),
+            ]),
+        ],
+        0,
+    ),
+]
+
+
+value_tests = [
+    # Repeated BinaryOp, with its values swapped [x * y + y * x]
+    (
+        [
+            Normal.Assign(Normal.TempMemory(0), Normal.BinaryOp("*", Normal.VarMemory(0), Normal.VarMemory(1))),
+            Normal.Assign(Normal.TempMemory(1), Normal.BinaryOp("*", Normal.VarMemory(1), Normal.VarMemory(0))),
+            Normal.Assign(Normal.TempMemory(0), Normal.BinaryOp("+", Normal.TempMemory(0), Normal.TempMemory(1))),
+        ],
+        [
+            Normal.Assign(Normal.TempMemory(0), Normal.BinaryOp("*", Normal.VarMemory(0), Normal.VarMemory(1))),
+            Normal.Assign(Normal.TempMemory(1), Normal.TempMemory(0)),
+            Normal.Assign(Normal.TempMemory(0), Normal.BinaryOp("+", Normal.TempMemory(0), Normal.TempMemory(1))),
+        ],
+        1,
+    ),
+
+    # Values read through copies are the same, but not after they are written [T0 = x \n -T0 \n -x \n x = 1 \n -x]
+    (
+        [
+            Normal.Assign(Normal.TempMemory(0), Normal.VarMemory(0)),
+            Normal.Assign(Normal.TempMemory(1), Normal.UnaryOp("-", Normal.TempMemory(0))),
+            Normal.Assign(Normal.TempMemory(2), Normal.UnaryOp("-", Normal.VarMemory(0))),
+            Normal.Assign(Normal.VarMemory(0), Normal.Integer("1")),
+            Normal.Assign(Normal.TempMemory(3), Normal.UnaryOp("-", Normal.VarMemory(0))),
+        ],
+        [
+            Normal.Assign(Normal.TempMemory(0), Normal.VarMemory(0)),
+            Normal.Assign(Normal.TempMemory(1), Normal.UnaryOp("-", Normal.TempMemory(0))),
+            Normal.Assign(Normal.TempMemory(2), Normal.TempMemory(1)),
+            Normal.Assign(Normal.VarMemory(0), Normal.Integer("1")),
+            Normal.Assign(Normal.TempMemory(3), Normal.UnaryOp("-", Normal.VarMemory(0))),
+        ],
+        1,
+    ),
+
+    # Parameters are clobbered by calls [def f(x): \n \t print(-x) \n \t print(-x)]
+    (
+        [
+            Normal.Assign(Normal.ParamMemory(0), Normal.UnaryOp("-", Normal.ParamMemory(0))),
+            Normal.Call("print", [Normal.ParamMemory(0)]),
+            Normal.Assign(Normal.TempMemory(0), Normal.UnaryOp("-", Normal.ParamMemory(0))),
+        ],
+        [
+            Normal.Assign(Normal.ParamMemory(0), Normal.UnaryOp("-", Normal.ParamMemory(0))),
+            Normal.Call("print", [Normal.ParamMemory(0)]),
+            Normal.Assign(Normal.TempMemory(0), Normal.UnaryOp("-", Normal.ParamMemory(0))),
+        ],
+        0,
+    ),
+]
+
+
+inline_tests = [
+    # Small function, its variables renamed above the caller's [x = 1 \n def f(y): \n \t z = y \n f(x) \n f(2)]
+    (
+        [
+            Normal.Assign(Normal.VarMemory(0), Normal.Integer("1")),
+            Normal.FunDef("f", [Normal.ParamMemory(0)], [
+                Normal.Assign(Normal.VarMemory(1), Normal.ParamMemory(0)),
+                Normal.Assign(Normal.VarMemory(2), Normal.VarMemory(1)),
+            ]),
+            Normal.Assign(Normal.ParamMemory(0), Normal.VarMemory(0)),
+            Normal.Call("f", [Normal.ParamMemory(0)]),
+            Normal.Assign(Normal.ParamMemory(0), Normal.Integer("2")),
+            Normal.Call("f", [Normal.ParamMemory(0)]),
+        ],
+        [
+            Normal.Assign(Normal.VarMemory(0), Normal.Integer("1")),
+            Normal.Assign(Normal.VarMemory(4), Normal.VarMemory(0)),
+            Normal.Assign(Normal.VarMemory(2), Normal.VarMemory(4)),
+            Normal.Assign(Normal.VarMemory(3), Normal.VarMemory(2)),
+            Normal.Assign(Normal.VarMemory(8), Normal.Integer("2")),
+            Normal.Assign(Normal.VarMemory(6), Normal.VarMemory(8)),
+            Normal.Assign(Normal.VarMemory(7), Normal.VarMemory(6)),
+        ],
+        {"f": 2},
+    ),
+
+    # Recursive functions and calls used as expressions are kept [def f(): \n \t f() \n x = f()]
+    (
+        [
+            Normal.FunDef("f", [], [Normal.Call("f", [])]),
+            Normal.Assign(Normal.VarMemory(0), Normal.Call("f", [])),
+        ],
+        [
+            Normal.FunDef("f", [], [Normal.Call("f", [])]),
+            Normal.Assign(Normal.VarMemory(0), Normal.Call("f", [])),
+        ],
+        {},
+    ),
+]
+
+
+def test_fold_constants():
+    for data, expected in fold_tests:
+        result = fold_constants(data)
+
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+
+
+def test_inline_functions():
+    for data, expected, expected_stats in inline_tests:
+        stats = {}
+        result = inline_functions(data, stats)
+
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+        if stats != expected_stats:
+            print(f"stats {stats} did not equal expected {expected_stats}")
+
+
+def test_propagate_constants():
+    for data, expected in propagate_tests:
+        result = propagate_constants(data)
+
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+
+
+def test_number_values():
+    for data, expected, expected_replaced in value_tests:
+        stats = {}
+        result = number_values(data, stats)
+
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+        if stats != {"main": expected_replaced}:
+            print(f"stats {stats} did not equal expected {expected_replaced} replaced")
+
+
+def test_propagate_copies():
+    for data, expected, expected_eliminated in copy_tests:
+        stats = {}
+        result = propagate_copies(data, stats)
+
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+        if stats != {"main": expected_eliminated}:
+            print(f"stats {stats} did not equal expected {expected_eliminated} eliminated")
+
+
+def test_eliminate_dead_code():
+    for data, expected, expected_eliminated in dead_code_tests:
+        stats = {}
+        result = eliminate_dead_code(data, stats)
+
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+        if sum(stats.values()) != expected_eliminated:
+            print(f"stats {stats} did not equal expected {expected_eliminated} eliminated")
+
+
+def test_evaluate_binary_op():
+    # Division truncates toward zero and 64-bit arithmetic wraps around
+    tests = [
+        (("/", -7, 2), -3),
+        (("%", -7, 2), -1),
+        (("%", 7, -2), 1),
+        (("+", 2 ** 63 - 1, 1), -2 ** 63),
+        (("/", -2 ** 63, -1), None),
+    ]
+
+    for (op, value1, value2), expected in tests:
+        result = evaluate_binary_op(op, value1, value2)
+
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+
+
+test_inline_functions()
+test_fold_constants()
+test_propagate_constants()
+test_number_values()
+test_propagate_copies()
+test_eliminate_dead_code()
+test_evaluate_binary_op()
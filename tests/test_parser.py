@@ -0,0 +1,88 @@
+from translators.parser import parse
+from languages.Token import Token
+from languages.Snake import Snake
+from utils.Error import Error
+
+
+token_inputs = [
+    # x = 1 + 2 * 3
+    [Token.Variable("x"), Token.Equals(), Token.Integer("1"), Token.Operator("+"), Token.Integer("2"), Token.Operator("*"), Token.Integer("3")],
+
+    # x = (1 - 2) - -3
+    [
+        Token.Variable("x"), Token.Equals(), Token.OpenParens(), Token.Integer("1"), Token.Operator("-"), Token.Integer("2"),
+        Token.CloseParens(), Token.Operator("-"), Token.Operator("-"), Token.Integer("3"),
+    ],
+
+    # print("hello", True, x)
+    [
+        Token.Variable("print"), Token.OpenParens(), Token.String("hello"), Token.Comma(), Token.Boolean("True"),
+        Token.Comma(), Token.Variable("x"), Token.CloseParens(),
+    ],
+
+    # def name(x, y): \n \t z = x % y \n name(1, 2)
+    [
+        Token.Def(), Token.Variable("name"), Token.OpenParens(), Token.Variable("x"), Token.Comma(), Token.Variable("y"),
+        Token.CloseParens(), Token.Colon(), Token.Newline(), Token.Indent(),
+        Token.Variable("z"), Token.Equals(), Token.Variable("x"), Token.Operator("%"), Token.Variable("y"), Token.Newline(),
+        Token.Dedent(), Token.Variable("name"), Token.OpenParens(), Token.Integer("1"), Token.Comma(), Token.Integer("2"),
+        Token.CloseParens(),
+    ],
+
+    # \n x \n
+    [Token.Newline(), Token.Variable("x"), Token.Newline()],
+]
+
+expected_outputs = [
+    [Snake.Assign(Snake.Variable("x"), Snake.BinaryOp(
+        "+", Snake.Integer("1"), Snake.BinaryOp("*", Snake.Integer("2"), Snake.Integer("3"))))],
+
+    [Snake.Assign(Snake.Variable("x"), Snake.BinaryOp(
+        "-", Snake.BinaryOp("-", Snake.Integer("1"), Snake.Integer("2")), Snake.UnaryOp("-", Snake.Integer("3"))))],
+
+    [Snake.Call("print", [Snake.String("hello"), Snake.Boolean("True"), Snake.Variable("x")])],
+
+    [
+        Snake.FunDef("name", [Snake.Variable("x"), Snake.Variable("y")], [
+            Snake.Assign(Snake.Variable("z"), Snake.BinaryOp("%", Snake.Variable("x"), Snake.Variable("y"))),
+        ]),
+        Snake.Call("name", [Snake.Integer("1"), Snake.Integer("2")]),
+    ],
+
+    [Snake.Variable("x")],
+]
+
+invalid_inputs = [
+    # x = (1
+    [Token.Variable("x"), Token.Equals(), Token.OpenParens(), Token.Integer("1")],
+
+    # x y
+    [Token.Variable("x"), Token.Variable("y")],
+
+    # def name(1):
+    [Token.Def(), Token.Variable("name"), Token.OpenParens(), Token.Integer("1"), Token.CloseParens(), Token.Colon()],
+
+    # \t x
+    [Token.Indent(), Token.Variable("x")],
+]
+
+
+def test_parser():
+    for tokens, expected in zip(token_inputs, expected_outputs):
+        result = parse(tokens)
+
+        if result != expected:
+            print(f"result {[str(r) for r in result]} did not equal expected {[str(e) for e in expected]}")
+
+
+def test_parser_errors():
+    for tokens in invalid_inputs:
+        try:
+            result = parse(tokens)
+            print(f"result {[str(r) for r in result]} did not raise InvalidSyntax")
+        except Error.InvalidSyntax:
+            pass
+
+
+test_parser()
+test_parser_errors()
@@ -0,0 +1,111 @@
+from translators.peephole import optimize_instructions
+from languages.Assembly import Assembly
+
+
+rax = Assembly.Register("rax")
+rbx = Assembly.Register("rbx")
+rdx = Assembly.Register("rdx")
+rdi = Assembly.Register("rdi")
+r11 = Assembly.Register("r11")
+slot1 = Assembly.ScaledIndexed("rbp", None, 8, -8)
+
+
+tests = [
+    # Redundant moves
+    (
+        [Assembly.Mov(rbx, rbx), Assembly.Mov(rdi, rbx), Assembly.Mov(rbx, rdi), Assembly.Add(rdi, Assembly.Integer("0"))],
+        [Assembly.Mov(rdi, rbx)],
+        {"move to self": 1, "move back": 1, "add zero": 1},
+    ),
+
+    # Push and pop
+    (
+        [Assembly.Push(rdx), Assembly.Pop(rdx), Assembly.Push(rbx), Assembly.Pop(rdi)],
+        [Assembly.Mov(rdi, rbx)],
+        {"push pop": 2},
+    ),
+
+    # Overwritten move, unless the second move reads it
+    (
+        [Assembly.Mov(rax, rbx), Assembly.Mov(rax, slot1), Assembly.Mov(rdi, rbx), Assembly.Mov(rdi, Assembly.ScaledIndexed("rdi", None))],
+        [Assembly.Mov(rax, slot1), Assembly.Mov(rdi, rbx), Assembly.Mov(rdi, Assembly.ScaledIndexed("rdi", None))],
+        {"overwritten move": 1},
+    ),
+
+    # Multiply by 40 [x * 40]
+    (
+        [Assembly.Mov(r11, Assembly.Integer("40")), Assembly.Mov(rax, rbx), Assembly.Mul(r11), Assembly.Mov(rdi, rax)],
+        [
+            Assembly.Mov(rax, rbx),
+            Assembly.Lea(rax, Assembly.ScaledIndexed("rax", "rax", 4, 0)),
+            Assembly.Shl(rax, Assembly.Integer("3")),
+            Assembly.Mov(rdi, rax),
+        ],
+        {"multiply by constant": 1},
+    ),
+
+    # Multiply by 7 is left to mul
+    (
+        [Assembly.Mov(r11, Assembly.Integer("7")), Assembly.Mov(rax, rbx), Assembly.Mul(r11), Assembly.Mov(rdi, rax)],
+        [Assembly.Mov(r11, Assembly.Integer("7")), Assembly.Mov(rax, rbx), Assembly.Mul(r11), Assembly.Mov(rdi, rax)],
+        {},
+    ),
+
+    # Divide by 8 [x / 8]
+    (
+        [Assembly.Mov(r11, Assembly.Integer("8")), Assembly.Mov(rax, rbx), Assembly.Cqo(), Assembly.IDiv(r11), Assembly.Mov(rdi, rax)],
+        [
+            Assembly.Mov(rax, rbx),
+            Assembly.Cqo(),
+            Assembly.Shr(rdx, Assembly.Integer("61")),
+            Assembly.Add(rax, rdx),
+            Assembly.Sar(rax, Assembly.Integer("3")),
+            Assembly.Mov(rdi, rax),
+        ],
+        {"divide by power of two": 1},
+    ),
+
+    # Remainder of 2 [x % 2]
+    (
+        [Assembly.Mov(r11, Assembly.Integer("2")), Assembly.Mov(rax, rbx), Assembly.Cqo(), Assembly.IDiv(r11), Assembly.Mov(rdi, rdx)],
+        [
+            Assembly.Mov(rax, rbx),
+            Assembly.Cqo(),
+            Assembly.Shr(rdx, Assembly.Integer("63")),
+            Assembly.Add(rdx, rax),
+            Assembly.And(rdx, Assembly.Integer("-2")),
+            Assembly.Neg(rdx),
+            Assembly.Add(rdx, rax),
+            Assembly.Mov(rdi, rdx),
+        ],
+        {"divide by power of two": 1},
+    ),
+]
+
+
+def test_peephole():
+    for data, expected, expected_stats in tests:
+        stats = {}
+        result = optimize_instructions(data, stats)
+
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+        if stats != expected_stats:
+            print(f"stats {stats} did not equal expected {expected_stats}")
+
+
+def test_remainder_semantics():
+    # The remainder sequence, evaluated on 64-bit values, matches division truncating toward zero
+    for value in [-9, -8, -7, -1, 0, 1, 7, 8, 9, -2 ** 63, 2 ** 63 - 1]:
+        for exponent in [1, 3, 31]:
+            bias = (2 ** exponent - 1) if value < 0 else 0
+            quotient = (value + bias) >> exponent
+            remainder = value - ((value + bias) & -2 ** exponent)
+
+            expected_quotient = abs(value) // 2 ** exponent * (-1 if value < 0 else 1)
+            if (quotient, remainder) != (expected_quotient, value - expected_quotient * 2 ** exponent):
+                print(f"{value} / 2 ** {exponent} gave {quotient} remainder {remainder}")
+
+
+test_peephole()
+test_remainder_semantics()
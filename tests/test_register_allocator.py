@@ -0,0 +1,64 @@
+from translators.register_allocator import rename_values, live_intervals, allocate_registers
+from languages.Normal import Normal
+from languages.Assembly import Assembly
+
+
+def test_rename_values():
+    # T0 = 1 \n x = T0 \n T0 = x \n print(T0)
+    result = rename_values([
+        Normal.Assign(Normal.TempMemory(0), Normal.Integer("1")),
+        Normal.Assign(Normal.VarMemory(0), Normal.TempMemory(0)),
+        Normal.Assign(Normal.TempMemory(0), Normal.VarMemory(0)),
+        Normal.Assign(Normal.ParamMemory(0), Normal.TempMemory(0)),
+        Normal.Call("print", [Normal.ParamMemory(0)]),
+    ])
+
+    expected = [
+        Normal.Assign(Normal.TempMemory(0), Normal.Integer("1")),
+        Normal.Assign(Normal.TempMemory(2), Normal.TempMemory(0)),
+        Normal.Assign(Normal.TempMemory(4), Normal.TempMemory(2)),
+        Normal.Assign(Normal.ParamMemory(0), Normal.TempMemory(4)),
+        Normal.Call("print", [Normal.ParamMemory(0)]),
+    ]
+
+    if result != expected:
+        print(f"result {result} did not equal expected {expected}")
+
+
+def test_live_intervals():
+    intervals, calls = live_intervals([
+        Normal.Assign(Normal.TempMemory(0), Normal.Integer("1")),
+        Normal.Call("print", []),
+        Normal.Assign(Normal.TempMemory(1), Normal.TempMemory(0)),
+    ])
+
+    expected = ({Normal.TempMemory(0): [0, 2], Normal.TempMemory(1): [2, 2]}, [1])
+
+    if (intervals, calls) != expected:
+        print(f"result {(intervals, calls)} did not equal expected {expected}")
+
+
+def test_allocate_registers():
+    # x = 1 \n y = 2 \n print(y) \n print(x)
+    normal_list, locations = allocate_registers([
+        Normal.Assign(Normal.VarMemory(0), Normal.Integer("1")),
+        Normal.Assign(Normal.VarMemory(1), Normal.Integer("2")),
+        Normal.Assign(Normal.ParamMemory(0), Normal.VarMemory(1)),
+        Normal.Call("print", [Normal.ParamMemory(0)]),
+        Normal.Assign(Normal.ParamMemory(0), Normal.VarMemory(0)),
+        Normal.Call("print", [Normal.ParamMemory(0)]),
+    ])
+
+    # x is live across the first call so it gets a callee-saved register, y does not
+    expected = {
+        normal_list[0].destination: Assembly.Register("rbx"),
+        normal_list[1].destination: Assembly.Register("r10"),
+    }
+
+    if locations != expected:
+        print(f"result {locations} did not equal expected {expected}")
+
+
+test_rename_values()
+test_live_intervals()
+test_allocate_registers()
@@ -0,0 +1,152 @@
+import io
+import os
+import tempfile
+import threading
+from contextlib import redirect_stderr
+from translators.cache import CompileCache
+from translators.compiler import compile
+from translators.server import CompileServer, request, wait_for_server
+
+
+source = "def name(x):\n\tprint(x + 1)\n\nname(2)\n"
+
+
+def test_requests():
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = os.path.join(directory, "server.sock")
+        server = CompileServer(socket_path)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            wait_for_server(socket_path)
+            tests = [
+                ({"source": source, "name": "a"}, {"ok": True, "assembly": compile(source)}),
+                ({"source": source, "name": "a"}, {"ok": True, "assembly": compile(source)}),
+                ({"source": source, "optimize": True}, {"ok": True, "assembly": compile(source, optimize=True)}),
+                ({"source": "x = (\n"}, {"ok": False}),
+                ({"source": "x = " + " + ".join(["1"] * 5000) + "\n"}, {"ok": False}),
+                ({"unknown": 0}, {"ok": False}),
+            ]
+
+            for data, expected in tests:
+                result = request(socket_path, data, timeout=5)
+                result.pop("ms", None)
+                result.pop("error", None)
+
+                if result != expected:
+                    print(f"result {result} did not equal expected {expected}")
+
+            # The second request for "a" reused its function
+            stats = request(socket_path, {"command": "stats"}, timeout=5)["stats"]
+            if (stats["functions_reused"], stats["functions_recompiled"], stats["errors"]) != (1, 1, 2):
+                print(f"result {stats} did not reuse the unchanged function")
+        finally:
+            request(socket_path, {"command": "shutdown"}, timeout=5)
+            thread.join(5)
+
+        if thread.is_alive() or os.path.exists(socket_path):
+            print("result server did not shut down")
+
+
+def test_poll():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "a.py")
+        bad_path = os.path.join(directory, "bad.py")
+        with open(path, "w") as file:
+            file.write(source)
+        with open(bad_path, "w") as file:
+            file.write("x = (\n")
+
+        server = CompileServer(os.path.join(directory, "server.sock"), root=directory)
+        with redirect_stderr(io.StringIO()):
+            first = server.poll()
+        second = server.poll()
+
+        # Only a changed source is compiled again, and its assembly is written beside it
+        with open(path, "a") as file:
+            file.write("print(3)\n")
+        os.utime(path, ns=(0, 10 ** 9))
+        third = server.poll()
+
+        result = (first, second, third)
+        expected = ([path], [], [path])
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+
+        with open(os.path.join(directory, "a.s")) as file:
+            if file.read() != compile(source + "print(3)\n"):
+                print("result a.s did not contain the assembly of the changed source")
+
+
+def test_poll_errors():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "a.py")
+        with open(path, "w") as file:
+            file.write(source)
+        with open(os.path.join(directory, "latin1.py"), "wb") as file:
+            file.write(b"\xff\xfe x = 1\n")
+        with open(os.path.join(directory, "deep.py"), "w") as file:
+            file.write("x = " + " + ".join(["1"] * 5000) + "\n")
+
+        # Files that cannot be decoded or are nested too deeply are reported, and the watcher carries on
+        server = CompileServer(os.path.join(directory, "server.sock"), root=directory)
+        errors = io.StringIO()
+        with redirect_stderr(errors):
+            first = server.poll()
+
+            with open(path, "a") as file:
+                file.write("print(3)\n")
+            os.utime(path, ns=(0, 10 ** 9))
+            second = server.poll()
+
+        result = (first, second, "UnicodeDecodeError" in errors.getvalue(), "RecursionError" in errors.getvalue())
+        expected = ([path], [path], True, True)
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+
+
+def test_cache_eviction():
+    with tempfile.TemporaryDirectory() as directory:
+        size = len(compile(source + "print(0)\n", optimize=True).encode())
+        cache = CompileCache(os.path.join(directory, "cache"), max_bytes=size * 3 // 2)
+        server = CompileServer(os.path.join(directory, "server.sock"), cache=cache)
+
+        # Each optimized compilation writes an entry, and the older ones are evicted to keep to the size limit
+        for i in range(3):
+            server.compile_source(source + f"print({i})\n", "a", optimize=True, allocate=False)
+
+        names = [name for _, _, names in os.walk(cache.directory) for name in names]
+        if len(names) != 1 or cache.stats.evictions != 2:
+            print(f"result {names} did not keep the cache within its size limit")
+
+
+def test_bounded_compilers():
+    server = CompileServer("unused.sock", max_compilers=2)
+    for name in ["a", "b", "a", "c"]:
+        server.compile_source(source, name, optimize=False, allocate=False)
+
+    # The least recently used source's compiler is dropped
+    result = list(server.compilers)
+    expected = [("a", False), ("c", False)]
+    if result != expected:
+        print(f"result {result} did not equal expected {expected}")
+
+
+def test_concurrent_stats():
+    server = CompileServer("unused.sock")
+    threads = [threading.Thread(target=lambda: [server.handle({"unknown": 0}) for _ in range(500)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if server.stats.requests != 4000:
+        print(f"result {server.stats.requests} did not equal expected 4000")
+
+
+test_requests()
+test_poll()
+test_poll_errors()
+test_cache_eviction()
+test_bounded_compilers()
+test_concurrent_stats()
@@ -1,6 +1,7 @@
 
 
-from translators.tokenizer import tokenize
+from io import StringIO
+from translators.tokenizer import tokenize, scan, tokenize_iter
 
 
 text_inputs = [
@@ -40,4 +41,30 @@ def test_tokenizer():
             print(f"result {result} did not equal expected {expected}")
 
 
+def test_scan():
+    for text, expected in zip(text_inputs, expected_outputs):
+        result = scan(text)
+
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+
+    # The scanner must agree with tokenize on whole programs too
+    text = "def name(x, y):\n\tz = x + 'hi there' # comment\n    w = -1\n\nname(1, \"2\")"
+    if scan(text) != tokenize(text):
+        print(f"scan {scan(text)} did not equal tokenize {tokenize(text)}")
+
+
+def test_tokenize_iter():
+    for text, expected in zip(text_inputs, expected_outputs):
+        result = list(tokenize_iter(text))
+        file_result = list(tokenize_iter(StringIO(text)))
+
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+        if file_result != expected:
+            print(f"file result {file_result} did not equal expected {expected}")
+
+
 test_tokenizer()
+test_scan()
+test_tokenize_iter()
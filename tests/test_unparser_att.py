@@ -0,0 +1,87 @@
+from io import StringIO
+from translators.unparser_att import unparse, unparse_to, unparse_instruction, escape_string
+from languages.Assembly import Assembly
+
+
+rax = Assembly.Register("rax")
+rbp = Assembly.Register("rbp")
+rdi = Assembly.Register("rdi")
+
+
+tests = [
+    (Assembly.Mov(rax, Assembly.Integer("1")), "movq $1, %rax"),
+    (Assembly.Add(Assembly.ScaledIndexed("rbp", None, 8, -16), rax), "addq %rax, -16(%rbp)"),
+    (Assembly.Lea(rax, Assembly.ScaledIndexed("rax", "rax", 4, 0)), "leaq (%rax,%rax,4), %rax"),
+    (Assembly.Sar(rax, Assembly.Integer("3")), "sarq $3, %rax"),
+    (Assembly.Lea(rdi, Assembly.String("0")), "leaq _str_0(%rip), %rdi"),
+    (Assembly.Mov(rdi, Assembly.RegisterValue("rax")), "movq (%rax), %rdi"),
+    (Assembly.IDiv(Assembly.Register("r11")), "idivq %r11"),
+    (Assembly.Cqo(), "cqto"),
+    (Assembly.Neg(rax), "negq %rax"),
+    (Assembly.Push(rbp), "pushq %rbp"),
+    (Assembly.Call("print"), "call print"),
+    (Assembly.Cmp(rax, rdi), "cmpq %rdi, %rax"),
+    (Assembly.Jmp("name"), "jmp name"),
+]
+
+
+def test_unparse_instruction():
+    for data, expected in tests:
+        result = unparse_instruction(data)
+
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+
+
+def test_unparse():
+    program = [
+        Assembly.Label("main", [Assembly.Lea(rdi, Assembly.String("0")), Assembly.Call("prints"), Assembly.Ret()]),
+        Assembly.Label("name", [Assembly.Ret()]),
+        Assembly.Label("_str_0", [Assembly.StringDeclare("hello")]),
+    ]
+
+    expected = (
+        "\t.globl main\n"
+        "\t.text\n"
+        "main:\n"
+        "\tleaq _str_0(%rip), %rdi\n"
+        "\tcall prints\n"
+        "\tret\n"
+        "name:\n"
+        "\tret\n"
+        "\t.section .rodata\n"
+        "_str_0:\n"
+        "\t.string \"hello\"\n"
+        "\t.section .note.GNU-stack,\"\",@progbits\n"
+    )
+
+    result = unparse(program)
+    if result != expected:
+        print(f"result {result!r} did not equal expected {expected!r}")
+
+    # Writing to a stream gives the same text
+    stream = StringIO()
+    unparse_to(program, stream)
+    if stream.getvalue() != expected:
+        print(f"streamed result {stream.getvalue()!r} did not equal expected {expected!r}")
+
+
+def test_escape_string():
+    tests = [
+        ("hello", "hello"),
+        ('say "hi"', 'say \\"hi\\"'),
+        ("a\\b", "a\\\\b"),
+        ("a\nb", "a\\012b"),
+        ("é", "\\303\\251"),
+    ]
+
+    for data, expected in tests:
+        result = escape_string(data)
+
+        if result != expected:
+            print(f"result {result} did not equal expected {expected}")
+
+
+test_unparse_instruction()
+test_unparse()
+test_escape_string()
@@ -0,0 +1,639 @@
+"""
+This file converts Normal form instructions into Assembly instructions.
+The generated code follows the System V x86-64 calling convention.
+"""
+
+
+from __future__ import annotations
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import List, Dict, Tuple
+from languages.Normal import Normal
+from languages.Assembly import Assembly, binary_operators, param_registers, return_register, callee_saved_registers
+from translators.register_allocator import allocate_registers
+from utils.Error import Error
+
+
+# TempMemory is kept in callee-saved registers, so that it survives calls
+temp_registers = ["rbx", "r12", "r13", "r14", "r15"]
+
+# Registers that never hold Normal form memory
+accumulator_register = "rax"  # Arithmetic, and the implicit operand of mul/div
+remainder_register = "rdx"  # Implicit operand of mul/div
+scratch_register = "r11"  # Memory-to-memory moves and large immediates
+
+# Note: Snake's "/" and "%" are signed and truncate toward zero (idivq), like C.
+
+
+class StringPool:
+    def __init__(self):
+        self.labels = {}  # type: Dict[str, str]
+        self.uses = []  # type: List[str]
+        self.taken = set()  # type: set[str]
+
+        # Note: labels maps each distinct string literal of the program to the name of its one data entry,
+        #       which is derived from a hash of its contents, so it is valid and the same in every compilation.
+
+        # Note: uses lists every use of a literal in order, so that the uses of a function can be replayed.
+
+        # Note: taken is the set of the labels' values, kept up to date so that a new literal is checked against it
+        #       without rebuilding it.
+
+    def label(self, string: str) -> str:
+        """
+        Finds the data label of a string literal, adding the literal to the pool on its first use.
+
+        Args:
+            :param string: Str contents of the literal.
+
+        Returns:
+            :return: Str suffix of the literal's "_str_" label.
+
+        Raises:
+            Nothing.
+        """
+        if string not in self.labels:
+            digest = blake2b(string.encode(), digest_size=16).hexdigest()
+
+            # Lengthen the label in the unlikely case that two literals share its first 16 hex digits
+            size = 16
+            while digest[:size] in self.taken:
+                size += 1
+            self.labels[string] = digest[:size]
+            self.taken.add(digest[:size])
+
+        self.uses.append(string)
+        return self.labels[string]
+
+    def declarations(self) -> List[Assembly.Label]:
+        """
+        Creates one data Label per distinct string literal, in order of first use.
+
+        Args:
+            Nothing.
+
+        Returns:
+            :return: List of Assembly Labels declaring the strings.
+
+        Raises:
+            Nothing.
+        """
+        return [Assembly.Label(f"_str_{label}", [Assembly.StringDeclare(string)]) for string, label in self.labels.items()]
+
+    def bytes_saved(self) -> int:
+        """
+        Counts the data section bytes saved by declaring each literal once, instead of once per use.
+        (Each declaration takes the UTF-8 bytes of the literal and a terminating zero byte).
+        """
+        return sum(len(string.encode()) + 1 for string in self.uses) - sum(len(string.encode()) + 1 for string in self.labels)
+
+
+@dataclass(frozen=True, slots=True)
+class AssembledFunction:
+    labels: Tuple[Assembly.Label, ...]  # The function's Label, after the Labels of the functions nested in it
+    strings: Tuple[str, ...]  # Every use of a string literal in the functions, in order
+
+
+class Frame:
+    def __init__(self, strings: None | StringPool = None, locations: None | Dict[Normal, Assembly] = None, allocate: bool = False,
+                 functions: None | Dict[Normal.FunDef, AssembledFunction] = None):
+        self.strings = StringPool() if strings is None else strings  # type: StringPool
+        self.locations = {} if locations is None else dict(locations)  # type: Dict[Normal, Assembly]
+        self.allocate = allocate  # type: bool
+        self.functions = functions  # type: None | Dict[Normal.FunDef, AssembledFunction]
+        self.num_slots = max([0, *(-loc.offset // 8 for loc in self.locations.values() if is_memory(loc))])  # type: int
+        self.pending_params = set()  # type: set[str]
+
+        # Note: pending_params are the parameter registers already set up for the next call,
+        #       which mul/div must preserve when they clobber %rdx.
+
+        # Note: allocate is whether the functions nested in this one get their registers by linear scan.
+
+        # Note: functions, if not None, is shared by every frame of a program, and remembers
+        #       the Labels of each function definition, so that an unchanged one is not assembled again.
+
+    def new_slot(self) -> Assembly.ScaledIndexed:
+        """
+        Reserves a new 8 byte stack slot below the frame's base pointer.
+
+        Args:
+            Nothing.
+
+        Returns:
+            :return: Assembly address of the new stack slot.
+
+        Raises:
+            Nothing.
+        """
+        self.num_slots += 1
+        return Assembly.ScaledIndexed("rbp", None, 8, -8 * self.num_slots)
+
+    def location(self, memory: Normal) -> Assembly:
+        """
+        Finds the register, stack slot or immediate holding a Normal form memory or literal.
+
+        Args:
+            :param memory: Normal form memory or literal.
+
+        Returns:
+            :return: Assembly operand for the memory.
+
+        Raises:
+            InvalidSyntax for a function call with more parameters than parameter registers.
+            UnknownInstruction for a Normal form instruction that is not a memory or literal.
+        """
+        match memory:
+            # Literals
+            case Normal.Integer(integer):
+                return Assembly.Integer(integer)
+            case Normal.Boolean(boolean):
+                return Assembly.Integer({"False": "0", "True": "1"}[boolean])
+            case Normal.String(string):
+                return Assembly.String(self.strings.label(string))
+
+        if memory in self.locations:
+            return self.locations[memory]
+
+        match memory:
+            case Normal.VarMemory(_):
+                new_location = self.new_slot()
+            case Normal.TempMemory(number) if number < len(temp_registers):
+                new_location = Assembly.Register(temp_registers[number])
+            case Normal.TempMemory(_):
+                new_location = self.new_slot()
+            case Normal.ParamMemory(number) if number < len(param_registers):
+                new_location = Assembly.Register(param_registers[number])
+            case Normal.ParamMemory(_):
+                raise Error.InvalidSyntax(memory, "Frame.location", f"At most {len(param_registers)} parameters are supported.")
+            case Normal.ReturnMemory(0):
+                new_location = Assembly.Register(return_register)
+            case _:
+                raise Error.UnknownInstruction(memory, "Frame.location", "Normal memory")
+
+        self.locations[memory] = new_location
+        return new_location
+
+    def saved_registers(self) -> List[str]:
+        """
+        Finds the callee-saved registers that the function writes to.
+
+        Args:
+            Nothing.
+
+        Returns:
+            :return: List of str register names to save in the prologue and restore in the epilogue.
+
+        Raises:
+            Nothing.
+        """
+        used = {loc.register for loc in self.locations.values() if isinstance(loc, Assembly.Register)}
+        return [register for register in callee_saved_registers if register in used]
+
+
+def is_memory(location: Assembly) -> bool:
+    return isinstance(location, Assembly.ScaledIndexed)
+
+
+def is_immediate(location: Assembly) -> bool:
+    return isinstance(location, (Assembly.Integer, Assembly.String))
+
+
+def fits_immediate(location: Assembly) -> bool:
+    """
+    Checks whether an operand can be used directly as a source (immediates are sign-extended from 32 bits).
+    (A string's address is not an immediate, since it is only known relative to %rip in a position-independent executable).
+    """
+    if isinstance(location, Assembly.String):
+        return False
+    return not isinstance(location, Assembly.Integer) or -2 ** 31 <= int(location.integer) < 2 ** 31
+
+
+def register(name: str) -> Assembly.Register:
+    return Assembly.Register(name)
+
+
+def assemble_move(destination: Assembly, source: Assembly, assembly_list: List[Assembly]) -> None:
+    """
+    Moves a value between two operands, through the scratch register when x86-64 cannot do it directly.
+
+    Args:
+        :param destination: Assembly register or stack slot.
+        :param source: Assembly register, stack slot or immediate.
+        :param assembly_list: List of Assembly instructions to append to.
+
+    Returns:
+        Nothing.
+
+    Raises:
+        Nothing.
+    """
+    if destination == source:
+        return
+
+    # A string's address is loaded with lea, which can only write a register
+    if isinstance(source, Assembly.String):
+        if is_memory(destination):
+            assembly_list.append(Assembly.Lea(register(scratch_register), source))
+            assembly_list.append(Assembly.Mov(destination, register(scratch_register)))
+        else:
+            assembly_list.append(Assembly.Lea(destination, source))
+    elif is_memory(destination) and (is_memory(source) or not fits_immediate(source)):
+        assembly_list.append(Assembly.Mov(register(scratch_register), source))
+        assembly_list.append(Assembly.Mov(destination, register(scratch_register)))
+    else:
+        assembly_list.append(Assembly.Mov(destination, source))
+
+
+def source_operand(destination: Assembly, source: Assembly, assembly_list: List[Assembly]) -> Assembly:
+    """
+    Makes an operand usable as the source of a two-operand instruction with the destination.
+
+    Args:
+        :param destination: Assembly operand that the instruction writes.
+        :param source: Assembly operand that the instruction reads.
+        :param assembly_list: List of Assembly instructions to append to.
+
+    Returns:
+        :return: The source, or the scratch register holding it.
+
+    Raises:
+        Nothing.
+    """
+    if not fits_immediate(source) or (is_memory(destination) and is_memory(source)):
+        assemble_move(register(scratch_register), source, assembly_list)
+        return register(scratch_register)
+    return source
+
+
+def magic_number(divisor: int) -> Tuple[int, int]:
+    """
+    Finds the multiplier and shift that divide a signed 64-bit value by a constant with a high multiply
+    (Hacker's Delight, 10-1): n / d == (high 64 bits of M * n, corrected by n) >> s, rounded toward zero.
+
+    Args:
+        :param divisor: Int constant divisor, with 2 <= |divisor| < 2 ** 63.
+
+    Returns:
+        :return: Int signed 64-bit multiplier M.
+        :return: Int shift s.
+
+    Raises:
+        Nothing.
+    """
+    two63 = 2 ** 63
+    absolute = abs(divisor)
+    t = two63 + (1 if divisor < 0 else 0)
+    anc = t - 1 - t % absolute  # Absolute value of the largest multiple of the divisor below 2 ** 63
+    p = 63
+    q1, r1 = divmod(two63, anc)
+    q2, r2 = divmod(two63, absolute)
+
+    while True:
+        p += 1
+        q1, r1 = 2 * q1, 2 * r1
+        if r1 >= anc:
+            q1, r1 = q1 + 1, r1 - anc
+        q2, r2 = 2 * q2, 2 * r2
+        if r2 >= absolute:
+            q2, r2 = q2 + 1, r2 - absolute
+
+        delta = absolute - r2
+        if not (q1 < delta or (q1 == delta and r1 == 0)):
+            break
+
+    multiplier = (q2 + 1) % 2 ** 64
+    multiplier = multiplier - 2 ** 64 if multiplier >= two63 else multiplier
+    return (-multiplier if divisor < 0 else multiplier), p - 64
+
+
+def divides_by_magic_number(divisor: int) -> bool:
+    """
+    Checks whether a constant divisor is lowered to a high multiply.
+    (0 and -1 can trap, so they keep idiv, as do powers of two, which the peephole optimizer turns into shifts).
+    """
+    absolute = abs(divisor)
+    return 3 <= absolute < 2 ** 63 and absolute & (absolute - 1) != 0
+
+
+def assemble_constant_division(op: str, source1: Assembly, divisor: int, assembly_list: List[Assembly]) -> Assembly.Register:
+    """
+    Lowers a division or remainder by a constant into a high multiply by its magic number, instead of idiv.
+    Like idiv, it leaves the quotient in %rax and the remainder in %rdx, and clobbers the scratch register.
+
+    Args:
+        :param op: Str Snake binary operator, "/" or "%".
+        :param source1: Assembly operand for the dividend.
+        :param divisor: Int constant divisor, for which divides_by_magic_number holds.
+        :param assembly_list: List of Assembly instructions to append to.
+
+    Returns:
+        :return: Assembly register holding the result.
+
+    Raises:
+        Nothing.
+    """
+    accumulator = register(accumulator_register)
+    remainder = register(remainder_register)
+    scratch = register(scratch_register)
+    multiplier, shift = magic_number(divisor)
+
+    # %rdx = high 64 bits of M * n
+    assemble_move(scratch, source1, assembly_list)
+    assembly_list.append(Assembly.Mov(accumulator, Assembly.Integer(str(multiplier))))
+    assembly_list.append(Assembly.IMul(scratch))
+
+    # The multiplier wrapped around 64 bits, so add (or subtract) the dividend back
+    if divisor > 0 and multiplier < 0:
+        assembly_list.append(Assembly.Add(remainder, scratch))
+    elif divisor < 0 and multiplier > 0:
+        assembly_list.append(Assembly.Sub(remainder, scratch))
+    if shift > 0:
+        assembly_list.append(Assembly.Sar(remainder, Assembly.Integer(str(shift))))
+
+    # Round toward zero, adding 1 to a negative quotient
+    assembly_list.append(Assembly.Mov(accumulator, remainder))
+    assembly_list.append(Assembly.Shr(accumulator, Assembly.Integer("63")))
+    assembly_list.append(Assembly.Add(accumulator, remainder))
+    if op == "/":
+        return accumulator
+
+    # The remainder is n - q * d
+    assembly_list.append(Assembly.Mov(remainder, Assembly.Integer(str(divisor))))
+    assembly_list.append(Assembly.IMul(remainder))
+    assembly_list.append(Assembly.Sub(scratch, accumulator))
+    assembly_list.append(Assembly.Mov(remainder, scratch))
+    return remainder
+
+
+def assemble_binary_op(destination: Assembly, op: str, source1: Assembly, source2: Assembly, frame: Frame, assembly_list: List[Assembly]) -> None:
+    """
+    Lowers a binary operation, choosing the instruction forms that need the fewest moves.
+
+    Args:
+        :param destination: Assembly operand for the result.
+        :param op: Str Snake binary operator.
+        :param source1: Assembly operand for the left value.
+        :param source2: Assembly operand for the right value.
+        :param frame: Frame of the function being assembled.
+        :param assembly_list: List of Assembly instructions to append to.
+
+    Returns:
+        Nothing.
+
+    Raises:
+        InvalidSyntax for an unknown operator.
+    """
+    match op:
+        case "+" | "-":
+            instruction = binary_operators[op]
+
+            # Addition is commutative, so the destination can be either value
+            if op == "+" and destination == source2 and destination != source1:
+                source1, source2 = source2, source1
+
+            if destination == source1:
+                assembly_list.append(instruction(destination, source_operand(destination, source2, assembly_list)))
+            elif destination != source2 and (not is_memory(destination) or not is_memory(source1)):
+                assemble_move(destination, source1, assembly_list)
+                assembly_list.append(instruction(destination, source_operand(destination, source2, assembly_list)))
+            else:
+                accumulator = register(accumulator_register)
+                assemble_move(accumulator, source1, assembly_list)
+                assembly_list.append(instruction(accumulator, source_operand(accumulator, source2, assembly_list)))
+                assemble_move(destination, accumulator, assembly_list)
+
+        case "*" | "/" | "%":
+            accumulator = register(accumulator_register)
+            remainder = register(remainder_register)
+
+            # %rdx is clobbered, so preserve it if it holds a parameter for the next call
+            preserve = remainder_register in frame.pending_params
+            if preserve:
+                assembly_list.append(Assembly.Push(remainder))
+
+            # Division by a constant is a high multiply by its magic number
+            if op != "*" and isinstance(source2, Assembly.Integer) and divides_by_magic_number(int(source2.integer)):
+                result = assemble_constant_division(op, source1, int(source2.integer), assembly_list)
+
+            else:
+                # mul/div cannot take an immediate, and div cannot take %rdx after it is sign-extended into
+                if is_immediate(source2) or source2 == remainder:
+                    assemble_move(register(scratch_register), source2, assembly_list)
+                    source2 = register(scratch_register)
+
+                assemble_move(accumulator, source1, assembly_list)
+                if op == "*":
+                    assembly_list.append(Assembly.Mul(source2))
+                    result = accumulator
+                else:
+                    assembly_list.append(Assembly.Cqo())
+                    assembly_list.append(Assembly.IDiv(source2))
+                    result = accumulator if op == "/" else remainder
+
+            if preserve:
+                assemble_move(accumulator, result, assembly_list)
+                assembly_list.append(Assembly.Pop(remainder))
+                result = accumulator
+            assemble_move(destination, result, assembly_list)
+
+        case _:
+            raise Error.InvalidSyntax(op, "assemble_binary_op", "Expected one of + - * / %.")
+
+
+def assemble_call(name: str, params: List[Normal], frame: Frame, assembly_list: List[Assembly]) -> None:
+    """
+    Lowers a call, moving any parameter that is not already in its parameter register.
+
+    Args:
+        :param name: Str name of the function.
+        :param params: List of Normal form memory holding the parameters.
+        :param frame: Frame of the function being assembled.
+        :param assembly_list: List of Assembly instructions to append to.
+
+    Returns:
+        Nothing.
+
+    Raises:
+        InvalidSyntax for more parameters than parameter registers.
+    """
+    assemble_params(name, params, frame, assembly_list)
+    assembly_list.append(Assembly.Call(name))
+    frame.pending_params.clear()
+
+
+def assemble_params(name: str, params: List[Normal], frame: Frame, assembly_list: List[Assembly]) -> None:
+    """
+    Moves the parameters of a call into their parameter registers, unless they are already there.
+
+    Args:
+        :param name: Str name of the function.
+        :param params: List of Normal form memory holding the parameters.
+        :param frame: Frame of the function being assembled.
+        :param assembly_list: List of Assembly instructions to append to.
+
+    Returns:
+        Nothing.
+
+    Raises:
+        InvalidSyntax for more parameters than parameter registers.
+    """
+    if len(params) > len(param_registers):
+        raise Error.InvalidSyntax(name, "assemble_params", f"At most {len(param_registers)} parameters are supported.")
+
+    for i, p in enumerate(params):
+        assemble_move(register(param_registers[i]), frame.location(p), assembly_list)
+
+
+def assemble_instruction(instr: Normal, frame: Frame, labels: List[Assembly.Label], assembly_list: List[Assembly]) -> None:
+    """
+    Lowers a single Normal form instruction into Assembly instructions.
+
+    Args:
+        :param instr: Normal form instruction.
+        :param frame: Frame of the function being assembled.
+        :param labels: List of function Labels, that nested function definitions are added to.
+        :param assembly_list: List of Assembly instructions to append to.
+
+    Returns:
+        Nothing.
+
+    Raises:
+        UnknownInstruction for an instruction that is not a Normal form statement.
+    """
+    match instr:
+        # Function Definition (hoisted into its own label)
+        case Normal.FunDef(name, _, inner_instrs) if frame.functions is None:
+            labels.append(assemble_function(name, inner_instrs, frame.strings, labels, frame.allocate))
+
+        # Function Definition, assembled before (its string uses are replayed, to declare them in the same order)
+        case Normal.FunDef() if instr in frame.functions:
+            assembled = frame.functions[instr]
+            for string in assembled.strings:
+                frame.strings.label(string)
+            labels.extend(assembled.labels)
+
+        # Function Definition, remembered after it is assembled
+        case Normal.FunDef(name, _, inner_instrs):
+            first_label = len(labels)
+            first_string = len(frame.strings.uses)
+            labels.append(assemble_function(name, inner_instrs, frame.strings, labels, frame.allocate, functions=frame.functions))
+            frame.functions[instr] = AssembledFunction(tuple(labels[first_label:]), tuple(frame.strings.uses[first_string:]))
+
+        # Call, as a statement
+        case Normal.Call(name, params):
+            assemble_call(name, params, frame, assembly_list)
+
+        # Assign
+        case Normal.Assign(destination, source):
+            new_destination = frame.location(destination)
+
+            match source:
+                case Normal.Call(name, params):
+                    assemble_call(name, params, frame, assembly_list)
+                    assemble_move(new_destination, register(return_register), assembly_list)
+
+                case Normal.BinaryOp(op, memory1, memory2):
+                    new_source1 = frame.location(memory1)
+                    new_source2 = frame.location(memory2)
+                    assemble_binary_op(new_destination, op, new_source1, new_source2, frame, assembly_list)
+
+                case Normal.UnaryOp(op, memory):
+                    assemble_move(new_destination, frame.location(memory), assembly_list)
+                    if op == "-":
+                        assembly_list.append(Assembly.Neg(new_destination))
+
+                case _:
+                    assemble_move(new_destination, frame.location(source), assembly_list)
+
+            if isinstance(destination, Normal.ParamMemory):
+                frame.pending_params.add(param_registers[destination.number])
+
+        # Error
+        case _:
+            raise Error.UnknownInstruction(instr, "assemble_instruction", "Normal statement")
+
+
+def assemble_function(name: str, normal_list: List[Normal], strings: StringPool, labels: List[Assembly.Label],
+                      allocate: bool = False, is_main: bool = False,
+                      functions: None | Dict[Normal.FunDef, AssembledFunction] = None) -> Assembly.Label:
+    """
+    Lowers a function body into a Label, with its prologue and epilogue.
+
+    Args:
+        :param name: Str name of the function.
+        :param normal_list: List of Normal form instructions in the function body.
+        :param strings: StringPool of the string literals for the data section, shared by all functions.
+        :param labels: List of function Labels, that nested function definitions are added to.
+        :param allocate: Bool whether to assign registers by linear scan (register_allocator), instead of
+                         keeping variables in stack slots and temporaries in fixed registers.
+        :param is_main: Bool whether the function is the program entry point (which returns 0).
+        :param functions: Dict from a function definition to its AssembledFunction, reused and updated if not None.
+
+    Returns:
+        :return: Assembly Label of the function.
+
+    Raises:
+        Nothing.
+    """
+    locations = None
+    if allocate:
+        normal_list, locations = allocate_registers(normal_list)
+    frame = Frame(strings, locations, allocate, functions)
+
+    # A call statement that ends a function is a tail call: after its parameters are moved, the frame is torn down
+    # and the callee is jumped to, so it returns straight to this function's caller (main has to return 0 itself)
+    tail_call = None
+    if not is_main and normal_list and isinstance(normal_list[-1], Normal.Call):
+        *normal_list, tail_call = normal_list
+
+    body = []
+    for instr in normal_list:
+        assemble_instruction(instr, frame, labels, body)
+
+    if tail_call is not None:
+        assemble_params(tail_call.name, tail_call.params, frame, body)
+
+    if is_main:
+        body.append(Assembly.Mov(register(return_register), Assembly.Integer("0")))
+
+    # Save the callee-saved registers in stack slots
+    saved = [(register(r), frame.new_slot()) for r in frame.saved_registers()]
+
+    # Keep %rsp 16 byte aligned at calls (the return address and %rbp take 16 bytes)
+    frame_size = (8 * frame.num_slots + 15) // 16 * 16
+
+    prologue = [Assembly.Push(register("rbp")), Assembly.Mov(register("rbp"), register("rsp"))]
+    if frame_size:
+        prologue.append(Assembly.Sub(register("rsp"), Assembly.Integer(str(frame_size))))
+    prologue += [Assembly.Mov(slot, r) for r, slot in saved]
+
+    epilogue = [Assembly.Mov(r, slot) for r, slot in saved]
+    epilogue += [Assembly.Mov(register("rsp"), register("rbp")), Assembly.Pop(register("rbp"))]
+    epilogue.append(Assembly.Ret() if tail_call is None else Assembly.Jmp(tail_call.name))
+
+    return Assembly.Label(name, [*prologue, *body, *epilogue])
+
+
+def assemble(normal_list: List[Normal], allocate: bool = False,
+             functions: None | Dict[Normal.FunDef, AssembledFunction] = None) -> List[Assembly]:
+    """
+    Converts Normal form instructions into Assembly instructions.
+    Top-level instructions become the "main" function, and every function definition becomes its own Label.
+
+    Args:
+        :param normal_list: List of Normal form instructions to assemble.
+        :param allocate: Bool whether to assign registers by linear scan (register_allocator).
+        :param functions: Dict from a function definition to its AssembledFunction, if not None.
+                          A function found in it is not assembled again, and the others are added to it.
+                          (It must only be shared between programs assembled with the same allocate).
+
+    Returns:
+        :return: List of Assembly Labels, functions followed by string data.
+
+    Raises:
+        InvalidSyntax for a call with more parameters than parameter registers.
+    """
+    strings = StringPool()
+    labels = []
+    main = assemble_function("main", normal_list, strings, labels, allocate, is_main=True, functions=functions)
+    return [main, *labels, *strings.declarations()]
@@ -0,0 +1,210 @@
+"""
+This file stores compiled assembly on disk, keyed by the source text and everything else that decides the output.
+Unchanged sources are found by their hash before they are tokenized, so a warm rebuild only reads and copies files.
+"""
+
+
+import os
+import pickle
+import tempfile
+import time
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import List, Dict
+from languages.Normal import Normal
+
+
+# The compiler's own modules, whose contents are part of every key (a changed compiler never reuses old output)
+compiler_packages = ["languages", "translators", "utils"]
+
+assembly_suffix = ".s"
+normal_suffix = ".normal.pickle"
+
+default_max_bytes = 256 * 2 ** 20
+
+# A temporary file older than this was left by a writer that crashed, since a write takes well under a second
+stale_temp_seconds = 60 * 60
+
+compiler_hash = None  # type: None | str
+
+
+def compiler_version() -> str:
+    """
+    Hashes the source files of the compiler, once per process.
+    """
+    global compiler_hash
+    if compiler_hash is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        digest = sha256()
+        for package in compiler_packages:
+            directory = os.path.join(root, package)
+            for name in sorted(os.listdir(directory)):
+                if name.endswith(".py"):
+                    digest.update(f"{package}/{name}\0".encode())
+                    with open(os.path.join(directory, name), "rb") as file:
+                        digest.update(file.read())
+        compiler_hash = digest.hexdigest()
+    return compiler_hash
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+
+class CompileCache:
+    def __init__(self, directory: str, max_bytes: int = default_max_bytes):
+        self.directory = directory  # type: str
+        self.max_bytes = max_bytes  # type: int
+        self.stats = CacheStats()  # type: CacheStats
+
+        # Note: entries are files named by their key, in subdirectories named by the key's first two digits.
+        #       A hit touches the entry's modification time, so the oldest times are the least recently used.
+
+    def key(self, source: str, optimize: bool = False, allocate: bool = False) -> str:
+        """
+        Hashes a source text together with the compiler version and the flags that change its output.
+
+        Args:
+            :param source: Str of Snake source code.
+            :param optimize: Bool whether the optimization stages run.
+            :param allocate: Bool whether registers are assigned by linear scan.
+
+        Returns:
+            :return: Str hex sha256 key.
+
+        Raises:
+            Nothing.
+        """
+        digest = sha256(f"{compiler_version()}\0optimize={optimize}\0allocate={allocate}\0".encode())
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    def path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key[:2], key + suffix)
+
+    def read(self, key: str, suffix: str) -> None | bytes:
+        path = self.path(key, suffix)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+
+        # Another process may evict the entry between the read and the touch
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return data
+
+    def get(self, key: str) -> None | str:
+        """
+        Finds the cached assembly of a key, counting a hit or a miss.
+
+        Args:
+            :param key: Str key, as returned by key.
+
+        Returns:
+            :return: Str assembly, or None if the key is not cached.
+
+        Raises:
+            Nothing.
+        """
+        data = self.read(key, assembly_suffix)
+        if data is None:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        return data.decode()
+
+    def get_normal(self, key: str) -> None | List[Normal]:
+        """
+        Finds the cached Normal form of a key, if it was stored with its assembly.
+        """
+        data = self.read(key, normal_suffix)
+        return None if data is None else pickle.loads(data)
+
+    def write(self, key: str, suffix: str, data: bytes) -> None:
+        # Written to a temporary file and renamed into place, so that readers never see a partial entry
+        path = self.path(key, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def put(self, key: str, assembly: str, normal: None | List[Normal] = None) -> None:
+        """
+        Stores the assembly of a key, and optionally its Normal form.
+
+        Args:
+            :param key: Str key, as returned by key.
+            :param assembly: Str assembly to store.
+            :param normal: List of Normal form instructions to store, if not None.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            OSError if the cache directory cannot be written.
+        """
+        # The Normal form goes first, so that an entry with assembly is complete
+        if normal is not None:
+            self.write(key, normal_suffix, pickle.dumps(normal, pickle.HIGHEST_PROTOCOL))
+        self.write(key, assembly_suffix, assembly.encode())
+        self.stats.writes += 1
+
+    def evict(self) -> None:
+        """
+        Deletes the least recently used entries until the cache fits in max_bytes, and temporary files left by
+        writers that crashed. An entry's files are deleted together, assembly first, so it is never left incomplete.
+        Safe to run while other processes read and write the cache (an entry deleted under a reader is a miss).
+        """
+        entries = {}  # type: Dict[str, List]
+        total = 0
+        now = time.time()
+        for directory, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                total += stat.st_size
+
+                # Temporary files belong to writes in progress, unless they are stale
+                if name.endswith(".tmp"):
+                    if now - stat.st_mtime > stale_temp_seconds:
+                        try:
+                            os.unlink(path)
+                            total -= stat.st_size
+                        except FileNotFoundError:
+                            pass
+                    continue
+
+                # An entry was last used when any of its files was last read or written
+                entry = entries.setdefault(name.split(".")[0], [0.0, 0, []])
+                entry[0] = max(entry[0], stat.st_mtime)
+                entry[1] += stat.st_size
+                entry[2].append(path)
+
+        for _, size, paths in sorted(entries.values()):
+            if total <= self.max_bytes:
+                break
+            for path in sorted(paths, key=lambda path: not path.endswith(assembly_suffix)):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            if any(path.endswith(assembly_suffix) for path in paths):
+                self.stats.evictions += 1
@@ -0,0 +1,416 @@
+"""
+This file chains the compiler stages, turning Snake source code into AT&T syntax assembly.
+
+Usage:
+    python -m translators.compiler program.py [-o program.s] [--optimize] [--allocate] [--time-stages]
+    python -m translators.compiler src/ more.py [-o build/] [--jobs 8] [--optimize] [--allocate]
+"""
+
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, fields, is_dataclass
+from time import perf_counter
+from typing import List, Dict, Tuple, Callable, Any, Iterable
+from languages.Normal import Normal
+from translators.tokenizer import scan
+from translators.lexer import lex_iter
+from translators.parser import parse
+from translators.normalizer import normalize
+from translators.assembler import assemble
+from translators.optimizer import fold_constants, optimize as optimize_normal
+from translators.peephole import optimize_peephole
+from translators.unparser_att import unparse
+from translators.cache import CompileCache, default_max_bytes
+from utils.Error import Error
+
+
+@dataclass(frozen=True, slots=True)
+class Stage:
+    name: str
+    run: Callable[[Any], Any]
+    count: Callable[[Any], int]  # Number of items in the stage's output
+    unit: str
+
+
+@dataclass(frozen=True, slots=True)
+class StageTiming:
+    name: str
+    seconds: float
+    blocks: int  # Net change in allocated memory blocks across the stage (allocated and still alive, less freed)
+    items: int
+    unit: str
+
+
+def count_nodes(node: Any) -> int:
+    """
+    Counts the Snake nodes of a tree (or a list of trees), including the nodes nested in them.
+    """
+    if isinstance(node, (list, tuple)):
+        return sum(count_nodes(child) for child in node)
+    if not is_dataclass(node):
+        return 0
+    return 1 + sum(count_nodes(getattr(node, field.name)) for field in fields(node))
+
+
+def count_instructions(normal_list: List[Normal]) -> int:
+    """
+    Counts Normal form instructions, including the ones in function definitions.
+    """
+    return sum(
+        1 + count_instructions(instr.inner_instrs) if isinstance(instr, Normal.FunDef) else 1
+        for instr in normal_list
+    )
+
+
+def build_stages(optimize: bool = False, allocate: bool = False) -> List[Stage]:
+    """
+    Lists the compiler stages, in the order they run.
+
+    Args:
+        :param optimize: Bool whether to add the Snake, Normal form and peephole optimization stages.
+        :param allocate: Bool whether the assembler assigns registers by linear scan (register_allocator).
+
+    Returns:
+        :return: List of Stages, the first taking a str of Snake source code and the last returning assembly text.
+
+    Raises:
+        Nothing.
+    """
+    stages = [
+        Stage("tokenize", scan, len, "words"),
+        Stage("lex", lambda words: list(lex_iter(words)), len, "tokens"),
+        Stage("parse", parse, count_nodes, "Snake nodes"),
+        Stage("fold", fold_constants, count_nodes, "Snake nodes"),
+        Stage("normalize", normalize, count_instructions, "Normal instrs"),
+        Stage("optimize", optimize_normal, count_instructions, "Normal instrs"),
+        Stage("assemble", lambda normal_list: assemble(normal_list, allocate),
+              lambda labels: sum(len(label.instructions) for label in labels), "Assembly instrs"),
+        Stage("peephole", optimize_peephole,
+              lambda labels: sum(len(label.instructions) for label in labels), "Assembly instrs"),
+        Stage("unparse", unparse, lambda text: text.count("\n"), "lines"),
+    ]
+
+    if not optimize:
+        stages = [stage for stage in stages if stage.name not in ("fold", "optimize", "peephole")]
+    return stages
+
+
+def compile(source: str, optimize: bool = False, allocate: bool = False, timings: None | List[StageTiming] = None,
+            stage_outputs: None | Dict[str, Any] = None) -> str:
+    """
+    Compiles Snake source code into an AT&T syntax assembly program.
+
+    Args:
+        :param source: Str of Snake source code.
+        :param optimize: Bool whether to run the optimization stages.
+        :param allocate: Bool whether to assign registers by linear scan.
+        :param timings: List that a StageTiming is appended to for each stage, if not None.
+        :param stage_outputs: Dict that the output of each stage is stored in by stage name, if not None.
+
+    Returns:
+        :return: Str AT&T syntax assembly.
+
+    Raises:
+        SyntaxError for malformed indentation in the source.
+        InvalidSyntax for source that does not parse, or calls with too many parameters.
+    """
+    value = source
+    for stage in build_stages(optimize, allocate):
+        if timings is None:
+            value = stage.run(value)
+        else:
+            value = timed_run(stage, value, timings)
+
+        if stage_outputs is not None:
+            stage_outputs[stage.name] = value
+
+    return value
+
+
+def timed_run(stage: Stage, value: Any, timings: List[StageTiming]) -> Any:
+    """
+    Runs a stage, appending its StageTiming.
+    """
+    # The blocks are counted while the stage's input is still alive, so that freeing it does not offset them
+    # (the count is net: blocks the stage allocated and freed again are not seen, so it can be zero or negative)
+    blocks = sys.getallocatedblocks()
+    start = perf_counter()
+    output = stage.run(value)
+    seconds = perf_counter() - start
+    blocks = sys.getallocatedblocks() - blocks
+
+    timings.append(StageTiming(stage.name, seconds, blocks, stage.count(output), stage.unit))
+    return output
+
+
+def format_timings(timings: List[StageTiming]) -> str:
+    """
+    Formats stage timings as a table, with a total row for the time.
+    """
+    lines = [f"{'stage':>10} {'ms':>9} {'net blocks':>10} {'items':>9}"]
+    for timing in timings:
+        lines.append(f"{timing.name:>10} {timing.seconds * 1000:>9.2f} {timing.blocks:>10} {timing.items:>9} {timing.unit}")
+    lines.append(f"{'total':>10} {sum(timing.seconds for timing in timings) * 1000:>9.2f}")
+    return "\n".join(lines)
+
+
+def compile_cached(source: str, cache: CompileCache, optimize: bool = False, allocate: bool = False,
+                   keep_normal: bool = False) -> Tuple[str, bool]:
+    """
+    Compiles Snake source code, reusing the assembly cached for the same source, compiler and flags.
+    A hit is found by hashing the source text alone, without running any stage.
+
+    Args:
+        :param source: Str of Snake source code.
+        :param cache: CompileCache to look the source up in, and to store its assembly in on a miss.
+        :param optimize: Bool whether to run the optimization stages.
+        :param allocate: Bool whether to assign registers by linear scan.
+        :param keep_normal: Bool whether to also store the final Normal form on a miss.
+
+    Returns:
+        :return: Str AT&T syntax assembly, and bool whether it came from the cache.
+
+    Raises:
+        SyntaxError or InvalidSyntax as compile does (sources that do not compile are not cached).
+    """
+    key = cache.key(source, optimize, allocate)
+    assembly = cache.get(key)
+    if assembly is not None:
+        return assembly, True
+
+    stage_outputs = {}
+    assembly = compile(source, optimize, allocate, stage_outputs=stage_outputs)
+    cache.put(key, assembly, stage_outputs.get("optimize", stage_outputs["normalize"]) if keep_normal else None)
+    return assembly, False
+
+
+# Snake source files have Python syntax, and are found in directories by their suffix
+source_suffix = ".py"
+assembly_suffix = ".s"
+
+# Errors that are reported for the file that raised them, instead of ending a batch
+# (the stages recurse over the Snake tree, so an expression nested too deeply raises RecursionError)
+compile_errors = (SyntaxError, Error.InvalidSyntax, Error.UnknownInstruction, RecursionError)
+
+# Errors that a batch also reports per file: a source that cannot be read or decoded, or an output that cannot be written
+file_errors = (*compile_errors, OSError, ValueError)
+
+
+@dataclass(frozen=True, slots=True)
+class BatchResult:
+    source: str
+    output: None | str  # Path of the written assembly, None if the file did not compile
+    error: None | str
+    seconds: float
+    cached: bool = False  # Whether the assembly came from the compile cache
+
+
+def find_sources(paths: Iterable[str]) -> List[str]:
+    """
+    Expands paths into a sorted list of source files, searching directories recursively.
+
+    Args:
+        :param paths: Iterable of source file and directory paths.
+
+    Returns:
+        :return: List of str source file paths, without duplicates.
+
+    Raises:
+        FileNotFoundError for a path that does not exist.
+    """
+    sources = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in os.walk(path):
+                sources.update(os.path.join(directory, name) for name in names if name.endswith(source_suffix))
+        elif os.path.exists(path):
+            sources.add(path)
+        else:
+            raise FileNotFoundError(path)
+    return sorted(sources)
+
+
+def output_path(source: str, output_dir: None | str = None, root: None | str = None) -> str:
+    """
+    Finds where the assembly of a source file is written: beside it, or at its path relative to root in output_dir.
+    """
+    path = os.path.splitext(source)[0] + assembly_suffix
+    if output_dir is None:
+        return path
+    return os.path.join(output_dir, os.path.relpath(path, root) if root is not None else os.path.basename(path))
+
+
+def compile_file(source: str, output: str, optimize: bool = False, allocate: bool = False,
+                 cache: None | CompileCache = None, keep_normal: bool = False) -> BatchResult:
+    """
+    Compiles a source file and writes its assembly, reporting a compile or file error instead of raising it.
+    (Runs in batch worker processes, so errors are returned as text, which always pickles).
+
+    Args:
+        :param source: Str path of the Snake source file.
+        :param output: Str path of the assembly file to write.
+        :param optimize: Bool whether to run the optimization stages.
+        :param allocate: Bool whether to assign registers by linear scan.
+        :param cache: CompileCache to reuse and store assembly in, if not None.
+        :param keep_normal: Bool whether the cache also stores the final Normal form.
+
+    Returns:
+        :return: BatchResult of the file.
+
+    Raises:
+        Nothing.
+    """
+    start = perf_counter()
+    cached = False
+    try:
+        with open(source) as file:
+            text = file.read()
+
+        if cache is None:
+            assembly = compile(text, optimize, allocate)
+        else:
+            assembly, cached = compile_cached(text, cache, optimize, allocate, keep_normal)
+
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w") as file:
+            file.write(assembly)
+    except file_errors as error:
+        return BatchResult(source, None, f"{type(error).__name__}: {error}", perf_counter() - start)
+
+    return BatchResult(source, output, None, perf_counter() - start, cached)
+
+
+def compile_batch(sources: List[str], outputs: List[str], workers: None | int = None, optimize: bool = False,
+                  allocate: bool = False, on_result: None | Callable[[BatchResult], None] = None,
+                  cache: None | CompileCache = None, keep_normal: bool = False) -> List[BatchResult]:
+    """
+    Compiles many source files in a pool of worker processes, each file writing its assembly as soon as it compiles.
+    A file that does not compile is reported in its BatchResult, and the rest of the batch carries on.
+
+    Args:
+        :param sources: List of str paths of Snake source files.
+        :param outputs: List of str paths of the assembly files to write, one per source.
+        :param workers: Int number of worker processes (default: the number of CPUs).
+        :param optimize: Bool whether to run the optimization stages.
+        :param allocate: Bool whether to assign registers by linear scan.
+        :param on_result: Function called with each BatchResult as its file completes, if not None.
+        :param cache: CompileCache shared by the workers, if not None (its stats count the whole batch).
+        :param keep_normal: Bool whether the cache also stores the final Normal form.
+
+    Returns:
+        :return: List of BatchResults, in the order of sources.
+
+    Raises:
+        Nothing.
+    """
+    results = {}
+    with ProcessPoolExecutor(workers) as executor:
+        futures = {
+            executor.submit(compile_file, source, output, optimize, allocate, cache, keep_normal): source
+            for source, output in zip(sources, outputs)
+        }
+
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if on_result is not None:
+                on_result(result)
+
+    # Each worker counted in its own copy of the cache, so the batch is counted from the results
+    if cache is not None:
+        for result in results.values():
+            if result.cached:
+                cache.stats.hits += 1
+            else:
+                cache.stats.misses += 1
+                cache.stats.writes += result.error is None
+        cache.evict()
+
+    return [results[source] for source in sources]
+
+
+def main(argv: None | List[str] = None) -> int:
+    """
+    Runs the command line compiler, returning its exit status.
+    """
+    arg_parser = argparse.ArgumentParser(prog="python -m translators.compiler", description="Compile Snake into assembly.")
+    arg_parser.add_argument("sources", nargs="+", help="Snake source files or directories, or - for standard input")
+    arg_parser.add_argument("-o", "--output", help="assembly output file, or directory in batch mode (default: standard output, or beside each source)")
+    arg_parser.add_argument("-O", "--optimize", action="store_true", help="run the optimization stages")
+    arg_parser.add_argument("--allocate", action="store_true", help="assign registers by linear scan")
+    arg_parser.add_argument("--time-stages", action="store_true", help="print the time, net change in memory blocks and items of each stage")
+    arg_parser.add_argument("-j", "--jobs", type=int, help="number of worker processes in batch mode (default: the number of CPUs)")
+    arg_parser.add_argument("--cache-dir", help="reuse the assembly of unchanged sources from this directory")
+    arg_parser.add_argument("--cache-size", type=int, default=default_max_bytes // 2 ** 20, help="cache size limit in MiB (default: %(default)s)")
+    arg_parser.add_argument("--cache-normal", action="store_true", help="also cache the Normal form of each source")
+    args = arg_parser.parse_args(argv)
+    cache = None if args.cache_dir is None else CompileCache(args.cache_dir, args.cache_size * 2 ** 20)
+
+    # Several sources, or a directory, are compiled as a batch
+    if len(args.sources) > 1 or os.path.isdir(args.sources[0]):
+        return main_batch(args, cache)
+    source_path = args.sources[0]
+
+    # Timing the stages runs them, so the cache is not read
+    timings = [] if args.time_stages else None
+    try:
+        if source_path == "-":
+            source = sys.stdin.read()
+        else:
+            with open(source_path) as file:
+                source = file.read()
+
+        if cache is None or timings is not None:
+            assembly = compile(source, args.optimize, args.allocate, timings)
+        else:
+            assembly, _ = compile_cached(source, cache, args.optimize, args.allocate, args.cache_normal)
+            cache.evict()
+
+        if args.output is None:
+            sys.stdout.write(assembly)
+        else:
+            with open(args.output, "w") as file:
+                file.write(assembly)
+    except file_errors as error:
+        print(f"{source_path}: {error}", file=sys.stderr)
+        return 1
+
+    # Timings go to standard error, so they never mix with assembly on standard output
+    if timings is not None:
+        print(format_timings(timings), file=sys.stderr)
+    return 0
+
+
+def main_batch(args: argparse.Namespace, cache: None | CompileCache = None) -> int:
+    """
+    Runs the command line compiler over a batch of sources, returning 1 if any of them did not compile.
+    """
+    sources = find_sources(args.sources)
+
+    # Outputs keep their path relative to the directory they were found in
+    roots = [os.path.abspath(path) for path in args.sources if os.path.isdir(path)]
+    outputs = []
+    for source in sources:
+        root = next((root for root in roots if os.path.commonpath([root, os.path.abspath(source)]) == root), None)
+        outputs.append(output_path(os.path.abspath(source) if root else source, args.output, root))
+
+    def report(result: BatchResult) -> None:
+        if result.error is None:
+            print(f"{result.source} -> {result.output} ({result.seconds * 1000:.1f} ms)")
+        else:
+            print(f"{result.source}: {result.error}", file=sys.stderr)
+
+    results = compile_batch(sources, outputs, args.jobs, args.optimize, args.allocate, report, cache, args.cache_normal)
+    failed = sum(1 for result in results if result.error is not None)
+    print(f"{len(results) - failed} compiled, {failed} failed", file=sys.stderr)
+    if cache is not None:
+        stats = cache.stats
+        print(f"cache: {stats.hits} hits, {stats.misses} misses, {stats.writes} writes, {stats.evictions} evictions", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
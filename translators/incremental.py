@@ -0,0 +1,205 @@
+"""
+This file recompiles a program that changes between compilations, one top-level function at a time.
+A function whose text and enclosing variables are unchanged reuses its Normal form and Assembly Labels.
+"""
+
+
+from dataclasses import dataclass
+from hashlib import sha256
+from io import StringIO
+from typing import List, Dict, Tuple, Any
+from languages.Snake import Snake
+from languages.Assembly import Assembly
+from languages.Normal import Normal
+from translators.lexer import lex_source
+from translators.parser import parse
+from translators.normalizer import Environment, normalize_all
+from translators.assembler import assemble, AssembledFunction
+from translators.unparser_att import unparse_to, unparse_label
+
+
+@dataclass(frozen=True, slots=True)
+class Chunk:
+    text: str  # Source lines of one top-level statement, with the blank and comment lines that follow it
+    is_function: bool
+
+
+class IdentityDict(dict):
+    """
+    Dict whose keys are compared by identity.
+    (Normal form and Assembly nodes hash their whole tree on every lookup, and reused nodes are the same objects).
+    """
+
+    def __contains__(self, key: Any) -> bool:
+        return super().__contains__(id(key))
+
+    def __getitem__(self, key: Any) -> Any:
+        return super().__getitem__(id(key))[1]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        # The key is kept with its value, so that it stays alive and its id is not reused
+        super().__setitem__(id(key), (key, value))
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+
+@dataclass(slots=True)
+class IncrementalStats:
+    reused: int = 0  # Functions whose Normal form and Labels were reused
+    recompiled: int = 0  # Functions that were lexed, parsed, normalized and assembled
+
+
+def starts_statement(line: str) -> bool:
+    """
+    Checks whether a source line starts a top-level statement (it is not indented, blank or a comment).
+    """
+    return bool(line.strip()) and line[0] not in " \t#"
+
+
+def split_chunks(source: str) -> List[Chunk]:
+    """
+    Splits Snake source code into the text of its top-level statements.
+    A function definition's chunk holds its whole body, up to the next line that is not indented.
+
+    Args:
+        :param source: Str of Snake source code.
+
+    Returns:
+        :return: List of Chunks, whose texts join back into the source.
+
+    Raises:
+        Nothing.
+    """
+    chunks = []
+    lines = []
+    for line in source.splitlines(keepends=True):
+        # Lines before the first statement are blank or comments, and stay with it
+        if starts_statement(line) and any(starts_statement(previous) for previous in lines):
+            chunks.append(Chunk("".join(lines), is_function=chunk_is_function(lines)))
+            lines = []
+        lines.append(line)
+
+    if lines:
+        chunks.append(Chunk("".join(lines), is_function=chunk_is_function(lines)))
+    return chunks
+
+
+def chunk_is_function(lines: List[str]) -> bool:
+    return any(starts_statement(line) and line.startswith("def ") for line in lines)
+
+
+def environment_signature(env: Environment) -> str:
+    """
+    Describes the variables that a top-level function definition sees, which decide its Normal form.
+    """
+    variables = sorted((name, memory.number) for name, memory in env.mem_map.items())
+    return f"{env.mem_counter}\0{variables}"
+
+
+class IncrementalCompiler:
+    def __init__(self, allocate: bool = False):
+        self.allocate = allocate  # type: bool
+        self.parsed = {}  # type: Dict[str, List[Snake]]
+        self.fundefs = {}  # type: Dict[str, Normal.FunDef]
+        self.functions = IdentityDict()  # type: Dict[Normal.FunDef, AssembledFunction]
+        self.texts = IdentityDict()  # type: Dict[Assembly.Label, str]
+        self.stats = IncrementalStats()  # type: IncrementalStats
+
+        # Note: fundefs maps the fingerprint of a function definition's chunk (its text and the variables it sees)
+        #       to its Normal form, functions maps the Normal form to its Labels (see assembler.assemble),
+        #       and texts maps the Labels to their assembly text.
+
+        # Note: parsed maps the text of the other top-level statements to their Snake, which does not depend
+        #       on the variables in scope (their Normal form does, so they are normalized every time).
+
+        # Note: only the functions of the latest compilation are kept, so editing does not grow the caches.
+
+    def fingerprint(self, chunk: Chunk, env: Environment) -> str:
+        return sha256(f"{environment_signature(env)}\0{chunk.text}".encode()).hexdigest()
+
+    def normalize_chunks(self, chunks: List[Chunk]) -> Tuple[List[Normal], Dict[str, Normal.FunDef], Dict[str, List[Snake]]]:
+        """
+        Normalizes the top-level statements in order, reusing the Normal form of unchanged functions.
+
+        Args:
+            :param chunks: List of Chunks of the program.
+
+        Returns:
+            :return: List of Normal form instructions of the program, the fingerprints of its functions,
+                     and the Snake of its other statements.
+
+        Raises:
+            SyntaxError or InvalidSyntax for a changed chunk that does not compile.
+        """
+        env = Environment()
+        normal_list = []
+        fundefs = {}
+        parsed = {}
+
+        for chunk in chunks:
+            key = self.fingerprint(chunk, env) if chunk.is_function else None
+            if key in self.fundefs:
+                normal_list.append(self.fundefs[key])
+                fundefs[key] = self.fundefs[key]
+                self.stats.reused += 1
+                continue
+
+            # Lexed and parsed on its own, a chunk gives the same Snake as it does in the whole program
+            snake_list = self.parsed.get(chunk.text) or parse(list(lex_source(chunk.text)))
+            first = len(normal_list)
+            normalize_all(snake_list, env, normal_list)
+
+            if key is None:
+                parsed[chunk.text] = snake_list
+            else:
+                fundefs.update((key, instr) for instr in normal_list[first:] if isinstance(instr, Normal.FunDef))
+                self.stats.recompiled += 1
+
+        return normal_list, fundefs, parsed
+
+    def compile(self, source: str) -> str:
+        """
+        Compiles Snake source code, recompiling only the top-level functions that changed since the last compilation.
+        The output is the same as compiler.compile(source, allocate=allocate).
+
+        Args:
+            :param source: Str of Snake source code.
+
+        Returns:
+            :return: Str AT&T syntax assembly.
+
+        Raises:
+            SyntaxError for malformed indentation in the source.
+            InvalidSyntax for source that does not parse, or calls with too many parameters.
+        """
+        self.stats = IncrementalStats()
+        normal_list, fundefs, parsed = self.normalize_chunks(split_chunks(source))
+
+        functions = IdentityDict()
+        for fundef in fundefs.values():
+            if fundef in self.functions:
+                functions[fundef] = self.functions[fundef]
+        assembly_list = assemble(normal_list, self.allocate, functions)
+
+        # Labels of unchanged functions keep the text they were unparsed to
+        texts = IdentityDict()
+
+        def unparse_function_label(label: Assembly.Label) -> str:
+            text = self.texts.get(label)
+            texts[label] = unparse_label(label) if text is None else text
+            return texts[label]
+
+        stream = StringIO()
+        unparse_to(assembly_list, stream, unparse_function_label)
+
+        # Only the statements and functions of this compilation are remembered
+        self.parsed = parsed
+        self.fundefs = fundefs
+        self.functions = IdentityDict()
+        self.texts = IdentityDict()
+        for fundef in fundefs.values():
+            self.functions[fundef] = functions[fundef]
+            for label in functions[fundef].labels:
+                self.texts[label] = texts[label]
+        return stream.getvalue()
@@ -13,11 +13,50 @@
 # Primitive Data Types (booleans, strings, integers)
 # Variables (eg. x)
 
+from collections import deque
+from itertools import chain
 from languages.Token import Token
+from translators.tokenizer import word_pattern
 
 
 operators = ["+", "-", "*", "/", "%"]
 
+# Kind of each word, looked up by its first character (used by lex_source)
+first_char_kinds = {
+    " ": "space",
+    "#": "comment",
+    "\n": "newline",
+    "\t": "tab",
+    "\"": "quote", "\'": "quote",
+    ",": "symbol", ":": "symbol", "(": "symbol", ")": "symbol", "=": "symbol",
+    **{operator: "operator" for operator in operators},
+    **{digit: "digit" for digit in "0123456789"},
+}
+
+symbol_tokens = {
+    ",": Token.Comma,
+    ":": Token.Colon,
+    "(": Token.OpenParens,
+    ")": Token.CloseParens,
+    "=": Token.Equals,
+}
+
+keyword_tokens = {
+    "def": Token.Def,
+    "True": Token.Boolean,
+    "False": Token.Boolean,
+}
+
+
+# Params: The number of indents on the new line,
+#         The number of indents on the previous line.
+# Returns: A list of Indent/Dedent tokens.
+# Purpose: Moves the indentation level from the previous line to the new line.
+def match_indents(curr_num_indents, num_indents):
+    if curr_num_indents > num_indents:
+        return [Token.Indent()] * (curr_num_indents - num_indents)
+    return [Token.Dedent()] * (num_indents - curr_num_indents)
+
 
 def match_newline(words, num_indents):
     tokens = [Token.Newline()]
@@ -38,13 +77,8 @@ def match_newline(words, num_indents):
                 break
 
     # Append Indent/Dedent
-    while curr_num_indents != num_indents:
-        if curr_num_indents > num_indents:
-            num_indents += 1
-            tokens.append(Token.Indent())
-        elif curr_num_indents < num_indents:
-            num_indents -= 1
-            tokens.append(Token.Dedent())
+    tokens.extend(match_indents(curr_num_indents, num_indents))
+    num_indents = curr_num_indents
 
     return tokens, words, num_indents
 
@@ -60,22 +94,33 @@ def match_word(words):
 
         # Primitives
         case ["\"", string, "\"", *tail] | ["\'", string, "\'", *tail]: return Token.String(string), tail
-        case [("True" | "False") as boolean, *tail]: return Token.Boolean(boolean), tail
-        case [integer, *tail] if integer.isnumeric(): return Token.Integer(integer), tail
+
+        # Single word
+        case [word, *tail]: return match_single_word(word), tail
+
+
+# Params: A string word that is not part of a string literal.
+# Returns: The Token for the word.
+# Purpose: Labels a single word.
+def match_single_word(word):
+    match word:
+        # Primitives
+        case "True" | "False": return Token.Boolean(word)
+        case integer if integer.isnumeric(): return Token.Integer(integer)
 
         # Reserved words
-        case ["def", *tail]: return Token.Def(), tail
-        case [",", *tail]: return Token.Comma(), tail
-        case [":", *tail]: return Token.Colon(), tail
-        case ["(", *tail]: return Token.OpenParens(), tail
-        case [")", *tail]: return Token.CloseParens(), tail
-        case ["=", *tail]: return Token.Equals(), tail
+        case "def": return Token.Def()
+        case ",": return Token.Comma()
+        case ":": return Token.Colon()
+        case "(": return Token.OpenParens()
+        case ")": return Token.CloseParens()
+        case "=": return Token.Equals()
 
         # Operator
-        case [("+" | "-" | "*" | "/" | "%") as operator, *tail]: return Token.Operator(operator), tail
+        case "+" | "-" | "*" | "/" | "%": return Token.Operator(word)
 
         # Catch-all
-        case [variable, *tail]: return Token.Variable(variable), tail
+        case variable: return Token.Variable(variable)
 
 
 def lex(words):
@@ -94,3 +139,156 @@ def lex(words):
                 tokens.append(new_token)
 
     return tokens
+
+
+# Params: An iterable of string words, such as the output of tokenizer.tokenize_iter.
+# Returns: A generator of Tokens, identical to lex.
+# Purpose: Lazily labels words, tracking the indentation level incrementally.
+def lex_iter(words):
+    words = iter(words)
+    lookahead = deque()  # Words read ahead to match string literals
+    num_indents = 0
+    curr_num_indents = None  # Indents counted since the last newline, None within a line
+
+    while True:
+        word = lookahead.popleft() if lookahead else next(words, None)
+        if word is None:
+            break
+
+        # Count Indent/Dedent at the start of a line
+        if curr_num_indents is not None:
+            match word:
+                case "\n":
+                    curr_num_indents = 0
+                    continue
+                case "\t" | "    ":
+                    curr_num_indents += 1
+                    continue
+                case " ":
+                    raise SyntaxError("Snake syntax cannot have leading spaces in a line")
+
+            yield Token.Newline()
+            yield from match_indents(curr_num_indents, num_indents)
+            num_indents = curr_num_indents
+            curr_num_indents = None
+
+        match word:
+            # Newline
+            case "\n":
+                curr_num_indents = 0
+
+            # Loose tab error
+            case "\t":
+                raise SyntaxError("Cannot have a tab in the middle of a statement")
+
+            # String, if the closing quote follows
+            case "\"" | "\'":
+                while len(lookahead) < 2 and (next_word := next(words, None)) is not None:
+                    lookahead.append(next_word)
+
+                if len(lookahead) == 2 and lookahead[1] == word:
+                    yield Token.String(lookahead.popleft())
+                    lookahead.popleft()
+                else:
+                    yield match_single_word(word)
+
+            case _:
+                yield match_single_word(word)
+
+    # Close the final line
+    if curr_num_indents is not None:
+        yield Token.Newline()
+        yield from match_indents(curr_num_indents, num_indents)
+
+
+# Params: An iterator of word_pattern matches.
+# Returns: A list of up to two matches that are not spaces or comments.
+# Purpose: Reads ahead in the source text to match a string literal.
+def read_ahead(matches):
+    ahead = []
+    for match in matches:
+        word = match.group()
+        kind = first_char_kinds.get(word[0])
+        if kind == "comment" or (kind == "space" and len(word) != 4):
+            continue
+
+        ahead.append(match)
+        if len(ahead) == 2:
+            break
+
+    return ahead
+
+
+# Params: A string of Snake source code.
+# Returns: A generator of Tokens, identical to lex(tokenize(text)).
+# Purpose: Tokenizes and lexes in a single pass, choosing each Token by the first character of its word.
+def lex_source(text):
+    matches = word_pattern.finditer(text)
+    num_indents = 0
+    curr_num_indents = None  # Indents counted since the last newline, None within a line
+
+    while matches is not None:
+        resumed_matches = None
+
+        for match in matches:
+            word = match.group()
+            kind = first_char_kinds.get(word[0], "word")
+
+            # Four spaces are a tab, a single space and a comment are skipped
+            if kind == "space":
+                if len(word) != 4:
+                    continue
+                kind = "tab"
+            elif kind == "comment":
+                continue
+
+            # Count Indent/Dedent at the start of a line
+            if curr_num_indents is not None:
+                if kind == "newline":
+                    curr_num_indents = 0
+                    continue
+                if kind == "tab":
+                    curr_num_indents += 1
+                    continue
+
+                yield Token.Newline()
+                yield from match_indents(curr_num_indents, num_indents)
+                num_indents = curr_num_indents
+                curr_num_indents = None
+
+            if kind == "word":
+                keyword_token = keyword_tokens.get(word)
+                if keyword_token is None:
+                    yield Token.Integer(word) if word.isnumeric() else Token.Variable(word)
+                elif keyword_token is Token.Boolean:
+                    yield Token.Boolean(word)
+                else:
+                    yield keyword_token()
+            elif kind == "symbol":
+                yield symbol_tokens[word]()
+            elif kind == "operator":
+                yield Token.Operator(word)
+            elif kind == "digit":
+                yield Token.Integer(word) if word.isnumeric() else Token.Variable(word)
+            elif kind == "newline":
+                curr_num_indents = 0
+            elif kind == "tab":
+                raise SyntaxError("Cannot have a tab in the middle of a statement")
+
+            # String, if the closing quote follows
+            else:
+                ahead = read_ahead(matches)
+                if len(ahead) == 2 and ahead[1].group() == word:
+                    yield Token.String("\t" if ahead[0].group() == "    " else ahead[0].group())
+                else:
+                    # Label the words read ahead as usual
+                    yield Token.Variable(word)
+                    resumed_matches = chain(ahead, matches)
+                    break
+
+        matches = resumed_matches
+
+    # Close the final line
+    if curr_num_indents is not None:
+        yield Token.Newline()
+        yield from match_indents(curr_num_indents, num_indents)
@@ -3,21 +3,41 @@ This file converts Snake instructions into Normal form instructions.
 """
 
 
+from __future__ import annotations
 from typing import List, Dict, Tuple
 from languages.Snake import Snake
 from languages.Normal import Normal
-from copy import deepcopy
+from utils.Error import Error
 
 
 class Environment:
-    def __init__(self):
+    def __init__(self, parent: None | Environment = None):
+        self.parent = parent  # type: None | Environment
         self.mem_map = {}  # type: Dict[str, Normal.VarMemory]
-        self.mem_counter = 0  # type: int
+        self.mem_counter = 0 if parent is None else parent.mem_counter  # type: int
 
         # Note: mem_counter is necessary (instead of finding size of mem_map), since
         #       in a larger scope a variable can have data stored in a memory slot
         #       that cannot be overwritten in the local scope.
 
+        # Note: Only the variables defined in this scope are stored in mem_map,
+        #       the variables of enclosing scopes are shared through the parent.
+
+    def new_scope(self) -> Environment:
+        """
+        Creates a child scope that sees this scope's variables without copying them.
+
+        Args:
+            Nothing.
+
+        Returns:
+            :return: Environment whose parent is this environment.
+
+        Raises:
+            Nothing.
+        """
+        return Environment(self)
+
     def new_mem(self, var_name: str) -> Normal.VarMemory:
         """
         Generates a new Normal form memory for a variable.
@@ -52,9 +72,12 @@ class Environment:
         Raises:
             Nothing.
         """
-        if var_name not in self.mem_map:
-            return None
-        return self.mem_map[var_name]
+        env = self
+        while env is not None:
+            if var_name in env.mem_map:
+                return env.mem_map[var_name]
+            env = env.parent
+        return None
 
 
 def normalize_variable(variable: str, env: Environment) -> Normal.VarMemory:
@@ -70,6 +93,7 @@ def normalize_variable(variable: str, env: Environment) -> Normal.VarMemory:
 
     Raises:
         SyntaxError for uninitialized input variable
+        InvalidSyntax for a variable of an enclosing function, that is read before this function assigns it
     """
     new_variable = env.get_mem(variable)
 
@@ -77,11 +101,16 @@ def normalize_variable(variable: str, env: Environment) -> Normal.VarMemory:
     if new_variable is None:
         raise SyntaxError("Uninitialized variable \"" + variable + "\" was found.")
 
+    # Error, the variable's memory is in the frame of an enclosing function, which this function cannot read
+    if variable not in env.mem_map:
+        raise Error.InvalidSyntax(variable, "normalize_variable", "A function can only read its own parameters and variables.")
+
     # Find memory associated with the variable name
     return new_variable
 
 
-def normalize_call(name: str, params: List[Snake], env: Environment) -> Tuple[Normal, List[Normal]]:
+def normalize_call(name: str, params: List[Snake], env: Environment, normal_list: List[Normal], base: int = 0,
+                   counts: None | Dict[int, Tuple[int, bool]] = None) -> Normal.Call:
     """
     Transforms a Call instruction from Snake to Normal form.
 
@@ -89,34 +118,92 @@ def normalize_call(name: str, params: List[Snake], env: Environment) -> Tuple[No
         :param name: Str name of the function.
         :param params: List of Snake expressions that are parameters to the function.
         :param env: Environment with the scope's available variable names.
+        :param normal_list: List of Normal form instructions to append the call's setup instructions to.
+        :param base: Int number of the first TempMemory that is free to use (the ones below it are live).
+        :param counts: Dict of the count_temps of the expression's nodes, shared by the whole expression (new if None).
 
     Returns:
         :return: Normal form of the normalized Call instruction.
-        :return: List of Normal form intermediate instructions for setting up the call.
 
     Raises:
         Nothing.
     """
-    new_intermediate_instrs = []
-    new_params = []
+    if counts is None:
+        counts = {}
+
+    new_params = [Normal.ParamMemory(i) for i in range(len(params))]
+
+    # A call in a parameter clobbers the parameter registers, so the parameters before the last one with a call
+    # are kept in TempMemory until it is done, and only then moved into their ParamMemory
+    held = max([0, *(i for i, p in enumerate(params) if count_temps(p, counts)[1])])
 
     # Normalize parameters (can be any expression)
     for i, p in enumerate(params):
-        # TODO: Store old values of the params to be replaced (used in the current function)
-
-        curr_destination = Normal.ParamMemory(i)
-        curr_instrs, _ = normalize_expression([p], env, curr_destination)
+        if i < held:
+            normalize_expression(p, env, Normal.TempMemory(base + i), normal_list, base + i, counts)
+        else:
+            normalize_expression(p, env, new_params[i], normal_list, base + held, counts)
 
-        # Save intermediate instructions and param memory
-        new_intermediate_instrs += curr_instrs
-        new_params += [curr_destination]
+    for i in range(held):
+        normal_list.append(Normal.Assign(new_params[i], Normal.TempMemory(base + i)))
 
     # Create the call
-    new_call = Normal.Call(name, new_params)
-    return new_call, new_intermediate_instrs  # type: ignore
+    return Normal.Call(name, new_params)
+
+
+def count_temps(expression: Snake, counts: None | Dict[int, Tuple[int, bool]] = None) -> Tuple[int, bool]:
+    """
+    Counts the temporary memory needed to normalize an expression (its Sethi-Ullman number).
+
+    Args:
+        :param expression: Snake expression to count the temporary memory of.
+        :param counts: Dict from the id of a Snake node to its count, that counts are reused from and added to if not None.
+
+    Returns:
+        :return: Int number of TempMemory slots needed, including the slot holding the result.
+        :return: Bool whether the expression contains a call.
+
+    Raises:
+        Nothing.
+    """
+    # Note: normalize_expression asks for the count of every subexpression, so counts keeps each one
+    #       after it is first found, instead of counting a subtree again at every level above it.
+    if counts is not None and id(expression) in counts:
+        return counts[id(expression)]
+
+    match expression:
+        # Call (parameters are each normalized into their own ParamMemory, or held in TempMemory before a call)
+        case Snake.Call(_, params):
+            param_counts = [count_temps(p, counts) for p in params]
+            held = max([0, *(i for i, (_, has_call) in enumerate(param_counts) if has_call)])
+            result = max([1, *(min(i, held) + temps for i, (temps, _) in enumerate(param_counts))]), True
+
+        # Binary Operation
+        case Snake.BinaryOp(_, value1, value2):
+            temps1, has_call1 = count_temps(value1, counts)
+            temps2, has_call2 = count_temps(value2, counts)
+
+            # The second value can only be normalized first when it does not reorder calls
+            if temps1 >= temps2 or (has_call1 and has_call2):
+                result = max(temps1, temps2 + 1), has_call1 or has_call2
+            else:
+                result = temps2, has_call1 or has_call2
+
+        # Unary Operation
+        case Snake.UnaryOp(_, value):
+            result = count_temps(value, counts)
+
+        # Primitive or Variable
+        case _:
+            result = 1, False
+
+    if counts is not None:
+        counts[id(expression)] = result
+    return result
 
 
-def normalize_expression(snake_list: List[Snake], env: Environment, destination: Normal) -> Tuple[List[Normal], List[Snake]]:
+def normalize_expression(expression: Snake, env: Environment, destination: Normal, normal_list: List[Normal], base: int = 0,
+                         counts: None | Dict[int, Tuple[int, bool]] = None) -> None:
     """
     Turns a Snake expression into Normal form expressions.
     An expression resolves to a value, while a statement does not resolve to a value.
@@ -124,78 +211,84 @@ def normalize_expression(snake_list: List[Snake], env: Environment, destination:
     (e.g. assignment and function definitions are considered statements).
 
     Args:
-        :param snake_list: List of Snake instructions to normalize.
+        :param expression: Snake expression to normalize.
         :param env: Environment with the scope's available variable names.
         :param destination: Normal Memory where the result of the expression is to be stored.
+        :param normal_list: List of Normal form instructions to append the normalized instructions to.
+        :param base: Int number of the first TempMemory that is free to use (the ones below it are live).
+        :param counts: Dict of the count_temps of the expression's nodes, shared by the whole expression (new if None).
 
     Returns:
-        :return: List of normalized instructions.
-        :return: List of remaining Snake instructions.
+        Nothing.
 
     Raises:
         SyntaxError when matching a statement where an expression is expected.
         SyntaxError when matching an unknown instruction.
     """
-    match snake_list:
+    if counts is None:
+        counts = {}
+
+    match expression:
         # String
-        case [Snake.String(string), *tail]:
-            new_assign = Normal.Assign(destination, Normal.String(string))
-            return [new_assign], tail  # type: ignore
+        case Snake.String(string):
+            normal_list.append(Normal.Assign(destination, Normal.String(string)))
 
         # Boolean
-        case [Snake.Boolean(boolean), *tail]:
+        case Snake.Boolean(boolean):
             # Convert boolean to integer
             new_int = {
                 "False": "0",
                 "True": "1",
             }[boolean]
 
-            new_assign = Normal.Assign(destination, Normal.Integer(new_int))
-            return [new_assign], tail  # type: ignore
+            normal_list.append(Normal.Assign(destination, Normal.Integer(new_int)))
 
         # Integer
-        case [Snake.Integer(integer), *tail]:
-            new_assign = Normal.Assign(destination, Normal.Integer(integer))
-            return [new_assign], tail  # type: ignore
+        case Snake.Integer(integer):
+            normal_list.append(Normal.Assign(destination, Normal.Integer(integer)))
 
         # Variable
-        case [Snake.Variable(variable), *tail]:
+        case Snake.Variable(variable):
             new_variable = normalize_variable(variable, env)
-            new_assign = Normal.Assign(destination, new_variable)
-            return [new_assign], tail  # type: ignore
+            normal_list.append(Normal.Assign(destination, new_variable))
 
         # Call
-        case [Snake.Call(name, params), *tail]:
-            new_call, new_intermediate_instrs = normalize_call(name, params, env)
-            new_assign = Normal.Assign(destination, new_call)
-            return [*new_intermediate_instrs, new_assign], tail
+        case Snake.Call(name, params):
+            new_call = normalize_call(name, params, env, normal_list, base, counts)
+            normal_list.append(Normal.Assign(destination, new_call))
 
         # Binary Operation
-        case [Snake.BinaryOp(op, value1, value2), *tail]:
-            curr_destination1 = Normal.TempMemory(0)
-            curr_destination2 = Normal.TempMemory(1)
-
-            # Normalize values
-            new_intermediate_instrs1, _ = normalize_expression([value1], env, curr_destination1)
-            new_intermediate_instrs2, _ = normalize_expression([value2], env, curr_destination2)
+        case Snake.BinaryOp(op, value1, value2):
+            temps1, has_call1 = count_temps(value1, counts)
+            temps2, has_call2 = count_temps(value2, counts)
+
+            # Normalize values, the one needing more temporary memory first (unless that reorders calls)
+            if temps1 >= temps2 or (has_call1 and has_call2):
+                curr_destination1 = Normal.TempMemory(base)
+                curr_destination2 = Normal.TempMemory(base + 1)
+                normalize_expression(value1, env, curr_destination1, normal_list, base, counts)
+                normalize_expression(value2, env, curr_destination2, normal_list, base + 1, counts)
+            else:
+                curr_destination2 = Normal.TempMemory(base)
+                curr_destination1 = Normal.TempMemory(base + 1)
+                normalize_expression(value2, env, curr_destination2, normal_list, base, counts)
+                normalize_expression(value1, env, curr_destination1, normal_list, base + 1, counts)
 
             # Assign the binary operation to the destination
-            new_assign = Normal.Assign(destination, Normal.BinaryOp(op, curr_destination1, curr_destination2))
-            return [*new_intermediate_instrs1, *new_intermediate_instrs2, new_assign], tail
+            normal_list.append(Normal.Assign(destination, Normal.BinaryOp(op, curr_destination1, curr_destination2)))
 
         # Unary Operation
-        case [Snake.UnaryOp(op, value), *tail]:
-            curr_destination = Normal.TempMemory(0)
+        case Snake.UnaryOp(op, value):
+            curr_destination = Normal.TempMemory(base)
 
             # Normalize value
-            new_intermediate_instrs, _ = normalize_expression([value], env, curr_destination)
+            normalize_expression(value, env, curr_destination, normal_list, base, counts)
 
             # Assign the unary operation to the destination
-            new_assign = Normal.Assign(destination, Normal.UnaryOp(op, curr_destination))
-            return [*new_intermediate_instrs, new_assign], tail
+            normal_list.append(Normal.Assign(destination, Normal.UnaryOp(op, curr_destination)))
 
         # Statement
-        case [_, *tail]:
+        case Snake.FunDef() | Snake.Assign():
             raise SyntaxError("Found a statement where there can only be expressions.")
 
         # Error
@@ -203,7 +296,7 @@ def normalize_expression(snake_list: List[Snake], env: Environment, destination:
             raise SyntaxError("Found an unknown instruction where a Normal form expression is expected.")
 
 
-def normalize_statement(snake_list: List[Snake], env: Environment) -> Tuple[List[Normal], List[Snake], Environment]:
+def normalize_statement(statement: Snake, env: Environment, normal_list: List[Normal]) -> None:
     """
     Turns a Snake statement into a Normal form statement.
     An expression resolves to a value, while a statement does not resolve to a value.
@@ -211,23 +304,21 @@ def normalize_statement(snake_list: List[Snake], env: Environment) -> Tuple[List
     (e.g. assignment and function definitions are considered statements).
 
     Args:
-        :param snake_list: List of Snake instructions to normalize.
-        :param env: Environment with the scope's available variable names.
+        :param statement: Snake statement to normalize.
+        :param env: Environment with the scope's available variable names, updated in place.
+        :param normal_list: List of Normal form instructions to append the normalized instructions to.
 
     Returns:
-        :return: List of normalized instructions.
-        :return: List of remaining Snake instructions.
-        :return: List of str variable names that are stored in the current environment.
+        Nothing.
 
     Raises:
         SyntaxError if a non-variable is found in the parameters of a function definition.
-        SyntaxError when matching an unknown expression.
+        SyntaxError when matching an unknown instruction.
     """
-    match snake_list:
+    match statement:
         # Function Definition
-        case [Snake.FunDef(name, params, inner_instrs), *tail]:
-            inner_env = deepcopy(env)
-            new_intermediate_instrs = []
+        case Snake.FunDef(name, params, inner_instrs):
+            inner_env = env.new_scope()
             new_inner_instrs = []
             new_params = []
 
@@ -239,17 +330,17 @@ def normalize_statement(snake_list: List[Snake], env: Environment) -> Tuple[List
 
                         # Normalize param
                         new_param = Normal.ParamMemory(i)
-                        new_params += [new_param]
+                        new_params.append(new_param)
 
                         # Update inner environment with new variable
                         new_variable = inner_env.new_mem(variable)
 
                         # Move param into persistent memory
-                        new_assign = Normal.Assign(new_variable, new_param)
-                        new_intermediate_instrs += [new_assign]
+                        new_inner_instrs.append(Normal.Assign(new_variable, new_param))
 
                     # Non-variable Error
-                    case other if isinstance(other, Snake):
+                    case (Snake.String() | Snake.Boolean() | Snake.Integer() | Snake.Call()
+                          | Snake.BinaryOp() | Snake.UnaryOp() | Snake.FunDef() | Snake.Assign()):
                         raise SyntaxError("Non-variable in function definition.")
 
                     # Error
@@ -257,47 +348,49 @@ def normalize_statement(snake_list: List[Snake], env: Environment) -> Tuple[List
                         raise SyntaxError("Found an unknown instruction where a Normal form variable parameter is expected.")
 
             # Normalize inner scope
-            new_inner_instrs = normalize_all(inner_instrs, inner_env)
+            normalize_all(inner_instrs, inner_env, new_inner_instrs)
 
             # Normalize function definition
-            new_fundef = Normal.FunDef(name, new_params, [*new_intermediate_instrs, *new_inner_instrs])
-            return [new_fundef], tail, env  # type: ignore
+            normal_list.append(Normal.FunDef(name, new_params, new_inner_instrs))
 
         # Assign
-        case [Snake.Assign(Snake.Variable(variable), value), *tail]:
-            new_env = deepcopy(env)
-
+        case Snake.Assign(Snake.Variable(variable), value):
             # Get memory location for assign
-            curr_destination = new_env.get_mem(variable)
+            curr_destination = env.get_mem(variable)
             if curr_destination is None:
-                curr_destination = new_env.new_mem(variable)
+                curr_destination = env.new_mem(variable)
 
             # Normalize left-hand side of the assign (expression normalization already does assignment)
-            new_instrs, _ = normalize_expression([value], new_env, curr_destination)
+            normalize_expression(value, env, curr_destination, normal_list)
 
-            return new_instrs, tail, new_env
+            # A variable of an enclosing scope that is assigned here can be read here from now on
+            env.mem_map[variable] = curr_destination
 
         # Call, as a statement
-        case [Snake.Call(name, params), *tail]:
-            new_call, new_intermediate_instrs = normalize_call(name, params, env)
-            return [*new_intermediate_instrs, new_call], tail, env
+        case Snake.Call(name, params):
+            normal_list.append(normalize_call(name, params, env, normal_list))
+
+        # Expression (only its calls have an effect, so the value is left in TempMemory for dead code elimination)
+        case Snake.BinaryOp() | Snake.UnaryOp() if count_temps(statement)[1]:
+            normalize_expression(statement, env, Normal.TempMemory(0), normal_list)
 
-        # Expression
-        case [_, *tail]:
-            return [], tail, env
+        # Expression, without calls
+        case Snake.String() | Snake.Boolean() | Snake.Integer() | Snake.Variable() | Snake.BinaryOp() | Snake.UnaryOp():
+            pass
 
         # Error
         case _:
             raise SyntaxError("Found an unknown instruction where a Normal form statement is expected.")
 
 
-def normalize_all(snake_list: List[Snake], env: Environment) -> List[Normal]:
+def normalize_all(snake_list: List[Snake], env: Environment, normal_list: None | List[Normal] = None) -> List[Normal]:
     """
     Helper function that normalizes Snake instructions into Normal form instructions.
 
     Args:
         :param snake_list: List of Snake instructions to normalize.
         :param env: Environment with the scope's available variable names.
+        :param normal_list: List of Normal form instructions to append to, a new list if None.
 
     Returns:
         :return: List of normalized instructions.
@@ -305,11 +398,11 @@ def normalize_all(snake_list: List[Snake], env: Environment) -> List[Normal]:
     Raises:
         Nothing.
     """
-    normal_list = []
+    if normal_list is None:
+        normal_list = []
 
-    while snake_list:
-        new_instrs, snake_list, env = normalize_statement(snake_list, env)
-        normal_list += new_instrs
+    for statement in snake_list:
+        normalize_statement(statement, env, normal_list)
 
     return normal_list
 
@@ -0,0 +1,763 @@
+"""
+This file optimizes Snake and Normal form instructions before they are assembled.
+"""
+
+
+from itertools import count
+from typing import List, Dict, Set, Tuple, Callable, Hashable
+from languages.Snake import Snake
+from languages.Normal import Normal
+from translators.register_allocator import read_memories, written_memories, is_call
+
+
+# Integers are 64-bit two's complement in the assembled program
+word_bits = 64
+
+
+def wrap(value: int) -> int:
+    """
+    Wraps an integer to the signed 64-bit range, as the assembled arithmetic does.
+    """
+    value &= (1 << word_bits) - 1
+    return value - (1 << word_bits) if value >> (word_bits - 1) else value
+
+
+def evaluate_binary_op(op: str, value1: int, value2: int) -> None | int:
+    """
+    Evaluates a binary operation the way the assembled program does (division truncates toward zero).
+
+    Args:
+        :param op: Str Snake binary operator.
+        :param value1: Int left value.
+        :param value2: Int right value.
+
+    Returns:
+        :return: Int result, or None when the operation must be left to run time (it traps).
+
+    Raises:
+        Nothing.
+    """
+    match op:
+        case "+":
+            return wrap(value1 + value2)
+        case "-":
+            return wrap(value1 - value2)
+        case "*":
+            return wrap(value1 * value2)
+        case "/" | "%":
+            # Division by zero and the overflowing division trap at run time, so they are not folded
+            if value2 == 0 or (value1 == -2 ** (word_bits - 1) and value2 == -1):
+                return None
+
+            quotient = abs(value1) // abs(value2)
+            if (value1 < 0) != (value2 < 0):
+                quotient = -quotient
+            return quotient if op == "/" else value1 - quotient * value2
+        case _:
+            return None
+
+
+def evaluate_unary_op(op: str, value: int) -> None | int:
+    """
+    Evaluates a unary operation the way the assembled program does.
+
+    Args:
+        :param op: Str Snake unary operator.
+        :param value: Int value.
+
+    Returns:
+        :return: Int result, or None for an unknown operator.
+
+    Raises:
+        Nothing.
+    """
+    match op:
+        case "+":
+            return value
+        case "-":
+            return wrap(-value)
+        case _:
+            return None
+
+
+def snake_constant(expression: Snake) -> None | int:
+    """
+    Finds the integer value of a Snake literal (booleans are the integers 0 and 1).
+    """
+    match expression:
+        case Snake.Integer(integer):
+            return wrap(int(integer))
+        case Snake.Boolean(boolean):
+            return {"False": 0, "True": 1}[boolean]
+        case _:
+            return None
+
+
+def fold_expression(expression: Snake) -> Snake:
+    """
+    Evaluates the operations of a Snake expression whose values are all literals.
+
+    Args:
+        :param expression: Snake expression to fold.
+
+    Returns:
+        :return: Snake expression, with folded operations replaced by Integer literals.
+
+    Raises:
+        Nothing.
+    """
+    match expression:
+        case Snake.Call(name, params):
+            return Snake.Call(name, [fold_expression(p) for p in params])
+
+        case Snake.BinaryOp(op, value1, value2):
+            new_value1 = fold_expression(value1)
+            new_value2 = fold_expression(value2)
+            constant1 = snake_constant(new_value1)
+            constant2 = snake_constant(new_value2)
+
+            if constant1 is not None and constant2 is not None:
+                result = evaluate_binary_op(op, constant1, constant2)
+                if result is not None:
+                    return Snake.Integer(str(result))
+            return Snake.BinaryOp(op, new_value1, new_value2)
+
+        case Snake.UnaryOp(op, value):
+            new_value = fold_expression(value)
+            constant = snake_constant(new_value)
+
+            if constant is not None:
+                result = evaluate_unary_op(op, constant)
+                if result is not None:
+                    return Snake.Integer(str(result))
+            return Snake.UnaryOp(op, new_value)
+
+        case _:
+            return expression
+
+
+def fold_constants(snake_list: List[Snake]) -> List[Snake]:
+    """
+    Evaluates the binary and unary operations over Integer and Boolean literals at compile time.
+    (e.g. "x = 1 + 2 * 3" becomes "x = 7").
+
+    Args:
+        :param snake_list: List of Snake instructions to fold.
+
+    Returns:
+        :return: List of folded Snake instructions.
+
+    Raises:
+        Nothing.
+    """
+    new_list = []
+
+    for statement in snake_list:
+        match statement:
+            case Snake.FunDef(name, params, inner_instrs):
+                new_list.append(Snake.FunDef(name, params, fold_constants(inner_instrs)))
+            case Snake.Assign(variable, value):
+                new_list.append(Snake.Assign(variable, fold_expression(value)))
+            case _:
+                new_list.append(fold_expression(statement))
+
+    return new_list
+
+
+def normal_constant(memory: Normal) -> None | int:
+    """
+    Finds the integer value of a Normal form literal (booleans are the integers 0 and 1).
+    """
+    match memory:
+        case Normal.Integer(integer):
+            return wrap(int(integer))
+        case Normal.Boolean(boolean):
+            return {"False": 0, "True": 1}[boolean]
+        case _:
+            return None
+
+
+def propagate_constants(normal_list: List[Normal]) -> List[Normal]:
+    """
+    Replaces reads of variables, temporaries and parameters holding a known constant with the constant,
+    and evaluates the operations whose values are then all constants.
+    Function bodies are straight-line code, so a constant is known until its memory is written again.
+    (Parameter memory is a register that calls clobber, and so do multiplication and division for %rdx,
+    so the constants of parameters are forgotten at those).
+
+    Args:
+        :param normal_list: List of Normal form instructions in a function body.
+
+    Returns:
+        :return: List of Normal form instructions with constants propagated.
+
+    Raises:
+        Nothing.
+    """
+    known = {}  # type: Dict[Normal, Normal.Integer]
+
+    def read(memory):
+        return known.get(memory, memory)
+
+    def forget_params():
+        for memory in [memory for memory in known if isinstance(memory, Normal.ParamMemory)]:
+            del known[memory]
+
+    new_list = []
+    for instr in normal_list:
+        match instr:
+            case Normal.FunDef(name, params, inner_instrs):
+                new_list.append(Normal.FunDef(name, params, propagate_constants(inner_instrs)))
+
+            case Normal.Assign(destination, source):
+                match source:
+                    case Normal.Call():
+                        new_source = source
+                        forget_params()
+
+                    case Normal.BinaryOp(op, memory1, memory2):
+                        new_source = Normal.BinaryOp(op, read(memory1), read(memory2))
+                        constant1 = normal_constant(new_source.memory1)
+                        constant2 = normal_constant(new_source.memory2)
+                        if constant1 is not None and constant2 is not None:
+                            result = evaluate_binary_op(op, constant1, constant2)
+                            if result is not None:
+                                new_source = Normal.Integer(str(result))
+                        if isinstance(new_source, Normal.BinaryOp) and op in ("*", "/", "%"):
+                            forget_params()
+
+                    case Normal.UnaryOp(op, memory):
+                        new_source = Normal.UnaryOp(op, read(memory))
+                        constant = normal_constant(new_source.memory)
+                        if constant is not None:
+                            result = evaluate_unary_op(op, constant)
+                            if result is not None:
+                                new_source = Normal.Integer(str(result))
+
+                    case _:
+                        new_source = read(source)
+
+                if isinstance(destination, (Normal.VarMemory, Normal.TempMemory, Normal.ParamMemory)):
+                    if isinstance(new_source, (Normal.Integer, Normal.Boolean)):
+                        known[destination] = Normal.Integer(str(normal_constant(new_source)))
+                    else:
+                        known.pop(destination, None)
+
+                new_list.append(Normal.Assign(destination, new_source))
+
+            case Normal.Call():
+                new_list.append(instr)
+                forget_params()
+
+            case _:
+                new_list.append(instr)
+
+    return new_list
+
+
+def is_copy(instr: Normal) -> bool:
+    """
+    Checks whether an instruction moves one memory into a variable or temporary.
+    """
+    return (isinstance(instr, Normal.Assign)
+            and isinstance(instr.destination, (Normal.VarMemory, Normal.TempMemory))
+            and isinstance(instr.source, (Normal.VarMemory, Normal.TempMemory, Normal.ParamMemory, Normal.ReturnMemory)))
+
+
+def live_after(normal_list: List[Normal]) -> List[Set[Normal]]:
+    """
+    Computes the memory that is read later on (live) after each instruction of a straight-line function body.
+
+    Args:
+        :param normal_list: List of Normal form instructions in a function body.
+
+    Returns:
+        :return: List of the sets of live Normal form memory, one per instruction.
+
+    Raises:
+        Nothing.
+    """
+    live = set()
+    live_list = []
+
+    for instr in reversed(normal_list):
+        live_list.append(set(live))
+        live.difference_update(written_memories(instr))
+        live.update(read_memories(instr))
+
+    live_list.reverse()
+    return live_list
+
+
+def propagate_copies(normal_list: List[Normal], stats: None | Dict[str, int] = None, name: str = "main") -> List[Normal]:
+    """
+    Replaces reads of a copied memory with the memory it was copied from, while neither is written,
+    then removes the copies that are no longer read and coalesces a temporary that is only copied into another memory.
+    (e.g. "T0 = x \n y = T0 + 1" becomes "y = x + 1").
+    (e.g. "T0 = a * b \n P0 = T0" becomes "P0 = a * b").
+
+    Args:
+        :param normal_list: List of Normal form instructions in a function body.
+        :param stats: Dict from function name to the number of instructions eliminated, updated if not None.
+        :param name: Str name of the function, for stats.
+
+    Returns:
+        :return: List of Normal form instructions with copies propagated.
+
+    Raises:
+        Nothing.
+    """
+    copies = {}  # type: Dict[Normal, Normal]
+    eliminated = 0
+
+    def read(memory):
+        return copies.get(memory, memory)
+
+    def kill(memory):
+        for key, value in list(copies.items()):
+            if key == memory or value == memory:
+                del copies[key]
+
+    def kill_registers():
+        # Parameter and return memory are registers that calls, multiplication and division clobber
+        for key, value in list(copies.items()):
+            if isinstance(value, (Normal.ParamMemory, Normal.ReturnMemory)):
+                del copies[key]
+
+    # Forward pass, propagating copies
+    forward_list = []
+    for instr in normal_list:
+        match instr:
+            case Normal.FunDef(inner_name, params, inner_instrs):
+                forward_list.append(Normal.FunDef(inner_name, params, propagate_copies(inner_instrs, stats, inner_name)))
+
+            case Normal.Call():
+                forward_list.append(instr)
+                kill_registers()
+
+            case Normal.Assign(destination, source):
+                match source:
+                    case Normal.Call():
+                        new_source = source
+                        kill_registers()
+                    case Normal.BinaryOp(op, memory1, memory2):
+                        new_source = Normal.BinaryOp(op, read(memory1), read(memory2))
+                        if op in ("*", "/", "%"):
+                            kill_registers()
+                    case Normal.UnaryOp(op, memory):
+                        new_source = Normal.UnaryOp(op, read(memory))
+                    case _:
+                        new_source = read(source)
+
+                # A move into the memory it reads from does nothing
+                if new_source == destination:
+                    eliminated += 1
+                    continue
+
+                kill(destination)
+                new_instr = Normal.Assign(destination, new_source)
+                if is_copy(new_instr):
+                    copies[destination] = new_source
+                forward_list.append(new_instr)
+
+            case _:
+                forward_list.append(instr)
+
+    # Second pass, removing dead copies and coalescing temporaries
+    live_list = live_after(forward_list)
+    new_list = []
+    i = 0
+    while i < len(forward_list):
+        instr = forward_list[i]
+
+        if is_copy(instr) and instr.destination not in live_list[i]:
+            eliminated += 1
+            i += 1
+            continue
+
+        if i + 1 < len(forward_list) and isinstance(instr, Normal.Assign) and isinstance(instr.destination, Normal.TempMemory):
+            next_instr = forward_list[i + 1]
+            if (isinstance(next_instr, Normal.Assign) and next_instr.source == instr.destination
+                    and instr.destination not in live_list[i + 1]
+                    and (not is_copy(next_instr) or next_instr.destination in live_list[i + 1])):
+                new_list.append(Normal.Assign(next_instr.destination, instr.source))
+                eliminated += 1
+                i += 2
+                continue
+
+        new_list.append(instr)
+        i += 1
+
+    if stats is not None:
+        stats[name] = stats.get(name, 0) + eliminated
+    return new_list
+
+
+def number_values(normal_list: List[Normal], stats: None | Dict[str, int] = None, name: str = "main") -> List[Normal]:
+    """
+    Local value numbering: numbers the values held by variables and temporaries, hashes each operation by its
+    operator and the numbers of its values, and replaces an operation that was already computed with a move
+    from the memory holding the first result, if that memory still holds it.
+    (e.g. in "x * y + x * y", the second "x * y" becomes a move from the memory holding the first).
+    A function body is straight-line code, so it is a single basic block.
+
+    Args:
+        :param normal_list: List of Normal form instructions in a function body.
+        :param stats: Dict from function name to the number of operations replaced, updated if not None.
+        :param name: Str name of the function, for stats.
+
+    Returns:
+        :return: List of Normal form instructions without repeated operations.
+
+    Raises:
+        Nothing.
+    """
+    numbers = {}  # type: Dict[Normal, Hashable]
+    computed = {}  # type: Dict[Hashable, Normal]
+    fresh = count()
+    replaced = 0
+
+    def number(memory):
+        constant = normal_constant(memory)
+        if constant is not None:
+            return "constant", constant
+
+        # Parameter and return memory are registers that calls clobber, so each read is a new value
+        if not isinstance(memory, (Normal.VarMemory, Normal.TempMemory)):
+            return next(fresh)
+        if memory not in numbers:
+            numbers[memory] = next(fresh)
+        return numbers[memory]
+
+    new_list = []
+    for instr in normal_list:
+        match instr:
+            case Normal.FunDef(inner_name, params, inner_instrs):
+                instr = Normal.FunDef(inner_name, params, number_values(inner_instrs, stats, inner_name))
+
+            case Normal.Assign(destination, source):
+                match source:
+                    case Normal.BinaryOp(op, memory1, memory2):
+                        operands = [number(memory1), number(memory2)]
+                        if op in ("+", "*"):
+                            operands.sort(key=repr)
+                        value = (op, *operands)
+                    case Normal.UnaryOp(op, memory):
+                        value = (op, number(memory))
+                    case Normal.Call():
+                        value = next(fresh)
+                    case _:
+                        value = number(source)
+
+                # Reuse the first result of an operation, while its memory still holds it
+                holder = computed.get(value)
+                if holder is not None and numbers.get(holder) == value and isinstance(source, (Normal.BinaryOp, Normal.UnaryOp)):
+                    instr = Normal.Assign(destination, holder)
+                    replaced += 1
+
+                if isinstance(destination, (Normal.VarMemory, Normal.TempMemory)):
+                    numbers[destination] = value
+                    if computed.get(value) is None or numbers.get(computed[value]) != value:
+                        computed[value] = destination
+
+        new_list.append(instr)
+
+    if stats is not None:
+        stats[name] = stats.get(name, 0) + replaced
+    return new_list
+
+
+def has_effect(source: Normal) -> bool:
+    """
+    Checks whether computing a Normal form source can do more than produce its value.
+    (Calls have side effects, and division traps for a divisor of 0, or -1 with the lowest dividend).
+    """
+    match source:
+        case Normal.Call():
+            return True
+        case Normal.BinaryOp("/" | "%", _, memory2):
+            return normal_constant(memory2) in (None, 0, -1)
+        case _:
+            return False
+
+
+def eliminate_dead_code(normal_list: List[Normal], stats: None | Dict[str, int] = None, name: str = "main") -> List[Normal]:
+    """
+    Removes the assignments to variables and temporaries that are never read afterwards, until none are left.
+    The call of a dead assignment is kept as a call statement, and so is a division that may trap.
+
+    Args:
+        :param normal_list: List of Normal form instructions in a function body.
+        :param stats: Dict from function name to the number of instructions eliminated, updated if not None.
+        :param name: Str name of the function, for stats.
+
+    Returns:
+        :return: List of Normal form instructions without dead assignments.
+
+    Raises:
+        Nothing.
+    """
+    new_list = []
+    for instr in normal_list:
+        match instr:
+            case Normal.FunDef(inner_name, params, inner_instrs):
+                new_list.append(Normal.FunDef(inner_name, params, eliminate_dead_code(inner_instrs, stats, inner_name)))
+            case _:
+                new_list.append(instr)
+
+    eliminated = 0
+    changed = True
+    while changed:
+        changed = False
+        live_list = live_after(new_list)
+
+        old_list = new_list
+        new_list = []
+        for instr, live in zip(old_list, live_list):
+            if (isinstance(instr, Normal.Assign) and isinstance(instr.destination, (Normal.VarMemory, Normal.TempMemory))
+                    and instr.destination not in live):
+                match instr.source:
+                    case Normal.Call():
+                        new_list.append(instr.source)
+                        changed = True
+                        continue
+                    case source if not has_effect(source):
+                        eliminated += 1
+                        changed = True
+                        continue
+
+            new_list.append(instr)
+
+    if stats is not None:
+        stats[name] = stats.get(name, 0) + eliminated
+    return new_list
+
+
+# Functions with at most this many instructions are inlined at every call, larger ones only at their single call
+inline_size_limit = 8
+
+
+def count_calls(normal_list: List[Normal], counts: Dict[str, int]) -> Dict[str, int]:
+    """
+    Counts the calls to each function, in a program and its function bodies.
+    """
+    for instr in normal_list:
+        match instr:
+            case Normal.FunDef(_, _, inner_instrs):
+                count_calls(inner_instrs, counts)
+            case Normal.Call(name, _) | Normal.Assign(_, Normal.Call(name, _)):
+                counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def find_functions(normal_list: List[Normal], functions: Dict[str, List[Normal.FunDef]]) -> Dict[str, List[Normal.FunDef]]:
+    """
+    Finds the function definitions of a program, including those nested in function bodies (all become labels).
+    """
+    for instr in normal_list:
+        if isinstance(instr, Normal.FunDef):
+            functions.setdefault(instr.name, []).append(instr)
+            find_functions(instr.inner_instrs, functions)
+    return functions
+
+
+def rename_memory(memory: Normal, var_base: int, temp_base: int) -> Normal:
+    match memory:
+        case Normal.VarMemory(number):
+            return Normal.VarMemory(var_base + number)
+        case Normal.TempMemory(number):
+            return Normal.TempMemory(temp_base + number)
+        case _:
+            return memory
+
+
+def rename_instruction(instr: Normal, var_base: int, temp_base: int) -> Normal:
+    """
+    Moves the variables and temporaries of an instruction above the ones of the body it is inlined into.
+    """
+    match instr:
+        case Normal.Call(name, params):
+            return Normal.Call(name, [rename_memory(p, var_base, temp_base) for p in params])
+        case Normal.Assign(destination, source):
+            match source:
+                case Normal.Call():
+                    new_source = rename_instruction(source, var_base, temp_base)
+                case Normal.BinaryOp(op, memory1, memory2):
+                    new_source = Normal.BinaryOp(op, rename_memory(memory1, var_base, temp_base), rename_memory(memory2, var_base, temp_base))
+                case Normal.UnaryOp(op, memory):
+                    new_source = Normal.UnaryOp(op, rename_memory(memory, var_base, temp_base))
+                case _:
+                    new_source = rename_memory(source, var_base, temp_base)
+            return Normal.Assign(rename_memory(destination, var_base, temp_base), new_source)
+        case _:
+            return instr
+
+
+def next_memory_numbers(normal_list: List[Normal]) -> Tuple[int, int]:
+    """
+    Finds the first VarMemory and TempMemory numbers that are not used in a function body (not counting nested ones).
+    """
+    var_base = temp_base = 0
+    for instr in normal_list:
+        for memory in [*read_memories(instr), *written_memories(instr)]:
+            match memory:
+                case Normal.VarMemory(number):
+                    var_base = max(var_base, number + 1)
+                case Normal.TempMemory(number):
+                    temp_base = max(temp_base, number + 1)
+    return var_base, temp_base
+
+
+def bind_arguments(new_list: List[Normal], params: List[Normal], var_base: int) -> Dict[Normal, Normal]:
+    """
+    Binds the parameters of an inlined call to new variables, from var_base up.
+    The arguments written to the parameters since the last call are written to the variables instead,
+    and a parameter without one is copied to its variable.
+    """
+    bound = {param: Normal.VarMemory(var_base + i) for i, param in enumerate(params)}
+    unbound = set(bound)
+    i = len(new_list) - 1
+    while unbound and i >= 0:
+        match new_list[i]:
+            case instr if is_call(instr) or isinstance(instr, Normal.FunDef):
+                break
+            case Normal.Assign(destination, source) if destination in unbound:
+                new_list[i] = Normal.Assign(bound[destination], source)
+                unbound.remove(destination)
+        i -= 1
+    new_list.extend(Normal.Assign(bound[param], param) for param in params if param in unbound)
+    return bound
+
+
+def bind_params(instr: Normal, bound: Dict[Normal, Normal]) -> Normal:
+    """
+    Replaces the reads of parameters in an inlined instruction with the variables they are bound to.
+    """
+    def bind(memory: Normal) -> Normal:
+        return bound.get(memory, memory)
+
+    match instr:
+        case Normal.Call(name, params):
+            return Normal.Call(name, [bind(p) for p in params])
+        case Normal.Assign(destination, source):
+            match source:
+                case Normal.Call():
+                    new_source = bind_params(source, bound)
+                case Normal.BinaryOp(op, memory1, memory2):
+                    new_source = Normal.BinaryOp(op, bind(memory1), bind(memory2))
+                case Normal.UnaryOp(op, memory):
+                    new_source = Normal.UnaryOp(op, bind(memory))
+                case _:
+                    new_source = bind(source)
+            return Normal.Assign(destination, new_source)
+        case _:
+            return instr
+
+
+def inline_calls(normal_list: List[Normal], inlinable: Dict[str, Normal.FunDef], name: str, stats: None | Dict[str, int]) -> List[Normal]:
+    """
+    Replaces the call statements of a function body with the bodies of the functions they call.
+    The arguments are bound to new variables which the inlined body reads in place of its parameters,
+    so later passes can propagate them, and its variables and temporaries are renamed above the ones of the body.
+    """
+    var_base, temp_base = next_memory_numbers(normal_list)
+
+    new_list = []
+    for instr in normal_list:
+        match instr:
+            case Normal.FunDef(inner_name, params, inner_instrs):
+                new_list.append(Normal.FunDef(inner_name, params, inline_calls(inner_instrs, inlinable, inner_name, stats)))
+
+            # A function is not inlined into itself, and the inlined body is not inlined into again
+            case Normal.Call(callee, params) if callee in inlinable and callee != name:
+                inner_instrs = inlinable[callee].inner_instrs
+                inner_var_base, inner_temp_base = next_memory_numbers(inner_instrs)
+                bound = bind_arguments(new_list, params, var_base + inner_var_base)
+
+                for inner_instr in inner_instrs:
+                    new_list.append(bind_params(rename_instruction(inner_instr, var_base, temp_base), bound))
+                    # A parameter the body writes, or a call clobbers, no longer holds the argument
+                    if is_call(inner_instr):
+                        bound = {}
+                    for memory in written_memories(inner_instr):
+                        bound.pop(memory, None)
+
+                var_base += inner_var_base + len(params)
+                temp_base += inner_temp_base
+                if stats is not None:
+                    stats[callee] = stats.get(callee, 0) + 1
+
+            case _:
+                new_list.append(instr)
+
+    return new_list
+
+
+def remove_functions(normal_list: List[Normal], names: Set[str]) -> List[Normal]:
+    return [
+        Normal.FunDef(instr.name, instr.params, remove_functions(instr.inner_instrs, names))
+        if isinstance(instr, Normal.FunDef) else instr
+        for instr in normal_list
+        if not (isinstance(instr, Normal.FunDef) and instr.name in names)
+    ]
+
+
+def inline_functions(normal_list: List[Normal], stats: None | Dict[str, int] = None) -> List[Normal]:
+    """
+    Inlines the call statements of small functions, and of functions that are only called once.
+    A function is inlined if it is defined once, does not define functions and does not call itself,
+    and its definition is removed if no calls to it are left.
+    (A call used as an expression is kept, since functions do not return values).
+
+    Args:
+        :param normal_list: List of Normal form instructions of a program.
+        :param stats: Dict from function name to the number of calls inlined, updated if not None.
+
+    Returns:
+        :return: List of Normal form instructions with calls inlined.
+
+    Raises:
+        Nothing.
+    """
+    calls = count_calls(normal_list, {})
+    inlinable = {}
+    for name, definitions in find_functions(normal_list, {}).items():
+        inner_instrs = definitions[0].inner_instrs
+        if (len(definitions) == 1
+                and not any(isinstance(instr, Normal.FunDef) for instr in inner_instrs)
+                and name not in count_calls(inner_instrs, {})
+                and (len(inner_instrs) <= inline_size_limit or calls.get(name, 0) == 1)):
+            inlinable[name] = definitions[0]
+
+    new_list = inline_calls(normal_list, inlinable, "main", stats)
+
+    remaining_calls = count_calls(new_list, {})
+    return remove_functions(new_list, {name for name in inlinable if name not in remaining_calls and name in calls})
+
+
+# Normal form passes, in the order they are run by optimize
+normal_passes = [
+    inline_functions,
+    propagate_constants,
+    number_values,
+    propagate_copies,
+    eliminate_dead_code,
+]  # type: List[Callable[[List[Normal]], List[Normal]]]
+
+
+def optimize(normal_list: List[Normal]) -> List[Normal]:
+    """
+    Runs the Normal form optimization passes over a program.
+
+    Args:
+        :param normal_list: List of Normal form instructions to optimize.
+
+    Returns:
+        :return: List of optimized Normal form instructions.
+
+    Raises:
+        Nothing.
+    """
+    for normal_pass in normal_passes:
+        normal_list = normal_pass(normal_list)
+    return normal_list
@@ -0,0 +1,300 @@
+"""
+This file parses a stream of Tokens into Snake instructions.
+"""
+
+
+from typing import List, Tuple
+from languages.Token import Token
+from languages.Snake import Snake
+from utils.Error import Error
+
+
+# Binding power of each infix operator, higher binds tighter
+binary_precedence = {
+    "+": 10,
+    "-": 10,
+    "*": 20,
+    "/": 20,
+    "%": 20,
+}
+unary_precedence = 30
+
+assert set(binary_precedence) == set(Snake.binary_operators)
+
+
+def peek(tokens: List[Token], i: int) -> None | Token:
+    """
+    Finds the token at an index, without failing at the end of the stream.
+
+    Args:
+        :param tokens: List of Tokens being parsed.
+        :param i: Int index of the token.
+
+    Returns:
+        :return: The Token at the index if there is one,
+                 None otherwise.
+
+    Raises:
+        Nothing.
+    """
+    return tokens[i] if i < len(tokens) else None
+
+
+def expect(tokens: List[Token], i: int, expected: Token, function_name: str) -> int:
+    """
+    Consumes a reserved token that must come next.
+
+    Args:
+        :param tokens: List of Tokens being parsed.
+        :param i: Int index of the expected token.
+        :param expected: Token that must be at the index.
+        :param function_name: Str name of the parsing function, for the error message.
+
+    Returns:
+        :return: Int index after the expected token.
+
+    Raises:
+        InvalidSyntax if the token at the index is not the expected one.
+    """
+    token = peek(tokens, i)
+    if token != expected:
+        raise Error.InvalidSyntax(token, function_name, f"Expected {expected}.")
+    return i + 1
+
+
+def parse_call(name: str, tokens: List[Token], i: int) -> Tuple[Snake.Call, int]:
+    """
+    Parses the parameters of a call, starting after the function name.
+
+    Args:
+        :param name: Str name of the function being called.
+        :param tokens: List of Tokens being parsed.
+        :param i: Int index of the opening parenthesis.
+
+    Returns:
+        :return: Snake Call instruction.
+        :return: Int index after the closing parenthesis.
+
+    Raises:
+        InvalidSyntax if the parameters are not comma separated expressions.
+    """
+    i = expect(tokens, i, Token.OpenParens(), "parse_call")
+    params = []
+
+    if peek(tokens, i) != Token.CloseParens():
+        while True:
+            param, i = parse_expression(tokens, i)
+            params.append(param)
+            if peek(tokens, i) != Token.Comma():
+                break
+            i += 1
+
+    i = expect(tokens, i, Token.CloseParens(), "parse_call")
+    return Snake.Call(name, params), i
+
+
+def parse_prefix(tokens: List[Token], i: int) -> Tuple[Snake, int]:
+    """
+    Parses an expression that does not start with an infix operator.
+
+    Args:
+        :param tokens: List of Tokens being parsed.
+        :param i: Int index of the start of the expression.
+
+    Returns:
+        :return: Snake expression.
+        :return: Int index after the expression.
+
+    Raises:
+        InvalidSyntax if no expression starts at the index.
+    """
+    match peek(tokens, i):
+        # Primitives
+        case Token.String(string):
+            return Snake.String(string), i + 1
+        case Token.Boolean(boolean):
+            return Snake.Boolean(boolean), i + 1
+        case Token.Integer(integer):
+            return Snake.Integer(integer), i + 1
+
+        # Variable or Call
+        case Token.Variable(variable):
+            if peek(tokens, i + 1) == Token.OpenParens():
+                return parse_call(variable, tokens, i + 1)
+            return Snake.Variable(variable), i + 1
+
+        # Parenthesized expression
+        case Token.OpenParens():
+            expression, i = parse_expression(tokens, i + 1)
+            return expression, expect(tokens, i, Token.CloseParens(), "parse_prefix")
+
+        # Unary Operation
+        case Token.Operator(op) if op in Snake.unary_operators:
+            value, i = parse_expression(tokens, i + 1, unary_precedence)
+            return Snake.UnaryOp(op, value), i
+
+        # Error
+        case token:
+            raise Error.InvalidSyntax(token, "parse_prefix", "Expected an expression.")
+
+
+def parse_expression(tokens: List[Token], i: int, min_precedence: int = 0) -> Tuple[Snake, int]:
+    """
+    Parses an expression by precedence climbing.
+    Infix operators that bind tighter than min_precedence are folded into the expression (left associative).
+
+    Args:
+        :param tokens: List of Tokens being parsed.
+        :param i: Int index of the start of the expression.
+        :param min_precedence: Int precedence that an infix operator must exceed to be part of the expression.
+
+    Returns:
+        :return: Snake expression.
+        :return: Int index after the expression.
+
+    Raises:
+        InvalidSyntax if the expression is malformed.
+    """
+    left, i = parse_prefix(tokens, i)
+
+    while True:
+        match peek(tokens, i):
+            case Token.Operator(op) if binary_precedence[op] > min_precedence:
+                right, i = parse_expression(tokens, i + 1, binary_precedence[op])
+                left = Snake.BinaryOp(op, left, right)
+            case _:
+                return left, i
+
+
+def parse_fundef(tokens: List[Token], i: int) -> Tuple[Snake.FunDef, int]:
+    """
+    Parses a function definition, starting at the def keyword.
+
+    Args:
+        :param tokens: List of Tokens being parsed.
+        :param i: Int index of the def keyword.
+
+    Returns:
+        :return: Snake FunDef instruction.
+        :return: Int index after the function's block.
+
+    Raises:
+        InvalidSyntax if the function signature is malformed or has no indented block.
+    """
+    i = expect(tokens, i, Token.Def(), "parse_fundef")
+
+    # Name
+    match peek(tokens, i):
+        case Token.Variable(variable):
+            name = variable
+            i += 1
+        case token:
+            raise Error.InvalidSyntax(token, "parse_fundef", "Expected a function name.")
+
+    # Parameters (can only be variables)
+    i = expect(tokens, i, Token.OpenParens(), "parse_fundef")
+    params = []
+    while peek(tokens, i) != Token.CloseParens():
+        match peek(tokens, i):
+            case Token.Variable(variable):
+                params.append(Snake.Variable(variable))
+                i += 1
+            case token:
+                raise Error.InvalidSyntax(token, "parse_fundef", "Expected a variable parameter.")
+
+        if peek(tokens, i) != Token.CloseParens():
+            i = expect(tokens, i, Token.Comma(), "parse_fundef")
+    i += 1
+
+    # Block
+    i = expect(tokens, i, Token.Colon(), "parse_fundef")
+    i = expect(tokens, i, Token.Newline(), "parse_fundef")
+    i = expect(tokens, i, Token.Indent(), "parse_fundef")
+    inner_instrs, i = parse_block(tokens, i, True)
+
+    return Snake.FunDef(name, params, inner_instrs), i
+
+
+def parse_statement(tokens: List[Token], i: int) -> Tuple[Snake, int]:
+    """
+    Parses a single statement (a function definition, an assignment or an expression).
+
+    Args:
+        :param tokens: List of Tokens being parsed.
+        :param i: Int index of the start of the statement.
+
+    Returns:
+        :return: Snake instruction.
+        :return: Int index after the statement.
+
+    Raises:
+        InvalidSyntax if the statement is malformed.
+    """
+    match peek(tokens, i), peek(tokens, i + 1):
+        # Function Definition
+        case Token.Def(), _:
+            return parse_fundef(tokens, i)
+
+        # Assign
+        case Token.Variable(variable), Token.Equals():
+            value, i = parse_expression(tokens, i + 2)
+            return Snake.Assign(Snake.Variable(variable), value), i
+
+        # Expression
+        case _:
+            return parse_expression(tokens, i)
+
+
+def parse_block(tokens: List[Token], i: int, indented: bool) -> Tuple[List[Snake], int]:
+    """
+    Parses the statements of a block, until its Dedent or the end of the tokens.
+
+    Args:
+        :param tokens: List of Tokens being parsed.
+        :param i: Int index of the first statement of the block.
+        :param indented: Bool whether the block is indented (a function body) or the top level.
+
+    Returns:
+        :return: List of Snake instructions in the block.
+        :return: Int index after the block.
+
+    Raises:
+        InvalidSyntax for unexpected indentation, or statements not separated by newlines.
+    """
+    snake_list = []
+
+    while i < len(tokens):
+        match tokens[i]:
+            case Token.Newline():
+                i += 1
+                continue
+            case Token.Dedent() if indented:
+                return snake_list, i + 1
+            case Token.Indent() | Token.Dedent():
+                raise Error.InvalidSyntax(tokens[i], "parse_block", "Unexpected indentation.")
+
+        statement, i = parse_statement(tokens, i)
+        snake_list.append(statement)
+
+        # A function definition's block already consumed its trailing newline
+        if not isinstance(statement, Snake.FunDef) and peek(tokens, i) not in (None, Token.Newline()):
+            raise Error.InvalidSyntax(tokens[i], "parse_block", "Expected a newline after the statement.")
+
+    return snake_list, i
+
+
+def parse(tokens: List[Token]) -> List[Snake]:
+    """
+    Converts a stream of Tokens into Snake instructions.
+
+    Args:
+        :param tokens: List of Tokens to parse.
+
+    Returns:
+        :return: List of all parsed Snake instructions.
+
+    Raises:
+        InvalidSyntax if the tokens are not valid Snake.
+    """
+    snake_list, _ = parse_block(tokens, 0, False)
+    return snake_list
@@ -0,0 +1,214 @@
+"""
+This file rewrites short windows of Assembly instructions into cheaper equivalents.
+"""
+
+
+from dataclasses import dataclass
+from typing import List, Dict, Callable
+from languages.Assembly import Assembly
+
+
+rax = Assembly.Register("rax")
+rdx = Assembly.Register("rdx")
+
+
+def power_of_two(integer: Assembly) -> None | int:
+    """
+    Finds the exponent of an Integer immediate that is a positive power of two.
+    """
+    if not isinstance(integer, Assembly.Integer):
+        return None
+    value = int(integer.integer)
+    if value < 2 or value & (value - 1):
+        return None
+    return value.bit_length() - 1
+
+
+def mentions(operand: Assembly, register: Assembly.Register) -> bool:
+    """
+    Checks whether an operand reads or is a register (a stack slot reads its base and index registers).
+    """
+    match operand:
+        case Assembly.Register(name) | Assembly.RegisterValue(name):
+            return name == register.register
+        case Assembly.ScaledIndexed(base, index, _, _):
+            return register.register in (base, index)
+        case _:
+            return False
+
+
+def move_to_self(window: List[Assembly]) -> None | List[Assembly]:
+    match window:
+        case [Assembly.Mov(destination, source)] if destination == source:
+            return []
+
+
+def add_zero(window: List[Assembly]) -> None | List[Assembly]:
+    # The flags are never read, so adding or subtracting 0 does nothing
+    match window:
+        case [Assembly.Add(_, Assembly.Integer("0")) | Assembly.Sub(_, Assembly.Integer("0"))]:
+            return []
+
+
+def push_pop(window: List[Assembly]) -> None | List[Assembly]:
+    match window:
+        case [Assembly.Push(source), Assembly.Pop(destination)] if source == destination:
+            return []
+        case [Assembly.Push(Assembly.Register() as source), Assembly.Pop(Assembly.Register() as destination)]:
+            return [Assembly.Mov(destination, source)]
+
+
+def move_back(window: List[Assembly]) -> None | List[Assembly]:
+    # The second move copies the value back to where it already is
+    match window:
+        case [Assembly.Mov(destination1, source1) as move, Assembly.Mov(destination2, source2)] \
+                if destination1 == source2 and source1 == destination2:
+            return [move]
+
+
+def overwritten_move(window: List[Assembly]) -> None | List[Assembly]:
+    match window:
+        case [Assembly.Mov(Assembly.Register() as destination1, _), Assembly.Mov(destination2, source2) as move] \
+                if destination1 == destination2 and not mentions(source2, destination1):
+            return [move]
+
+
+def multiply_by_constant(window: List[Assembly]) -> None | List[Assembly]:
+    # mul by the scratch register holding a constant, after %rax is loaded (or already holding the value)
+    # (the assembler's scratch register is only read by the instruction after the move that sets it, so both can go)
+    match window:
+        case [Assembly.Mov(Assembly.Register("r11"), Assembly.Integer(integer) as constant),
+              Assembly.Mov(Assembly.Register("rax"), _) as load, Assembly.Mul(Assembly.Register("r11"))]:
+            prefix = [load]
+        case [Assembly.Mov(Assembly.Register("r11"), Assembly.Integer(integer) as constant),
+              Assembly.Mul(Assembly.Register("r11")), _]:
+            prefix = []
+        case _:
+            return None
+
+    # A constant of 1, 3, 5 or 9 times a power of two is a scaled address and a shift (multiplying by 1 does nothing)
+    value = int(integer)
+    shift = (value & -value).bit_length() - 1 if value > 0 else 0
+    if value <= 0 or value >> shift not in (1, 3, 5, 9):
+        return None
+
+    rewritten = []
+    if value >> shift > 1:
+        rewritten.append(Assembly.Lea(rax, Assembly.ScaledIndexed("rax", "rax", (value >> shift) - 1, 0)))
+    if shift > 0:
+        rewritten.append(Assembly.Shl(rax, Assembly.Integer(str(shift))))
+    return prefix + rewritten + window[len(prefix) + 2:]
+
+
+def divide_by_power_of_two(window: List[Assembly]) -> None | List[Assembly]:
+    # cqo and idiv by the scratch register holding a power of two, followed by the move of the result
+    match window:
+        case [Assembly.Mov(Assembly.Register("r11"), constant), Assembly.Mov(Assembly.Register("rax"), _) as load,
+              Assembly.Cqo(), Assembly.IDiv(Assembly.Register("r11")), after]:
+            prefix = [load]
+        case [Assembly.Mov(Assembly.Register("r11"), constant), Assembly.Cqo(), Assembly.IDiv(Assembly.Register("r11")),
+              after, _]:
+            prefix = []
+        case _:
+            return None
+
+    exponent = power_of_two(constant)
+    if exponent is None or exponent > 31:
+        return None
+
+    # Negative values are rounded toward zero by adding 2**k - 1 (the top bits of the sign) before shifting
+    bias = [Assembly.Cqo(), Assembly.Shr(rdx, Assembly.Integer(str(64 - exponent)))]
+
+    match after:
+        # The quotient is used, %rdx is clobbered
+        case Assembly.Mov(_, Assembly.Register("rax")) | Assembly.Pop(Assembly.Register("rdx")):
+            rewritten = bias + [Assembly.Add(rax, rdx), Assembly.Sar(rax, Assembly.Integer(str(exponent)))]
+
+        # The remainder is used, it is the value minus its rounded down multiple of 2**k
+        case Assembly.Mov(_, Assembly.Register("rdx")):
+            rewritten = bias + [
+                Assembly.Add(rdx, rax),
+                Assembly.And(rdx, Assembly.Integer(str(-2 ** exponent))),
+                Assembly.Neg(rdx),
+                Assembly.Add(rdx, rax),
+            ]
+
+        case _:
+            return None
+
+    return prefix + rewritten + window[len(prefix) + 3:]
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    name: str
+    size: int
+    rewrite: Callable[[List[Assembly]], None | List[Assembly]]
+
+
+# Rules are tried in order at each instruction, a rewrite returns the replacement of its window or None
+rules = [
+    Rule("move to self", 1, move_to_self),
+    Rule("add zero", 1, add_zero),
+    Rule("push pop", 2, push_pop),
+    Rule("move back", 2, move_back),
+    Rule("overwritten move", 2, overwritten_move),
+    Rule("multiply by constant", 3, multiply_by_constant),
+    Rule("divide by power of two", 5, divide_by_power_of_two),
+]
+
+
+def optimize_instructions(instructions: List[Assembly], stats: None | Dict[str, int] = None) -> List[Assembly]:
+    """
+    Slides a window over Assembly instructions, replacing the windows that match a rule, until no rule matches.
+
+    Args:
+        :param instructions: List of Assembly instructions in a label.
+        :param stats: Dict from rule name to the number of times it matched, updated if not None.
+
+    Returns:
+        :return: List of rewritten Assembly instructions.
+
+    Raises:
+        Nothing.
+    """
+    instructions = list(instructions)
+    back = max(rule.size for rule in rules)
+
+    i = 0
+    while i < len(instructions):
+        for rule in rules:
+            window = instructions[i:i + rule.size]
+            if len(window) < rule.size:
+                continue
+
+            replacement = rule.rewrite(window)
+            if replacement is not None:
+                instructions[i:i + rule.size] = replacement
+                if stats is not None:
+                    stats[rule.name] = stats.get(rule.name, 0) + 1
+
+                # A rewrite can complete a window that starts before it
+                i = max(i - back, 0)
+                break
+        else:
+            i += 1
+
+    return instructions
+
+
+def optimize_peephole(assembly_list: List[Assembly.Label], stats: None | Dict[str, int] = None) -> List[Assembly.Label]:
+    """
+    Runs the peephole rules over the instructions of every label.
+
+    Args:
+        :param assembly_list: List of Assembly Labels.
+        :param stats: Dict from rule name to the number of times it matched, updated if not None.
+
+    Returns:
+        :return: List of Assembly Labels with rewritten instructions.
+
+    Raises:
+        Nothing.
+    """
+    return [Assembly.Label(label.label, optimize_instructions(label.instructions, stats)) for label in assembly_list]
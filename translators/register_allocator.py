@@ -0,0 +1,233 @@
+"""
+This file assigns registers to the Normal form memory of a function body by linear scan.
+"""
+
+
+from typing import List, Dict, Tuple
+from languages.Normal import Normal
+from languages.Assembly import Assembly
+from languages.Assembly import param_registers, callee_saved_registers
+
+
+# Caller-saved registers that are free for memory which is not live across a call
+# (%rax, %rdx and %r11 are reserved by the assembler for arithmetic and scratch)
+caller_saved_registers = ["r10", "r9", "r8", "rcx", "rsi", "rdi"]
+
+
+def read_memories(instr: Normal) -> List[Normal]:
+    """
+    Finds the memory read by a Normal form instruction.
+
+    Args:
+        :param instr: Normal form instruction.
+
+    Returns:
+        :return: List of Normal form memory read by the instruction.
+
+    Raises:
+        Nothing.
+    """
+    source = instr.source if isinstance(instr, Normal.Assign) else instr
+
+    match source:
+        case Normal.Call(_, params):
+            return list(params)
+        case Normal.BinaryOp(_, memory1, memory2):
+            return [memory1, memory2]
+        case Normal.UnaryOp(_, memory):
+            return [memory]
+        case Normal.FunDef():
+            return []
+        case _:
+            return [source]
+
+
+def written_memories(instr: Normal) -> List[Normal]:
+    """
+    Finds the memory written by a Normal form instruction.
+
+    Args:
+        :param instr: Normal form instruction.
+
+    Returns:
+        :return: List of Normal form memory written by the instruction.
+
+    Raises:
+        Nothing.
+    """
+    if isinstance(instr, Normal.Assign):
+        return [instr.destination]
+    return []
+
+
+def is_call(instr: Normal) -> bool:
+    return isinstance(instr, Normal.Call) or isinstance(instr, Normal.Assign) and isinstance(instr.source, Normal.Call)
+
+
+def live_intervals(normal_list: List[Normal]) -> Tuple[Dict[Normal, List[int]], List[int]]:
+    """
+    Computes the live interval of every variable and temporary in a straight-line function body.
+
+    Args:
+        :param normal_list: List of Normal form instructions in the function body.
+
+    Returns:
+        :return: Dict from Normal form memory to its [first, last] instruction index.
+        :return: List of the instruction indices that make a call.
+
+    Raises:
+        Nothing.
+    """
+    intervals = {}
+    calls = []
+
+    for i, instr in enumerate(normal_list):
+        if is_call(instr):
+            calls.append(i)
+
+        for memory in [*read_memories(instr), *written_memories(instr)]:
+            if isinstance(memory, (Normal.VarMemory, Normal.TempMemory)):
+                if memory in intervals:
+                    intervals[memory][1] = i
+                else:
+                    intervals[memory] = [i, i]
+
+    return intervals, calls
+
+
+def used_param_registers(normal_list: List[Normal]) -> set[str]:
+    """
+    Finds the parameter registers that a function body reads or sets up for its calls.
+    """
+    used = set()
+    for instr in normal_list:
+        for memory in [*read_memories(instr), *written_memories(instr)]:
+            if isinstance(memory, Normal.ParamMemory) and memory.number < len(param_registers):
+                used.add(param_registers[memory.number])
+
+        match instr:
+            case Normal.Call(_, params) | Normal.Assign(_, Normal.Call(_, params)):
+                used.update(param_registers[:len(params)])
+    return used
+
+
+def rename_values(normal_list: List[Normal]) -> List[Normal]:
+    """
+    Gives every value written to a variable or temporary its own TempMemory, so that each has a short live interval.
+    (e.g. TempMemory(0) is reused by every expression, but each of its values is only live until its last read).
+    The function body is straight-line code, so a read always sees the latest value written.
+
+    Args:
+        :param normal_list: List of Normal form instructions in the function body.
+
+    Returns:
+        :return: List of Normal form instructions with renamed memory.
+
+    Raises:
+        Nothing.
+    """
+    current = {}  # type: Dict[Normal, Normal.TempMemory]
+
+    def read(memory):
+        if not isinstance(memory, (Normal.VarMemory, Normal.TempMemory)):
+            return memory
+        if memory not in current:
+            current[memory] = Normal.TempMemory(len(current) + len(renamed_list))
+        return current[memory]
+
+    renamed_list = []
+    for instr in normal_list:
+        match instr:
+            case Normal.Assign(destination, source):
+                match source:
+                    case Normal.Call(name, params):
+                        new_source = Normal.Call(name, [read(p) for p in params])
+                    case Normal.BinaryOp(op, memory1, memory2):
+                        new_source = Normal.BinaryOp(op, read(memory1), read(memory2))
+                    case Normal.UnaryOp(op, memory):
+                        new_source = Normal.UnaryOp(op, read(memory))
+                    case _:
+                        new_source = read(source)
+
+                if isinstance(destination, (Normal.VarMemory, Normal.TempMemory)):
+                    current[destination] = Normal.TempMemory(len(current) + len(renamed_list))
+                renamed_list.append(Normal.Assign(read(destination), new_source))
+
+            case Normal.Call(name, params):
+                renamed_list.append(Normal.Call(name, [read(p) for p in params]))
+
+            case _:
+                renamed_list.append(instr)
+
+    return renamed_list
+
+
+def allocate_registers(normal_list: List[Normal]) -> Tuple[List[Normal], Dict[Normal, Assembly]]:
+    """
+    Assigns registers to a function body's variables and temporaries by linear scan over their live intervals.
+    Memory live across a call only gets callee-saved registers, other memory prefers caller-saved ones.
+    When no register is free, the interval that ends last is spilled to a stack slot.
+
+    Args:
+        :param normal_list: List of Normal form instructions in the function body.
+
+    Returns:
+        :return: List of Normal form instructions, with each value renamed to its own memory (rename_values).
+        :return: Dict from the renamed Normal form memory to the Assembly register or stack slot holding it.
+
+    Raises:
+        Nothing.
+    """
+    normal_list = rename_values(normal_list)
+    intervals, calls = live_intervals(normal_list)
+    used_params = used_param_registers(normal_list)
+
+    free_caller_saved = [r for r in caller_saved_registers if r not in used_params]
+    free_callee_saved = list(callee_saved_registers)
+
+    locations = {}
+    num_slots = 0
+    active = []  # (end, memory) pairs holding a register
+
+    def spill(memory):
+        nonlocal num_slots
+        num_slots += 1
+        locations[memory] = Assembly.ScaledIndexed("rbp", None, 8, -8 * num_slots)
+
+    def release(register):
+        # Keep the free registers in preference order, so few callee-saved registers need saving
+        if register in callee_saved_registers:
+            free_callee_saved.append(register)
+            free_callee_saved.sort(key=callee_saved_registers.index)
+        else:
+            free_caller_saved.append(register)
+            free_caller_saved.sort(key=caller_saved_registers.index)
+
+    for memory, (start, end) in sorted(intervals.items(), key=lambda item: item[1][0]):
+        # Free the registers of intervals that ended (an instruction can read a register and write it again)
+        for active_end, active_memory in list(active):
+            if active_end <= start:
+                active.remove((active_end, active_memory))
+                release(locations[active_memory].register)
+
+        crosses_call = any(start < call < end for call in calls)
+        if not crosses_call and free_caller_saved:
+            register = free_caller_saved.pop(0)
+        elif free_callee_saved:
+            register = free_callee_saved.pop(0)
+        else:
+            # Spill whichever eligible interval ends last
+            eligible = [a for a in active if not crosses_call or locations[a[1]].register in callee_saved_registers]
+            victim = max(eligible, key=lambda a: a[0], default=None)
+            if victim is None or victim[0] <= end:
+                spill(memory)
+                continue
+
+            active.remove(victim)
+            register = locations[victim[1]].register
+            spill(victim[1])
+
+        locations[memory] = Assembly.Register(register)
+        active.append((end, memory))
+
+    return normal_list, locations
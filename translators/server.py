@@ -0,0 +1,362 @@
+"""
+This file keeps the compiler resident, so that each compilation skips interpreter startup and imports.
+The server recompiles the changed sources of a watched tree in place, and answers compile requests on a Unix socket.
+
+Usage:
+    python -m translators.server --socket /tmp/snake.sock [--watch src/] [--optimize] [--allocate] [--cache-dir DIR] [--cache-size MIB]
+                                 [--max-compilers N]
+    python -m translators.server --socket /tmp/snake.sock --request program.py
+
+Protocol:
+    Each request and response is one line of JSON, and a connection can send any number of requests.
+    {"source": "...", "name": "program.py"}  ->  {"ok": true, "assembly": "...", "ms": 0.4}
+    {"path": "program.py"}                   ->  the same, for the contents of a file
+    {"command": "stats"}                     ->  {"ok": true, "stats": {...}}
+    {"command": "shutdown"}                  ->  {"ok": true}, and the server stops
+    Requests may set "optimize" and "allocate", which default to the server's flags.
+    A request that does not compile gets {"ok": false, "error": "..."}.
+"""
+
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from time import perf_counter, sleep
+from typing import List, Dict, Tuple, Any
+from translators.cache import CompileCache, default_max_bytes
+from translators.compiler import compile, compile_cached, find_sources, output_path
+from translators.incremental import IncrementalCompiler
+
+
+default_max_compilers = 256
+
+
+@dataclass(slots=True)
+class ServerStats:
+    requests: int = 0
+    compiled: int = 0  # Sources compiled, for requests or for changed files
+    errors: int = 0
+    functions_reused: int = 0
+    functions_recompiled: int = 0
+
+
+class CompileServer:
+    def __init__(self, socket_path: str, root: None | str = None, optimize: bool = False, allocate: bool = False,
+                 cache: None | CompileCache = None, interval: float = 0.5, max_compilers: int = default_max_compilers):
+        self.socket_path = socket_path  # type: str
+        self.root = root  # type: None | str
+        self.optimize = optimize  # type: bool
+        self.allocate = allocate  # type: bool
+        self.cache = cache  # type: None | CompileCache
+        self.interval = interval  # type: float
+        self.compilers = OrderedDict()  # type: OrderedDict[Tuple[str, bool], IncrementalCompiler]
+        self.max_compilers = max_compilers  # type: int
+        self.modified = {}  # type: Dict[str, Tuple[int, int]]
+        self.stats = ServerStats()  # type: ServerStats
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.server = None  # type: None | socketserver.ThreadingUnixStreamServer
+
+        # Note: compilers holds an IncrementalCompiler per source name and allocate flag, so that a source that is
+        #       compiled again only recompiles its edited functions (optimized sources use the cache instead).
+        #       It is kept in least recently used order, and holds at most max_compilers, so that requests under
+        #       many names do not grow the server without bound (a source whose compiler was dropped is compiled whole).
+
+        # Note: modified maps each watched source to the modification time and size it was last compiled at.
+
+        # Note: lock serializes compilations, which share the compilers, the cache and the stats.
+
+        # Note: the cache is evicted after each compilation that writes to it, so it stays within its size limit.
+
+    def compile_source(self, source: str, name: str, optimize: bool, allocate: bool) -> str:
+        """
+        Compiles Snake source code with the server's warm state.
+
+        Args:
+            :param source: Str of Snake source code.
+            :param name: Str name of the source (e.g. its path), whose previous version is reused.
+            :param optimize: Bool whether to run the optimization stages.
+            :param allocate: Bool whether to assign registers by linear scan.
+
+        Returns:
+            :return: Str AT&T syntax assembly.
+
+        Raises:
+            SyntaxError or InvalidSyntax for source that does not compile, or any other error raised while compiling
+            (e.g. RecursionError for an expression nested too deeply), which is counted in the stats.
+        """
+        with self.lock:
+            try:
+                if optimize and self.cache is not None:
+                    assembly, cached = compile_cached(source, self.cache, optimize, allocate)
+                    if not cached:
+                        self.cache.evict()
+                elif optimize:
+                    assembly = compile(source, optimize, allocate)
+                else:
+                    compiler = self.compilers.get((name, allocate))
+                    if compiler is None:
+                        compiler = self.compilers[(name, allocate)] = IncrementalCompiler(allocate)
+                        while len(self.compilers) > self.max_compilers:
+                            self.compilers.popitem(last=False)
+                    self.compilers.move_to_end((name, allocate))
+                    assembly = compiler.compile(source)
+                    self.stats.functions_reused += compiler.stats.reused
+                    self.stats.functions_recompiled += compiler.stats.recompiled
+            except Exception:
+                self.stats.errors += 1
+                raise
+
+            self.stats.compiled += 1
+            return assembly
+
+    def poll(self) -> List[str]:
+        """
+        Recompiles the watched sources that were added or changed since the last poll, writing each beside its source.
+        A source that cannot be read, compiled or written is reported on standard error, and tried again once it changes
+        (so that one bad file never stops the watcher).
+
+        Args:
+            Nothing.
+
+        Returns:
+            :return: List of str paths of the sources that were compiled.
+
+        Raises:
+            Nothing.
+        """
+        if self.root is None:
+            return []
+
+        compiled = []
+        try:
+            sources = find_sources([self.root])
+        except OSError:
+            # The watched tree was removed, it is watched again if it comes back
+            return []
+
+        for path in sources:
+            try:
+                stat_result = os.stat(path)
+            except FileNotFoundError:
+                continue
+
+            modified = (stat_result.st_mtime_ns, stat_result.st_size)
+            if self.modified.get(path) == modified:
+                continue
+            self.modified[path] = modified
+
+            try:
+                with open(path) as file:
+                    source = file.read()
+                assembly = self.compile_source(source, path, self.optimize, self.allocate)
+                with open(output_path(path), "w") as file:
+                    file.write(assembly)
+            except FileNotFoundError:
+                continue
+            except Exception as error:
+                print(f"{path}: {type(error).__name__}: {error}", file=sys.stderr)
+                continue
+            compiled.append(path)
+
+        # Deleted sources are forgotten
+        for path in set(self.modified) - set(sources):
+            del self.modified[path]
+            with self.lock:
+                for allocate in (False, True):
+                    self.compilers.pop((path, allocate), None)
+
+        return compiled
+
+    def watch(self) -> None:
+        """
+        Polls the watched tree until the server stops.
+        """
+        while not self.stopped.is_set():
+            for path in self.poll():
+                print(f"{path} -> {output_path(path)}", file=sys.stderr)
+            self.stopped.wait(self.interval)
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Answers a request of the protocol (see the top of this file).
+
+        Args:
+            :param request: Dict of a decoded JSON request.
+
+        Returns:
+            :return: Dict of the JSON response.
+
+        Raises:
+            Nothing.
+        """
+        with self.lock:
+            self.stats.requests += 1
+        match request:
+            case {"command": "stats"}:
+                with self.lock:
+                    return {"ok": True, "stats": asdict(self.stats)}
+
+            case {"command": "shutdown"}:
+                self.stop()
+                return {"ok": True}
+
+            case {"source": str()} | {"path": str()}:
+                start = perf_counter()
+                try:
+                    if "source" in request:
+                        source = request["source"]
+                    else:
+                        with open(request["path"]) as file:
+                            source = file.read()
+                    name = request.get("name", request.get("path", "<request>"))
+                    assembly = self.compile_source(
+                        source, name, bool(request.get("optimize", self.optimize)), bool(request.get("allocate", self.allocate)))
+                except Exception as error:
+                    return {"ok": False, "error": f"{type(error).__name__}: {error}"}
+                return {"ok": True, "assembly": assembly, "ms": (perf_counter() - start) * 1000}
+
+            case _:
+                return {"ok": False, "error": f"Unknown request: {request}"}
+
+    def serve_forever(self) -> None:
+        """
+        Serves requests on the socket, and watches the tree in a background thread, until a shutdown request.
+
+        Args:
+            Nothing.
+
+        Returns:
+            Nothing.
+
+        Raises:
+            OSError if the socket path is taken by a file that is not a socket.
+        """
+        # A socket left behind by a server that did not stop cleanly is replaced
+        if os.path.exists(self.socket_path) and stat.S_ISSOCK(os.stat(self.socket_path).st_mode):
+            os.unlink(self.socket_path)
+
+        compile_server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line)
+                    except json.JSONDecodeError as error:
+                        response = {"ok": False, "error": f"Invalid JSON: {error}"}
+                    else:
+                        response = compile_server.handle(request)
+                    self.wfile.write(json.dumps(response).encode() + b"\n")
+                    self.wfile.flush()
+
+        self.server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        self.server.daemon_threads = True
+        watcher = threading.Thread(target=self.watch, daemon=True)
+        watcher.start()
+        try:
+            self.server.serve_forever()
+        finally:
+            self.stopped.set()
+            watcher.join()
+            self.server.server_close()
+            os.unlink(self.socket_path)
+
+    def stop(self) -> None:
+        """
+        Stops the server (serve_forever returns once the request being answered is done).
+        """
+        self.stopped.set()
+        if self.server is not None:
+            # shutdown waits for serve_forever to return, so it cannot run on the thread answering the request
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
+def request(socket_path: str, message: Dict[str, Any], timeout: None | float = None) -> Dict[str, Any]:
+    """
+    Sends one request to a compile server, and waits for its response.
+
+    Args:
+        :param socket_path: Str path of the server's Unix socket.
+        :param message: Dict of the JSON request.
+        :param timeout: Float seconds to wait for the server, or None to wait forever.
+
+    Returns:
+        :return: Dict of the JSON response.
+
+    Raises:
+        OSError if the server cannot be reached.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        with client.makefile("rwb") as stream:
+            stream.write(json.dumps(message).encode() + b"\n")
+            stream.flush()
+            return json.loads(stream.readline())
+
+
+def wait_for_server(socket_path: str, timeout: float = 5.0) -> None:
+    """
+    Waits until a server started in another thread or process accepts connections.
+
+    Raises:
+        TimeoutError if the server does not start in time.
+    """
+    start = perf_counter()
+    while perf_counter() - start < timeout:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(socket_path)
+            return
+        except (FileNotFoundError, ConnectionRefusedError):
+            sleep(0.01)
+    raise TimeoutError(socket_path)
+
+
+def main(argv: None | List[str] = None) -> int:
+    """
+    Runs the compile server, or sends it a request, returning the exit status.
+    """
+    arg_parser = argparse.ArgumentParser(prog="python -m translators.server", description="Resident Snake compile server.")
+    arg_parser.add_argument("--socket", required=True, help="path of the Unix socket")
+    arg_parser.add_argument("--watch", help="source tree to recompile in place as it changes")
+    arg_parser.add_argument("--interval", type=float, default=0.5, help="seconds between polls of the watched tree (default: %(default)s)")
+    arg_parser.add_argument("-O", "--optimize", action="store_true", help="run the optimization stages")
+    arg_parser.add_argument("--allocate", action="store_true", help="assign registers by linear scan")
+    arg_parser.add_argument("--cache-dir", help="on-disk cache for optimized compilations")
+    arg_parser.add_argument("--cache-size", type=int, default=default_max_bytes // 2 ** 20, help="cache size limit in MiB (default: %(default)s)")
+    arg_parser.add_argument("--max-compilers", type=int, default=default_max_compilers,
+                            help="sources whose functions are kept for incremental recompilation (default: %(default)s)")
+    arg_parser.add_argument("--request", metavar="SOURCE", help="send SOURCE to a running server and print its assembly")
+    arg_parser.add_argument("--stop", action="store_true", help="stop a running server")
+    args = arg_parser.parse_args(argv)
+
+    if args.request is not None or args.stop:
+        message = {"command": "shutdown"} if args.stop else {"path": os.path.abspath(args.request)}
+        if args.optimize:
+            message["optimize"] = True
+        if args.allocate:
+            message["allocate"] = True
+
+        response = request(args.socket, message)
+        if not response["ok"]:
+            print(f"{args.request}: {response['error']}", file=sys.stderr)
+            return 1
+        sys.stdout.write(response.get("assembly", ""))
+        return 0
+
+    cache = None if args.cache_dir is None else CompileCache(args.cache_dir, args.cache_size * 2 ** 20)
+    CompileServer(args.socket, args.watch, args.optimize, args.allocate, cache, args.interval, args.max_compilers).serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
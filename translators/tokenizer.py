@@ -12,6 +12,8 @@
 # Infix Operators ("+", "-", "*", "/", "%")
 # Comments ("#")
 
+import re
+
 
 # Params:
 # Returns:
@@ -70,3 +72,45 @@ def tokenize(text):
             words.append(curr_word)
 
     return words
+
+
+# Words are matched in the same priority order as the cases of split:
+# four spaces, a single space, a comment, a reserved symbol, and finally a word.
+word_pattern = re.compile(r"""
+    (?P<tab>\ {4})
+  | (?P<space>\ )
+  | (?P<comment>\#[^\n]*)
+  | (?P<symbol>[\n\t=,:()"'+\-*/%])
+  | (?P<word>[^\ \n\t=,:()"'+\-*/%\#]+)
+""", re.VERBOSE)
+
+
+# Params: A string of Snake source code.
+# Returns: A list of string words, identical to tokenize.
+# Purpose: Aggregate string tokens in a single pass over the text, without re-slicing it.
+def scan(text):
+    words = []
+    for match in word_pattern.finditer(text):
+        kind = match.lastgroup
+        if kind == "tab":
+            words.append("\t")
+        elif kind == "symbol" or kind == "word":
+            words.append(match.group())
+
+    return words
+
+
+# Params: A string of Snake source code, or an open text file of Snake source code.
+# Returns: A generator of string words, identical to tokenize.
+# Purpose: Lazily yield string tokens, reading a file one line at a time.
+def tokenize_iter(text_or_file):
+    # No word spans a line, so a file can be scanned line by line
+    lines = [text_or_file] if isinstance(text_or_file, str) else text_or_file
+
+    for line in lines:
+        for match in word_pattern.finditer(line):
+            kind = match.lastgroup
+            if kind == "tab":
+                yield "\t"
+            elif kind == "symbol" or kind == "word":
+                yield match.group()
@@ -0,0 +1,190 @@
+"""
+This file converts Assembly instructions into AT&T syntax assembly text.
+"""
+
+
+from io import StringIO
+from typing import List, Dict, Callable, TextIO
+from languages.Assembly import Assembly
+from utils.Error import Error
+
+
+def unparse_scaled_indexed(operand: Assembly.ScaledIndexed) -> str:
+    offset = str(operand.offset) if operand.offset else ""
+    if operand.index is None:
+        return f"{offset}(%{operand.base})"
+    return f"{offset}(%{operand.base},%{operand.index},{operand.scale})"
+
+
+operand_unparsers = {
+    Assembly.Register: lambda operand: f"%{operand.register}",
+    Assembly.RegisterValue: lambda operand: f"(%{operand.register})",
+    Assembly.ScaledIndexed: unparse_scaled_indexed,
+    Assembly.Integer: lambda operand: f"${operand.integer}",
+    Assembly.String: lambda operand: f"_str_{operand.string}(%rip)",  # RIP-relative, so the program links as PIE
+}  # type: Dict[type, Callable[[Assembly], str]]
+
+
+def unparse_operand(operand: Assembly) -> str:
+    """
+    Converts an Assembly operand (register, memory or immediate) into AT&T syntax.
+
+    Args:
+        :param operand: Assembly operand.
+
+    Returns:
+        :return: Str AT&T operand.
+
+    Raises:
+        UnknownInstruction for a node that is not an operand.
+    """
+    unparser = operand_unparsers.get(type(operand))
+    if unparser is None:
+        raise Error.UnknownInstruction(operand, "unparse_operand", "Assembly operand")
+    return unparser(operand)
+
+
+def escape_string(string: str) -> str:
+    """
+    Escapes a string for a .string directive: printable ASCII is kept (quote and backslash are escaped),
+    and every other byte of its UTF-8 encoding is written as a 3 digit octal escape.
+
+    Args:
+        :param string: Str contents of a string literal.
+
+    Returns:
+        :return: Str escaped contents, without the surrounding quotes.
+
+    Raises:
+        Nothing.
+    """
+    escaped = []
+    for byte in string.encode():
+        if byte in (ord("\""), ord("\\")):
+            escaped.append("\\" + chr(byte))
+        elif 0x20 <= byte < 0x7f:
+            escaped.append(chr(byte))
+        else:
+            escaped.append(f"\\{byte:03o}")
+    return "".join(escaped)
+
+
+def two_operands(mnemonic: str) -> Callable[[Assembly], str]:
+    # AT&T syntax puts the source before the destination
+    return lambda instr: f"{mnemonic} {unparse_operand(instr.source)}, {unparse_operand(instr.destination)}"
+
+
+instruction_unparsers = {
+    Assembly.Add: two_operands("addq"),
+    Assembly.Sub: two_operands("subq"),
+    Assembly.And: two_operands("andq"),
+    Assembly.Shl: two_operands("shlq"),
+    Assembly.Shr: two_operands("shrq"),
+    Assembly.Sar: two_operands("sarq"),
+    Assembly.Lea: two_operands("leaq"),
+    Assembly.Mov: two_operands("movq"),
+    Assembly.Mul: lambda instr: f"mulq {unparse_operand(instr.source)}",
+    Assembly.IMul: lambda instr: f"imulq {unparse_operand(instr.source)}",
+    Assembly.Div: lambda instr: f"divq {unparse_operand(instr.source)}",
+    Assembly.IDiv: lambda instr: f"idivq {unparse_operand(instr.source)}",
+    Assembly.Cqo: lambda instr: "cqto",
+    Assembly.Neg: lambda instr: f"negq {unparse_operand(instr.destination)}",
+    Assembly.Push: lambda instr: f"pushq {unparse_operand(instr.source)}",
+    Assembly.Pop: lambda instr: f"popq {unparse_operand(instr.destination)}",
+    Assembly.Call: lambda instr: f"call {instr.label}",
+    Assembly.Ret: lambda instr: "ret",
+    Assembly.Cmp: lambda instr: f"cmpq {unparse_operand(instr.s2)}, {unparse_operand(instr.s1)}",
+    Assembly.Jmp: lambda instr: f"jmp {instr.label}",
+    Assembly.Jne: lambda instr: f"jne {instr.label}",
+    Assembly.StringDeclare: lambda instr: f".string \"{escape_string(instr.string)}\"",
+}  # type: Dict[type, Callable[[Assembly], str]]
+
+
+def unparse_instruction(instr: Assembly) -> str:
+    """
+    Converts a single Assembly instruction into a line of AT&T syntax, without indentation.
+
+    Args:
+        :param instr: Assembly instruction.
+
+    Returns:
+        :return: Str AT&T instruction.
+
+    Raises:
+        UnknownInstruction for a node that is not an instruction.
+    """
+    unparser = instruction_unparsers.get(type(instr))
+    if unparser is None:
+        raise Error.UnknownInstruction(instr, "unparse_instruction", "Assembly instruction")
+    return unparser(instr)
+
+
+def is_data(label: Assembly.Label) -> bool:
+    return bool(label.instructions) and isinstance(label.instructions[0], Assembly.StringDeclare)
+
+
+def unparse_label(label: Assembly.Label) -> str:
+    """
+    Converts an Assembly Label into its line and the indented lines of its instructions.
+
+    Args:
+        :param label: Assembly Label.
+
+    Returns:
+        :return: Str AT&T syntax lines, each ending in a newline.
+
+    Raises:
+        UnknownInstruction for a node that is not an instruction or operand.
+    """
+    return f"{label.label}:\n" + "".join(f"\t{unparse_instruction(instr)}\n" for instr in label.instructions)
+
+
+def unparse_to(assembly_list: List[Assembly.Label], stream: TextIO,
+               label_unparser: Callable[[Assembly.Label], str] = unparse_label) -> None:
+    """
+    Writes Assembly Labels to a text stream as an AT&T syntax program, in a single pass.
+    Function labels go in the text section, and string labels in the read-only data section.
+
+    Args:
+        :param assembly_list: List of Assembly Labels, as returned by the assembler.
+        :param stream: Text stream to write to (e.g. an open file or a StringIO).
+        :param label_unparser: Function converting a Label into its lines (e.g. one that reuses unchanged Labels).
+
+    Returns:
+        Nothing.
+
+    Raises:
+        UnknownInstruction for a node that is not an instruction or operand.
+    """
+    write = stream.write
+    section = None
+
+    write("\t.globl main\n")
+    for label in assembly_list:
+        label_section = "\t.section .rodata\n" if is_data(label) else "\t.text\n"
+        if label_section != section:
+            section = label_section
+            write(section)
+
+        write(label_unparser(label))
+
+    # The program does not need an executable stack
+    write("\t.section .note.GNU-stack,\"\",@progbits\n")
+
+
+def unparse(assembly_list: List[Assembly.Label]) -> str:
+    """
+    Converts Assembly Labels into an AT&T syntax program.
+
+    Args:
+        :param assembly_list: List of Assembly Labels, as returned by the assembler.
+
+    Returns:
+        :return: Str AT&T syntax assembly.
+
+    Raises:
+        UnknownInstruction for a node that is not an instruction or operand.
+    """
+    stream = StringIO()
+    unparse_to(assembly_list, stream)
+    return stream.getvalue()